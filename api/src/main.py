@@ -7,12 +7,15 @@ from smart_open import open  # type: ignore
 
 from typing import Any, Optional
 
+import asyncio
+import httpx
 import json
 import subprocess
 from uuid import uuid1, UUID
 
 from constants import JobStatus
 from log_mgmt import get_logger
+from variant_resolution import resolve_variants
 
 logger = get_logger(name=__name__)
 
@@ -74,7 +77,16 @@ def run_pipeline(pipeline_seq_regions: list[Pipeline_seq_region], uuid: UUID) ->
     with open(seqregions_filename, mode='w') as seqregions_file:
         seqregions_file.write(seq_regions_json)
 
+    variants_filename = f'variants_{uuid}.json'
+
     try:
+        # Resolve all unique variants of the job once, rather than in every sequence retrieval task
+        variant_ids = [variant_id for seq_region in pipeline_seq_regions for variant_id in seq_region.variant_ids]
+        variant_records = asyncio.run(resolve_variants(variant_ids))
+
+        with open(variants_filename, mode='w') as variants_file:
+            variants_file.write(json.dumps(variant_records))
+
         subprocess.run(
             ['./nextflow.sh', 'run',
              '-offline',
@@ -84,12 +96,16 @@ def run_pipeline(pipeline_seq_regions: list[Pipeline_seq_region], uuid: UUID) ->
              'protein-msa.nf',
              '--image_tag', api_pipeline_image_tag,
              '--input_seq_regions_file', seqregions_filename,
+             '--input_variants_file', variants_filename,
              '--publish_dir_prefix', api_results_path_prefix,
              '--publish_dir', f'pipeline-results_{uuid}'],
             check=True)
     except subprocess.CalledProcessError:
         logger.warning(f"Pipeline job '{uuid}' completed with failures.\n")
         job.status = JobStatus.FAILED.name.lower()
+    except (httpx.HTTPError, OSError) as error:
+        logger.error(f"Pipeline job '{uuid}' failed to start: {error}\n")
+        job.status = JobStatus.FAILED.name.lower()
     else:
         logger.info(f'Pipeline job {uuid} completed successfully.')
         job.status = JobStatus.COMPLETED.name.lower()
@@ -0,0 +1,99 @@
+"""
+Module containing functions to resolve variant IDs into variant records at job submission time,
+to be passed into the pipeline (rather than having every pipeline task resolve them independently).
+"""
+import asyncio
+import httpx
+from typing import Any, Iterable, Optional
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+VARIANT_API_URL = 'https://www.alliancegenome.org/api/variant/{variant_id}'
+"""Public web API URL to fetch variant information from."""
+
+MAX_CONCURRENT_REQUESTS = 10
+"""Maximum number of concurrent variant API requests per job."""
+
+
+async def fetch_variant_record(client: httpx.AsyncClient, variant_id: str) -> dict[str, Any]:
+    """
+    Fetch variant information from the public web API and return it as a variant record.
+
+    Args:
+        client: HTTP client to send the request with
+        variant_id: (AGR) variant ID to fetch
+
+    Returns:
+        Dict representing the variant, formatted as expected by the sequence retrieval `--variants_file` input.
+
+    Raises:
+        httpx.HTTPError: if the variant information could not be retrieved.
+        KeyError: if the variant information retrieved does not contain the required location information.
+    """
+    response = await client.get(VARIANT_API_URL.format(variant_id=variant_id))
+    response.raise_for_status()
+    variant_data = response.json()
+
+    variant_record: dict[str, Any] = {
+        'variant_id': variant_id,
+        'genomic_seq_id': variant_data['location']['chromosome'],
+        'genomic_start_pos': variant_data['location']['start'],
+        'genomic_end_pos': variant_data['location']['end']
+    }
+    if variant_data.get('genomicReferenceSequence') is not None:
+        variant_record['genomic_ref_seq'] = variant_data['genomicReferenceSequence']
+    if variant_data.get('genomicVariantSequence') is not None:
+        variant_record['genomic_alt_seq'] = variant_data['genomicVariantSequence']
+
+    return variant_record
+
+
+async def resolve_variants(variant_ids: Iterable[str], client: Optional[httpx.AsyncClient] = None,
+                           max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> dict[str, dict[str, Any]]:
+    """
+    Resolve all unique variant IDs concurrently into variant records.
+
+    Variant IDs that fail to resolve are logged and left out of the result,
+    so the pipeline can still attempt to resolve them (and report the error per sequence).
+
+    Args:
+        variant_ids: variant IDs to resolve (duplicates are resolved once)
+        client: optional HTTP client to send the requests with (a new client is created when not provided)
+        max_concurrency: maximum number of concurrent requests
+
+    Returns:
+        Dict of variant records, indexed by variant ID.
+    """
+    unique_variant_ids = sorted(set(variant_ids))
+    if not unique_variant_ids:
+        return {}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_bounded(http_client: httpx.AsyncClient, variant_id: str) -> dict[str, Any]:
+        async with semaphore:
+            return await fetch_variant_record(http_client, variant_id)
+
+    async def fetch_all(http_client: httpx.AsyncClient) -> list[dict[str, Any] | BaseException]:
+        return await asyncio.gather(*[fetch_bounded(http_client, variant_id) for variant_id in unique_variant_ids],
+                                    return_exceptions=True)
+
+    results: list[dict[str, Any] | BaseException]
+    if client is None:
+        async with httpx.AsyncClient() as new_client:
+            results = await fetch_all(new_client)
+    else:
+        results = await fetch_all(client)
+
+    variant_records: dict[str, dict[str, Any]] = {}
+    for variant_id, result in zip(unique_variant_ids, results):
+        if isinstance(result, BaseException):
+            logger.warning(f'Failed to pre-resolve variant {variant_id}: {result}')
+        else:
+            variant_records[variant_id] = result
+
+    logger.info(f'Pre-resolved {len(variant_records)} of {len(unique_variant_ids)} unique variants.')
+
+    return variant_records
@@ -0,0 +1,56 @@
+import asyncio
+import httpx
+
+from src.variant_resolution import resolve_variants
+
+VARIANT_API_RESPONSES = {
+    'NC_003284.9:g.5116096C>T': {
+        'location': {'chromosome': 'X', 'start': 5116096, 'end': 5116096},
+        'genomicReferenceSequence': 'C',
+        'genomicVariantSequence': 'T'
+    },
+    'NC_003284.9:g.5113285_5115215del': {
+        'location': {'chromosome': 'X', 'start': 5113285, 'end': 5115215},
+        'genomicReferenceSequence': 'ACGT'
+    }
+}
+
+
+def test_resolve_variants() -> None:
+    requested_ids: list[str] = []
+
+    def mock_variant_api(request: httpx.Request) -> httpx.Response:
+        variant_id = request.url.path.removeprefix('/api/variant/')
+        requested_ids.append(variant_id)
+        if variant_id in VARIANT_API_RESPONSES:
+            return httpx.Response(200, json=VARIANT_API_RESPONSES[variant_id])
+        else:
+            return httpx.Response(404)
+
+    async def run_resolution() -> dict[str, dict[str, object]]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(mock_variant_api)) as client:
+            variant_records: dict[str, dict[str, object]] = await resolve_variants(['NC_003284.9:g.5116096C>T', 'NC_003284.9:g.5113285_5115215del',
+                                                                                    'NC_003284.9:g.5116096C>T', 'unknown-variant'], client=client)
+            return variant_records
+
+    variant_records = asyncio.run(run_resolution())
+
+    # Duplicate variant IDs should only be resolved once
+    assert sorted(requested_ids) == sorted(['NC_003284.9:g.5116096C>T', 'NC_003284.9:g.5113285_5115215del', 'unknown-variant'])
+
+    # Variants failing to resolve should be left out
+    assert sorted(variant_records.keys()) == sorted(VARIANT_API_RESPONSES.keys())
+
+    assert variant_records['NC_003284.9:g.5116096C>T'] == {
+        'variant_id': 'NC_003284.9:g.5116096C>T',
+        'genomic_seq_id': 'X',
+        'genomic_start_pos': 5116096,
+        'genomic_end_pos': 5116096,
+        'genomic_ref_seq': 'C',
+        'genomic_alt_seq': 'T'
+    }
+    assert 'genomic_alt_seq' not in variant_records['NC_003284.9:g.5113285_5115215del']
+
+
+def test_resolve_no_variants() -> None:
+    assert asyncio.run(resolve_variants([])) == {}
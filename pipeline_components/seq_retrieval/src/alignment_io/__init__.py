@@ -0,0 +1 @@
+from .alignment_parser import ALIGNMENT_FORMAT_TYPE, AlignmentRow, detect_alignment_format, parse_aligned_fasta, parse_alignment, parse_clustal
@@ -0,0 +1,190 @@
+"""
+Module containing lightweight streaming parsers for multiple sequence alignment files,
+yielding the gapped sequence of every alignment row as plain strings (without Biopython object overhead).
+"""
+from typing import Iterator, List, Literal, TextIO, Tuple
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+ALIGNMENT_FORMAT_TYPE = Literal['clustal', 'fasta']
+"""Supported alignment file formats (clustal and aligned FASTA, as output by `clustalo --outfmt=clustal|fa`)."""
+
+AlignmentRow = Tuple[str, str]
+"""Alignment row, as (record ID, gapped sequence) tuple."""
+
+_CLUSTAL_HEADERS = ('CLUSTAL', 'MUSCLE', 'PROBCONS')
+"""Prefixes of the header line of clustal-formatted alignment files."""
+
+
+def detect_alignment_format(alignment_file: TextIO) -> ALIGNMENT_FORMAT_TYPE:
+    """
+    Detect the format of an alignment file from its first non-empty line (leaving the file position untouched).
+
+    Args:
+        alignment_file: (seekable) alignment file to detect the format of
+
+    Returns:
+        Alignment format of `alignment_file`
+
+    Raises:
+        `ValueError`: if the format of `alignment_file` is not a supported alignment format.
+    """
+    start_pos = alignment_file.tell()
+    try:
+        line = alignment_file.readline()
+        while line != '' and line.strip() == '':
+            line = alignment_file.readline()
+
+        if line.startswith('>'):
+            return 'fasta'
+        if line.startswith(_CLUSTAL_HEADERS):
+            return 'clustal'
+    finally:
+        alignment_file.seek(start_pos)
+
+    raise ValueError('Unrecognised alignment format (expected clustal or aligned FASTA).')
+
+
+def parse_clustal(alignment_file: TextIO) -> Iterator[AlignmentRow]:
+    """
+    Parse a clustal-formatted alignment file into alignment rows (in file order).
+
+    Clustal files are interleaved (every block holding a segment of every row), so rows are only complete
+    (and yielded) once the whole file is read. Row segments are kept as plain strings, consensus lines and
+    optional residue numbers (`--resno`) are skipped.
+
+    Args:
+        alignment_file: clustal-formatted alignment file to parse
+
+    Returns:
+        Iterator of (record ID, gapped sequence) tuples
+
+    Raises:
+        `ValueError`: if `alignment_file` is not a valid clustal-formatted alignment file.
+    """
+    header = alignment_file.readline()
+    if not header.startswith(_CLUSTAL_HEADERS):
+        raise ValueError(f"Invalid clustal header line: '{header.rstrip()}'.")
+
+    # Every block lists the rows in the same order, so rows are tracked by their position within the block
+    record_ids: List[str] = []
+    segments: List[List[str]] = []
+    first_block = True
+    row_index = 0
+
+    def complete_block() -> None:
+        nonlocal first_block, row_index
+        if row_index < len(record_ids):
+            raise ValueError(f"Alignment block is missing rows (expected {len(record_ids)}, got {row_index}).")
+        if first_block and len(set(record_ids)) < len(record_ids):
+            raise ValueError("Duplicate record IDs in alignment block.")
+        first_block = False
+        row_index = 0
+
+    for line in alignment_file:
+        # Blank lines delimit blocks, other lines starting with whitespace are consensus lines
+        if line[:1].isspace():
+            if row_index > 0 and line.strip() == '':
+                complete_block()
+            continue
+
+        fields = line.split()
+        if len(fields) > 3:
+            raise ValueError(f"Invalid clustal alignment line: '{line.rstrip()}'.")
+        record_id, segment = fields[0], fields[1] if len(fields) > 1 else ''
+
+        if first_block:
+            record_ids.append(record_id)
+            segments.append([segment])
+        elif row_index < len(record_ids) and record_ids[row_index] == record_id:
+            segments[row_index].append(segment)
+        else:
+            raise ValueError(f"Unexpected record ID '{record_id}' in alignment block (rows must be in the same order in every block).")
+        row_index += 1
+
+    if row_index > 0:
+        complete_block()
+
+    # Release the segments of every row once joined, so they are not kept in memory alongside all joined rows
+    alignment_length = None
+    for row_index, record_id in enumerate(record_ids):
+        gapped_seq = ''.join(segments[row_index])
+        segments[row_index] = []
+        if alignment_length is None:
+            alignment_length = len(gapped_seq)
+        elif len(gapped_seq) != alignment_length:
+            raise ValueError(f"Alignment row '{record_id}' has length {len(gapped_seq)}, expected {alignment_length}.")
+        yield record_id, gapped_seq
+
+
+def parse_aligned_fasta(alignment_file: TextIO) -> Iterator[AlignmentRow]:
+    """
+    Parse an aligned FASTA file into alignment rows, yielding every row as soon as it is read.
+
+    Record IDs are the first word of each header line (as in Biopython).
+
+    Args:
+        alignment_file: aligned FASTA file to parse
+
+    Returns:
+        Iterator of (record ID, gapped sequence) tuples
+
+    Raises:
+        `ValueError`: if `alignment_file` is not a valid aligned FASTA file.
+    """
+    record_id = None
+    seq_lines: List[str] = []
+    alignment_length = None
+
+    def complete_row(record_id: str) -> AlignmentRow:
+        nonlocal alignment_length
+        gapped_seq = ''.join(seq_lines)
+        if alignment_length is None:
+            alignment_length = len(gapped_seq)
+        elif len(gapped_seq) != alignment_length:
+            raise ValueError(f"Alignment row '{record_id}' has length {len(gapped_seq)}, expected {alignment_length}.")
+        return record_id, gapped_seq
+
+    for line in alignment_file:
+        if line[:1] == '>':
+            if record_id is not None:
+                yield complete_row(record_id)
+            header_fields = line[1:].split(maxsplit=1)
+            record_id = header_fields[0] if header_fields else ''
+            seq_lines = []
+        else:
+            line = line.strip()
+            if line:
+                if record_id is None:
+                    raise ValueError(f"Sequence line found before first FASTA header: '{line}'.")
+                seq_lines.append(line)
+
+    if record_id is not None:
+        yield complete_row(record_id)
+
+
+def parse_alignment(alignment_file_path: str, alignment_format: ALIGNMENT_FORMAT_TYPE | None = None) -> Iterator[AlignmentRow]:
+    """
+    Parse an alignment file into alignment rows.
+
+    Args:
+        alignment_file_path: path to the alignment file to parse
+        alignment_format: format of the alignment file (detected from the file content when not provided)
+
+    Returns:
+        Iterator of (record ID, gapped sequence) tuples
+
+    Raises:
+        `ValueError`: if the alignment file is not a valid alignment file of the (detected) format.
+    """
+    with open(alignment_file_path, 'r') as alignment_file:
+        if alignment_format is None:
+            alignment_format = detect_alignment_format(alignment_file)
+            logger.debug(f"Detected {alignment_format} alignment format for '{alignment_file_path}'.")
+
+        if alignment_format == 'clustal':
+            yield from parse_clustal(alignment_file)
+        else:
+            yield from parse_aligned_fasta(alignment_file)
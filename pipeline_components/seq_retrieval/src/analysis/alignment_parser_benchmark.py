@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing runtime and peak memory usage of the streaming alignment parsers with Bio.AlignIO.
+
+Parses a synthetic alignment (written in clustal and aligned FASTA format) into (record ID, gapped sequence) pairs,
+once through Bio.AlignIO and once through the alignment_io parsers.
+
+Run from the `src` directory: `python -m analysis.alignment_parser_benchmark`
+"""
+from Bio import AlignIO
+from Bio.Align import MultipleSeqAlignment
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+import click
+import os
+import random
+from tempfile import TemporaryDirectory
+from typing import List
+
+from analysis.benchmark_utils import measure
+from alignment_io import ALIGNMENT_FORMAT_TYPE, AlignmentRow, parse_alignment
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY-'
+
+
+def synthetic_alignment(sequence_count: int, alignment_length: int, seed: int = 0) -> MultipleSeqAlignment:
+    """Generate a synthetic alignment of `sequence_count` rows of `alignment_length` columns."""
+    rng = random.Random(seed)
+    return MultipleSeqAlignment([SeqRecord(id=f'seq_{i}', seq=Seq(''.join(rng.choices(AMINO_ACIDS, k=alignment_length))))
+                                 for i in range(sequence_count)])
+
+
+def alignio_rows(alignment_file_path: str, alignment_format: ALIGNMENT_FORMAT_TYPE) -> List[AlignmentRow]:
+    """Parse alignment rows through Bio.AlignIO."""
+    return [(str(record.id), str(record.seq)) for record in AlignIO.read(alignment_file_path, alignment_format)]
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--sequence-count", type=click.INT, default=500,
+              help="Number of rows in the synthetic alignment.")
+@click.option("--alignment-length", type=click.INT, default=5000,
+              help="Number of columns in the synthetic alignment.")
+def main(sequence_count: int, alignment_length: int) -> None:
+    alignment = synthetic_alignment(sequence_count, alignment_length)
+
+    alignment_formats: List[ALIGNMENT_FORMAT_TYPE] = ['clustal', 'fasta']
+    with TemporaryDirectory() as tmp_dir:
+        for alignment_format in alignment_formats:
+            alignment_file_path = os.path.join(tmp_dir, f'alignment.{alignment_format}')
+            AlignIO.write(alignment, alignment_file_path, alignment_format)
+
+            alignio_result, alignio_time, alignio_peak = measure(lambda: alignio_rows(alignment_file_path, alignment_format))
+            click.echo(f'{alignment_format} AlignIO: {alignio_time:.3f}s, peak memory {alignio_peak / 1024 / 1024:.1f} MiB')
+
+            parser_result, parser_time, parser_peak = measure(lambda: list(parse_alignment(alignment_file_path, alignment_format)))
+            click.echo(f'{alignment_format} alignment_io: {parser_time:.3f}s, peak memory {parser_peak / 1024 / 1024:.1f} MiB')
+
+            # Both parsers must produce identical results
+            assert parser_result == alignio_result
+
+
+if __name__ == '__main__':
+    main()
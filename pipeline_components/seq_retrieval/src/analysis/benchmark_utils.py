@@ -0,0 +1,62 @@
+"""
+Module containing the runtime and memory measurement helpers shared by all benchmark scripts
+"""
+from time import perf_counter
+import tracemalloc
+from typing import Callable, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def _run_timed(fn: Callable[[], T]) -> Tuple[T, float]:
+    """
+    Run `fn` once, returning its result and runtime (seconds).
+    """
+    start = perf_counter()
+    result = fn()
+    return result, perf_counter() - start
+
+
+def timed(fn: Callable[[], T], repeat: int = 3, warmup: bool = True) -> Tuple[T, float]:
+    """
+    Run `fn` `repeat` times (at least once), returning its (last) result and the best runtime (seconds).
+
+    Args:
+        fn: function to run
+        repeat: number of timed runs
+        warmup: run `fn` once before the timed runs (excluded from the runtimes)
+    """
+    if warmup:
+        fn()
+
+    result, best_runtime = _run_timed(fn)
+    for _ in range(repeat - 1):
+        result, runtime = _run_timed(fn)
+        best_runtime = min(best_runtime, runtime)
+
+    return result, best_runtime
+
+
+def traced(fn: Callable[[], T]) -> Tuple[T, int]:
+    """
+    Run `fn` once while tracing memory allocations, returning its result and the peak traced memory (bytes).
+    """
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, peak
+
+
+def measure(fn: Callable[[], T], repeat: int = 3) -> Tuple[T, float, int]:
+    """
+    Run `fn`, returning its result, the best runtime (seconds) out of `repeat` untraced runs (see `timed`)
+    and the peak traced memory (bytes) of a separate traced run (as tracing distorts runtimes).
+    """
+    _, runtime = timed(fn, repeat=repeat)
+    result, peak = traced(fn)
+
+    return result, runtime, peak
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing single-stream and segmented (concurrent) downloads through data_file_mover.
+
+Any HTTP server supporting range requests can serve as remote (for example a local test server,
+to benchmark without network variability).
+
+Run from the `src` directory: `python -m analysis.download_benchmark --url <url>`
+"""
+import click
+import os
+from tempfile import TemporaryDirectory
+from urllib.parse import unquote, urlparse
+
+from analysis.benchmark_utils import timed
+from data_mover import download_from_url
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--url", type=click.STRING, required=True,
+              help="URL of the (large) remote file to download.")
+@click.option("--segment-size-mib", type=click.INT, default=16,
+              help="Segment size for segmented downloads (MiB).")
+@click.option("--workers", type=click.INT, multiple=True, default=[1, 4, 8],
+              help="Number of concurrent segment downloads to benchmark (1 = single-stream download). Can be repeated.")
+def main(url: str, segment_size_mib: int, workers: tuple[int, ...]) -> None:
+    filename = unquote(os.path.basename(urlparse(url).path))
+
+    for max_workers in workers:
+        with TemporaryDirectory() as download_dir:
+            dest_filepath = os.path.join(download_dir, filename)
+
+            _, runtime = timed(lambda: download_from_url(url, dest_filepath, segment_size=segment_size_mib * 1024 * 1024, max_workers=max_workers),
+                               repeat=1, warmup=False)
+
+            file_size_mib = os.path.getsize(dest_filepath) / 1024**2
+            click.echo(f'{max_workers} worker(s): {file_size_mib:.1f} MiB in {runtime:.2f}s ({file_size_mib / runtime:.1f} MiB/s)')
+
+
+if __name__ == '__main__':
+    main()
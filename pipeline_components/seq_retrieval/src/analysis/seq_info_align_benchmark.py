@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing peak memory usage and runtime of the seq_info_align merge and alignment step.
+
+Compares the former deepcopy-based approach (deepcopy of the merged dict, of every aligned SeqInfo
+and of its embedded variants) with SeqInfo.to_aligned, for a synthetic alignment job.
+
+Run from the `src` directory: `python -m analysis.seq_info_align_benchmark`
+"""
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+import click
+from copy import deepcopy
+import random
+from typing import Dict, List
+
+from analysis.benchmark_utils import measure
+from seq_info import SeqInfo
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, AlignmentPositionIndex, SeqEmbeddedVariant, SeqEmbeddedVariantsList, Variant
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+
+def synthetic_job(sequence_count: int, seq_length: int, variants_per_seq: int, gap_fraction: float,
+                  seed: int = 0) -> tuple[Dict[str, SeqInfo], List[SeqRecord]]:
+    """
+    Generate a synthetic alignment job: the merged sequence info dict and the matching alignment records.
+    """
+    rng = random.Random(seed)
+    alignment_length = int(seq_length / (1 - gap_fraction))
+
+    seq_info_dict: Dict[str, SeqInfo] = {}
+    alignment_records: List[SeqRecord] = []
+    for seq_index in range(sequence_count):
+        sequence = ''.join(rng.choice(AMINO_ACIDS) for _ in range(seq_length))
+
+        gap_positions = set(rng.sample(range(alignment_length), alignment_length - seq_length))
+        residues = iter(sequence)
+        gapped_sequence = ''.join('-' if i in gap_positions else next(residues) for i in range(alignment_length))
+
+        embedded_variants = SeqEmbeddedVariantsList()
+        for seq_pos in sorted(rng.sample(range(1, seq_length + 1), variants_per_seq)):
+            variant = Variant(variant_id=f'NC_000001.1:g.{seq_index * 100000 + seq_pos}A>G', seq_id='1',
+                              start=seq_index * 100000 + seq_pos, end=seq_index * 100000 + seq_pos,
+                              genomic_ref_seq='A', genomic_alt_seq='G')
+            embedded_variants.append(SeqEmbeddedVariant(variant=variant, seq_start_pos=seq_pos, seq_end_pos=seq_pos,
+                                                        embedded_ref_seq_len=1, embedded_alt_seq_len=1))
+
+        seq_id = f'seq_{seq_index}'
+        seq_info_dict[seq_id] = SeqInfo(sequence=sequence, embedded_variants=embedded_variants)
+        alignment_records.append(SeqRecord(id=seq_id, seq=Seq(gapped_sequence)))
+
+    return seq_info_dict, alignment_records
+
+
+def deepcopy_align(seq_info_dict: Dict[str, SeqInfo], alignment_records: List[SeqRecord]) -> Dict[str, SeqInfo]:
+    """Reproduction of the former deepcopy-based merge and alignment step of seq_info_align."""
+    aligned_seq_info_dict = deepcopy(seq_info_dict)
+    for record in alignment_records:
+        aligned_seq_info = deepcopy(seq_info_dict[str(record.id)])
+        embedded_variants = deepcopy(seq_info_dict[str(record.id)].embedded_variants)
+        delattr(aligned_seq_info, 'embedded_variants')
+        alignment_index = AlignmentPositionIndex(record)
+        aligned_seq_info.embedded_variants = AlignmentEmbeddedVariantsList(
+            [AlignmentEmbeddedVariant(variant, alignment_index=alignment_index) for variant in embedded_variants or []])
+        aligned_seq_info_dict[str(record.id)] = aligned_seq_info
+
+    return aligned_seq_info_dict
+
+
+def to_aligned_align(seq_info_dict: Dict[str, SeqInfo], alignment_records: List[SeqRecord]) -> Dict[str, SeqInfo]:
+    """
+    Merge and alignment step of seq_info_align, using SeqInfo.to_aligned.
+
+    Updates a shallow copy of the merged dict (seq_info_align updates the merged dict in place),
+    so the step can be repeated on the same input.
+    """
+    aligned_seq_info_dict = dict(seq_info_dict)
+    for record in alignment_records:
+        aligned_seq_info_dict[str(record.id)] = seq_info_dict[str(record.id)].to_aligned(record)
+
+    return aligned_seq_info_dict
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--sequence-count", type=click.INT, default=500,
+              help="Number of synthetic sequences in the job.")
+@click.option("--seq-length", type=click.INT, default=1000,
+              help="Ungapped length of each synthetic sequence.")
+@click.option("--variants-per-seq", type=click.INT, default=50,
+              help="Number of variants embedded in each synthetic sequence.")
+@click.option("--gap-fraction", type=click.FLOAT, default=0.3,
+              help="Fraction of gap positions in each alignment row.")
+def main(sequence_count: int, seq_length: int, variants_per_seq: int, gap_fraction: float) -> None:
+    seq_info_dict, alignment_records = synthetic_job(sequence_count, seq_length, variants_per_seq, gap_fraction)
+
+    deepcopy_result, deepcopy_time, deepcopy_peak = measure(lambda: deepcopy_align(seq_info_dict, alignment_records))
+    click.echo(f'deepcopy:   {deepcopy_time:.3f}s, peak memory {deepcopy_peak / 1024 / 1024:.1f} MiB')
+
+    to_aligned_result, to_aligned_time, to_aligned_peak = measure(lambda: to_aligned_align(seq_info_dict, alignment_records))
+    click.echo(f'to_aligned: {to_aligned_time:.3f}s, peak memory {to_aligned_peak / 1024 / 1024:.1f} MiB')
+
+    # Both approaches must produce identical results
+    for seq_id, seq_info in deepcopy_result.items():
+        assert to_aligned_result[seq_id].embedded_variants == seq_info.embedded_variants
+
+
+if __name__ == '__main__':
+    main()
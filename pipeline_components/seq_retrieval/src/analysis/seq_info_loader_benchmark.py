@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing the runtime of sequential and concurrent reading and merging of sequence info files.
+
+Writes synthetic sequence info files (one per alternative sequence, as output by seq_retrieval) for increasing file counts
+and merges them once sequentially (the former seq_info_align approach) and once through merge_seq_info_files.
+
+Run from the `src` directory: `python -m analysis.seq_info_loader_benchmark`
+(use `--work-dir` to benchmark on a network-backed file system, where reading latency dominates).
+"""
+import click
+import os
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional
+
+from analysis.benchmark_utils import timed
+from seq_info import decode_seq_info_dict, encode_seq_info_dict, merge_seq_info_files, SeqInfo
+from variant import SeqEmbeddedVariant, SeqEmbeddedVariantsList, Variant
+
+
+def write_synthetic_files(dir_path: str, file_count: int, variants_per_file: int) -> List[str]:
+    """Write `file_count` synthetic sequence info files to `dir_path`, embedding `variants_per_file` variants each."""
+    file_paths: List[str] = []
+    for file_index in range(file_count):
+        embedded_variants = SeqEmbeddedVariantsList()
+        for i in range(variants_per_file):
+            variant = Variant(variant_id=f'NC_000001.1:g.{1000 + i * 10}A>G', seq_id='1', start=1000 + i * 10, end=1000 + i * 10,
+                              genomic_ref_seq='A', genomic_alt_seq='G')
+            embedded_variants.append(SeqEmbeddedVariant(variant=variant, seq_start_pos=i * 3 + 1, seq_end_pos=i * 3 + 1,
+                                                        embedded_ref_seq_len=1, embedded_alt_seq_len=1))
+
+        file_path = os.path.join(dir_path, f'seq_info_{file_index}.json')
+        with open(file_path, 'w') as f:
+            f.write(encode_seq_info_dict({f'seq_{file_index}': SeqInfo(sequence='M' * 500, embedded_variants=embedded_variants)}))
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+def sequential_merge(file_paths: List[str]) -> Dict[str, SeqInfo]:
+    """Read and merge sequence info files one at a time."""
+    merged: Dict[str, SeqInfo] = {}
+    for file_path in file_paths:
+        with open(file_path, 'r') as f:
+            merged.update(decode_seq_info_dict(f.read()))
+    return merged
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--file-counts", type=click.STRING, default='10,100,500,2000',
+              help="Comma separated list of file counts to benchmark.")
+@click.option("--variants-per-file", type=click.INT, default=20,
+              help="Number of variants embedded in each synthetic sequence info file.")
+@click.option("--max-workers", type=click.INT, default=8,
+              help="Maximum number of files read concurrently.")
+@click.option("--work-dir", type=click.STRING, default=None,
+              help="Directory to write the synthetic files to (a temporary directory by default).")
+def main(file_counts: str, variants_per_file: int, max_workers: int, work_dir: Optional[str]) -> None:
+    with TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for file_count in [int(count) for count in file_counts.split(',')]:
+            count_dir = os.path.join(tmp_dir, str(file_count))
+            os.makedirs(count_dir)
+            file_paths = write_synthetic_files(count_dir, file_count, variants_per_file)
+
+            sequential_result, sequential_time = timed(lambda: sequential_merge(file_paths))
+            merge, concurrent_time = timed(lambda: merge_seq_info_files(file_paths, max_workers=max_workers))
+            click.echo(f'{file_count:>5} files: sequential {sequential_time:.3f}s, '
+                       f'concurrent ({max_workers} workers) {concurrent_time:.3f}s ({sequential_time / concurrent_time:.2f}x)')
+
+            # Both approaches must produce identical merges
+            assert not merge.errors
+            assert encode_seq_info_dict(merge.seq_info) == encode_seq_info_dict(sequential_result)
+
+
+if __name__ == '__main__':
+    main()
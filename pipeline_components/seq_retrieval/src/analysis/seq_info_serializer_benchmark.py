@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing the throughput of the schema-driven SeqInfo encoder and decoder with jsonpickle and SeqInfo.from_dict.
+
+Encodes (and decodes) a synthetic dict of SeqInfo objects holding thousands of embedded variants.
+Compares payload size and JSON parse time of the full and the normalized (variant table) format.
+
+Run from the `src` directory: `python -m analysis.seq_info_serializer_benchmark`
+"""
+import click
+from enum import Enum
+import json
+import jsonpickle  # type: ignore
+from typing import Dict
+
+from analysis.benchmark_utils import timed
+from seq_info import decode_seq_info_dict, encode_normalized_seq_info_dict, encode_seq_info_dict, EnumValueHandler, SeqInfo
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, Variant
+
+
+def synthetic_seq_info(sequence_count: int, variants_per_seq: int) -> Dict[str, SeqInfo]:
+    """Generate `sequence_count` aligned SeqInfo objects, embedding `variants_per_seq` variants each."""
+    seq_info_dict: Dict[str, SeqInfo] = {}
+    for seq_index in range(sequence_count):
+        embedded_variants = AlignmentEmbeddedVariantsList()
+        for i in range(variants_per_seq):
+            variant = Variant(variant_id=f'NC_000001.1:g.{1000 + i * 10}A>G', seq_id='1', start=1000 + i * 10, end=1000 + i * 10,
+                              genomic_ref_seq='A', genomic_alt_seq='G')
+            embedded_variant = SeqEmbeddedVariant(variant=variant, seq_start_pos=i * 3 + 1, seq_end_pos=i * 3 + 1,
+                                                  embedded_ref_seq_len=1, embedded_alt_seq_len=1)
+            embedded_variants.append(AlignmentEmbeddedVariant(embedded_variant, alignment_start_pos=i * 4 + 1, alignment_end_pos=i * 4 + 1))
+        seq_info_dict[f'seq_{seq_index}'] = SeqInfo(sequence='M' * variants_per_seq * 3, embedded_variants=embedded_variants)
+
+    return seq_info_dict
+
+
+@click.command(context_settings={'show_default': True})
+@click.option("--sequence-count", type=click.INT, default=200,
+              help="Number of synthetic sequences.")
+@click.option("--variants-per-seq", type=click.INT, default=100,
+              help="Number of variants embedded in each synthetic sequence.")
+def main(sequence_count: int, variants_per_seq: int) -> None:
+    seq_info_dict = synthetic_seq_info(sequence_count, variants_per_seq)
+    variant_count = sequence_count * variants_per_seq
+
+    jsonpickle.register(Enum, EnumValueHandler, base=True)
+    jsonpickle_json, jsonpickle_time = timed(lambda: jsonpickle.encode(seq_info_dict, make_refs=False, unpicklable=False))
+    click.echo(f'encode jsonpickle:     {variant_count / jsonpickle_time:.0f} variants/s ({jsonpickle_time:.3f}s)')
+
+    encoded_json, encode_time = timed(lambda: encode_seq_info_dict(seq_info_dict))
+    click.echo(f'encode schema-driven:  {variant_count / encode_time:.0f} variants/s ({encode_time:.3f}s)')
+
+    # Both encoders must produce byte-identical JSON
+    assert encoded_json == jsonpickle_json
+
+    _, from_dict_time = timed(lambda: {seq_name: SeqInfo.from_dict(seq_info) for seq_name, seq_info in json.loads(encoded_json).items()})
+    click.echo(f'decode from_dict:      {variant_count / from_dict_time:.0f} variants/s ({from_dict_time:.3f}s)')
+
+    _, decode_time = timed(lambda: decode_seq_info_dict(encoded_json))
+    click.echo(f'decode schema-driven:  {variant_count / decode_time:.0f} variants/s ({decode_time:.3f}s)')
+
+    normalized_json, normalized_time = timed(lambda: encode_normalized_seq_info_dict(seq_info_dict))
+    click.echo(f'encode normalized:     {variant_count / normalized_time:.0f} variants/s ({normalized_time:.3f}s)')
+
+    _, full_parse_time = timed(lambda: json.loads(encoded_json))
+    _, normalized_parse_time = timed(lambda: json.loads(normalized_json))
+    click.echo(f'full format:           {len(encoded_json) / 1024 / 1024:.2f} MiB, JSON parse {full_parse_time:.3f}s')
+    click.echo(f'normalized format:     {len(normalized_json) / 1024 / 1024:.2f} MiB, JSON parse {normalized_parse_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
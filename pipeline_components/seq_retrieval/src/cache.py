@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Main module serving the CLI for PAVI local file cache management.
+
+Reports on and enforces the size budget of the local file cache used to store remote (reference) files.
+"""
+import click
+import logging
+from typing import Optional
+
+from data_mover import DEFAULT_DIR
+from data_mover.cache_store import cache_stats, parse_size, prune_cache
+from log_mgmt import set_log_level, get_logger
+
+logger = get_logger(name=__name__)
+
+
+def process_size_budget_param(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[int]:  # noqa: U100
+    """
+    Parse the value of click input parameter size-budget into bytes.
+
+    Returns:
+        Size budget in bytes, or `None` when not defined.
+
+    Raises:
+        click.BadParameter: If value could not be parsed as size.
+    """
+    if value is None:
+        return None
+    try:
+        return parse_size(value)
+    except ValueError:
+        raise click.BadParameter(f"Invalid size '{value}', expected a number of bytes optionally followed by a K, M, G or T unit.")
+
+
+@click.group(name='cache', context_settings={'show_default': True})
+@click.option("--cache-dir", type=click.STRING, default=DEFAULT_DIR,
+              help="Local file cache directory.")
+@click.option("--debug", is_flag=True,
+              help="""Flag to enable debug printing.""")
+@click.pass_context
+def main(ctx: click.Context, cache_dir: str, debug: bool) -> None:
+    """
+    Manage the PAVI local file cache.
+    """
+    if debug:
+        set_log_level(logging.DEBUG)
+    else:
+        set_log_level(logging.INFO)
+
+    ctx.obj = cache_dir
+
+
+@main.command(context_settings={'show_default': True})
+@click.option("--size-budget", type=click.STRING, required=False, callback=process_size_budget_param,
+              help="Total size budget of the cache (for example '20G'), to report usage against.")
+@click.pass_obj
+def stats(cache_dir: str, size_budget: Optional[int]) -> None:
+    """
+    Report local file cache statistics.
+    """
+    cache_statistics = cache_stats(cache_dir, size_budget=size_budget)
+
+    click.echo(f"Cache directory: {cache_statistics['cache_dir']}")
+    click.echo(f"Cached files: {cache_statistics['files']} (in {cache_statistics['groups']} groups)")
+    click.echo(f"Total size: {cache_statistics['total_size'] / 1024**2:.1f} MiB")
+    if cache_statistics['size_budget'] is not None:
+        usage = cache_statistics['total_size'] / cache_statistics['size_budget'] if cache_statistics['size_budget'] else float('inf')
+        click.echo(f"Size budget: {cache_statistics['size_budget'] / 1024**2:.1f} MiB ({usage:.0%} used)")
+
+
+@main.command(context_settings={'show_default': True})
+@click.option("--size-budget", type=click.STRING, required=True, callback=process_size_budget_param,
+              help="Total size budget of the cache (for example '20G'). Least recently used files are evicted until the cache fits.")
+@click.pass_obj
+def prune(cache_dir: str, size_budget: int) -> None:
+    """
+    Evict least recently used files from the local file cache until it fits the size budget.
+    """
+    evicted = prune_cache(cache_dir, size_budget=size_budget)
+
+    for group in evicted:
+        click.echo(f"Evicted {', '.join(group.files)} ({group.size / 1024**2:.1f} MiB)")
+    click.echo(f"Evicted {len(evicted)} cache groups ({sum(group.size for group in evicted) / 1024**2:.1f} MiB).")
+
+
+if __name__ == '__main__':
+    main()
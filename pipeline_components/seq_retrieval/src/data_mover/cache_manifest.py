@@ -0,0 +1,116 @@
+"""
+Module used to record and read the cache manifest entries of remote files downloaded to the local file cache
+"""
+import hashlib
+import json
+import os.path
+from time import time
+from typing import Optional, TypedDict
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+_MANIFEST_SUFFIX = '.cache.json'
+"""Suffix of the manifest entry file stored alongside each cached file."""
+
+
+class CacheEntry(TypedDict):
+    """
+    Type representing the cache manifest entry of a remote file downloaded to the local file cache.
+    """
+    url: str
+    """URL the file was downloaded from"""
+    etag: Optional[str]
+    """ETag response header value of the download (if any)"""
+    last_modified: Optional[str]
+    """Last-Modified response header value of the download (if any)"""
+    size: int
+    """Size of the downloaded file (bytes)"""
+    md5: str
+    """MD5 checksum of the downloaded file"""
+    md5_verified: bool
+    """Whether the MD5 checksum was verified against a checksum provided for the remote file"""
+    cached_at: float
+    """Time at which the file was cached (seconds since epoch)"""
+
+
+def manifest_path(local_path: str) -> str:
+    """
+    Return the path of the manifest entry file for cached file `local_path`.
+    """
+    return local_path + _MANIFEST_SUFFIX
+
+
+def file_md5(local_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calculate the MD5 checksum of a local file.
+
+    Returns:
+        Hexadecimal MD5 digest (string).
+    """
+    md5 = hashlib.md5()
+    with open(local_path, 'rb') as local_file:
+        for chunk in iter(lambda: local_file.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def write_entry(local_path: str, url: str, etag: Optional[str], last_modified: Optional[str], md5: Optional[str] = None,
+                md5_verified: bool = False) -> CacheEntry:
+    """
+    Record the cache manifest entry for a file downloaded to `local_path`.
+
+    Args:
+        local_path: path to the downloaded file
+        url: URL the file was downloaded from
+        etag: ETag response header value of the download
+        last_modified: Last-Modified response header value of the download
+        md5: MD5 checksum of the downloaded file (calculated when not provided)
+        md5_verified: whether `md5` was verified against a checksum provided for the remote file
+
+    Returns:
+        The recorded CacheEntry.
+    """
+    entry = CacheEntry(url=url, etag=etag, last_modified=last_modified,
+                       size=os.path.getsize(local_path),
+                       md5=md5 if md5 is not None else file_md5(local_path),
+                       md5_verified=md5_verified, cached_at=time())
+
+    tmp_manifest_path = manifest_path(local_path) + '.part'
+    with open(tmp_manifest_path, 'w') as manifest_file:
+        json.dump(entry, manifest_file)
+    os.replace(tmp_manifest_path, manifest_path(local_path))
+
+    return entry
+
+
+def read_entry(local_path: str) -> Optional[CacheEntry]:
+    """
+    Read the cache manifest entry for cached file `local_path`.
+
+    Returns:
+        The recorded CacheEntry, or `None` if no (valid) entry is found.
+    """
+    entry_path = manifest_path(local_path)
+    if not os.path.isfile(entry_path):
+        return None
+
+    try:
+        with open(entry_path, 'r') as manifest_file:
+            entry_dict = json.load(manifest_file)
+        return CacheEntry(url=entry_dict['url'], etag=entry_dict['etag'], last_modified=entry_dict['last_modified'],
+                          size=entry_dict['size'], md5=entry_dict['md5'], md5_verified=entry_dict.get('md5_verified', False),
+                          cached_at=entry_dict['cached_at'])
+    except (ValueError, KeyError) as e:
+        logger.warning(f"Invalid cache manifest entry {entry_path} ignored: {e}")
+        return None
+
+
+def remove_entry(local_path: str) -> None:
+    """
+    Remove the cache manifest entry for cached file `local_path` (if any).
+    """
+    entry_path = manifest_path(local_path)
+    if os.path.isfile(entry_path):
+        os.remove(entry_path)
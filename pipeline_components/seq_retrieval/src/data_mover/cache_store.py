@@ -0,0 +1,191 @@
+"""
+Module defining the local file cache layout and enforcing its size budget through LRU eviction
+"""
+from contextlib import ExitStack
+import hashlib
+import os.path
+import shutil
+from time import time
+from typing import Iterable, List, NamedTuple, Optional, TypedDict
+from urllib.parse import unquote, urlparse
+
+from log_mgmt import get_logger
+from . import cache_manifest, file_lock
+
+logger = get_logger(name=__name__)
+
+_COMPANION_SUFFIXES = ('.fai', '.gzi')
+"""URL suffixes of companion (index) files, cached together with the file they index."""
+
+_KEY_LENGTH = 16
+"""Length of the (hexadecimal) URL hash used as cache key."""
+
+
+class CacheGroup(NamedTuple):
+    """
+    Cached file (such as a fasta file) together with its cached companion files (such as .fai and .gzi indices),
+    which are cached and evicted as a single unit.
+    """
+    key: str
+    """Cache key (URL hash) of the group"""
+    path: str
+    """Path to the cache directory of the group"""
+    files: List[str]
+    """Names of all files in the group"""
+    size: int
+    """Total size of all files in the group (bytes)"""
+    last_used: float
+    """Time at which any file of the group was last used (seconds since epoch)"""
+
+
+class CacheStats(TypedDict):
+    """
+    Type representing local file cache statistics.
+    """
+    cache_dir: str
+    """Local file cache directory"""
+    groups: int
+    """Number of cache groups"""
+    files: int
+    """Number of cached files"""
+    total_size: int
+    """Total size of all cached files (bytes)"""
+    size_budget: Optional[int]
+    """Total size budget of the cache (bytes), `None` if unbounded"""
+
+
+def cache_key(url: str) -> str:
+    """
+    Return the cache key for `url`.
+
+    Companion file URLs (`url` + '.fai' or '.gzi') share the cache key of the file they index.
+    """
+    group_url = url
+    for suffix in _COMPANION_SUFFIXES:
+        if group_url.endswith(suffix):
+            group_url = group_url[:-len(suffix)]
+            break
+    return hashlib.sha256(group_url.encode('utf-8')).hexdigest()[:_KEY_LENGTH]
+
+
+def cache_path(url: str, cache_dir: str) -> str:
+    """
+    Return the path at which the file at `url` is cached in `cache_dir`.
+
+    Files are stored as `cache_dir`/`cache_key`/`filename`, which ensures identically named files from different URLs
+    do not collide while companion files (such as faidx indices) remain stored alongside the file they index.
+    """
+    filename = unquote(os.path.basename(urlparse(url).path))
+    return os.path.join(cache_dir, cache_key(url), filename)
+
+
+def record_use(local_path: str) -> None:
+    """
+    Record use of cached file `local_path` (used to determine eviction order).
+    """
+    entry_path = cache_manifest.manifest_path(local_path)
+    if os.path.isfile(entry_path):
+        os.utime(entry_path)
+
+
+def list_cache_groups(cache_dir: str) -> List[CacheGroup]:
+    """
+    List all cache groups in `cache_dir`, least recently used first.
+
+    Files not stored according to the cache layout are ignored.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+
+    groups: List[CacheGroup] = []
+    with os.scandir(cache_dir) as cache_dir_entries:
+        for dir_entry in cache_dir_entries:
+            if not dir_entry.is_dir() or len(dir_entry.name) != _KEY_LENGTH:
+                continue
+
+            files: List[str] = []
+            size = 0
+            last_used = dir_entry.stat().st_mtime
+            with os.scandir(dir_entry.path) as group_entries:
+                for file_entry in group_entries:
+                    if not file_entry.is_file(follow_symlinks=False) or file_lock.is_lock_file(file_entry.name):
+                        continue
+                    file_stat = file_entry.stat()
+                    files.append(file_entry.name)
+                    size += file_stat.st_size
+                    last_used = max(last_used, file_stat.st_mtime)
+
+            groups.append(CacheGroup(key=dir_entry.name, path=dir_entry.path, files=sorted(files), size=size, last_used=last_used))
+
+    groups.sort(key=lambda group: group.last_used)
+    return groups
+
+
+def cache_stats(cache_dir: str, size_budget: Optional[int] = None) -> CacheStats:
+    """
+    Report statistics on the local file cache in `cache_dir`.
+    """
+    groups = list_cache_groups(cache_dir)
+    return CacheStats(cache_dir=cache_dir, groups=len(groups), files=sum(len(group.files) for group in groups),
+                      total_size=sum(group.size for group in groups), size_budget=size_budget)
+
+
+def prune_cache(cache_dir: str, size_budget: int, keep: Iterable[str] = ()) -> List[CacheGroup]:
+    """
+    Evict least recently used cache groups from `cache_dir` until its total size fits `size_budget`.
+
+    Groups with files locked by any (other) process, such as files being downloaded, are never evicted.
+
+    Args:
+        cache_dir: local file cache directory
+        size_budget: total size budget of the cache (bytes)
+        keep: cache keys of groups never to evict (such as groups currently in use)
+
+    Returns:
+        List of evicted cache groups.
+    """
+    groups = list_cache_groups(cache_dir)
+    total_size = sum(group.size for group in groups)
+    keep_keys = set(keep)
+
+    evicted: List[CacheGroup] = []
+    for group in groups:
+        if total_size <= size_budget:
+            break
+        if group.key in keep_keys:
+            continue
+
+        with ExitStack() as group_locks:
+            locked_files = [os.path.join(group.path, filename.removesuffix(file_lock.LOCK_SUFFIX))
+                            for filename in os.listdir(group.path) if file_lock.is_lock_file(filename)]
+            if not all(group_locks.enter_context(file_lock.file_lock(locked_file, blocking=False)) for locked_file in locked_files):
+                logger.debug(f"Cache group {group.key} is in use, skipping eviction.")
+                continue
+
+            logger.info(f"Evicting cache group {group.key} ({', '.join(group.files)}, {group.size / 1024**2:.1f} MiB, "
+                        + f"last used {time() - group.last_used:.0f}s ago).")
+            shutil.rmtree(group.path, ignore_errors=True)
+            total_size -= group.size
+            evicted.append(group)
+
+    if total_size > size_budget:
+        logger.warning(f"Local file cache {cache_dir} exceeds its size budget after pruning "
+                       + f"({total_size} > {size_budget} bytes).")
+
+    return evicted
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a human-readable size (bytes, or with K/M/G/T binary unit suffix, such as '500M' or '20G') into bytes.
+
+    Raises:
+        `ValueError`: if `size` is not a valid size.
+    """
+    units = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4}
+    value = size.strip().upper().removesuffix('B').removesuffix('I')
+    unit = value[-1:] if value[-1:] in units else ''
+    number = float(value[:-1] if unit else value)
+    if number < 0:
+        raise ValueError(f"Invalid size '{size}', must not be negative.")
+    return int(number * units[unit])
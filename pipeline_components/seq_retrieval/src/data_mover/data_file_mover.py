@@ -1,45 +1,143 @@
 """
 Module used to find, access and copy files at/to/from remote locations
 """
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os.path
 from pathlib import Path
+import re
 import requests
-from typing import Dict, Optional
-from urllib.parse import urlparse, unquote
+from requests.adapters import HTTPAdapter
+from threading import Lock
+from time import perf_counter
+from typing import Dict, get_args, List, Literal, Mapping, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 from log_mgmt import get_logger
+from . import cache_manifest, cache_store, fasta_indexing, file_lock, prestaged_store, s3
 
 logger = get_logger(name=__name__)
 
 _stored_files: Dict[str, str] = dict()
 """Module level memory cache of filepaths for all files accessed through this module."""
 
-_DEFAULT_DIR = '/tmp/pavi/'
+DEFAULT_DIR = '/tmp/pavi/'
 """Module level default destination directory to search/download remote files in/to."""
 
-_reuse_local_cache = False
+_DEFAULT_CHUNK_SIZE = 1024 * 1024
+"""Module level default chunk size used while streaming downloads to disk."""
+
+_DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+"""Module level default size of the byte range segments large files are split into for concurrent downloading."""
+
+_DEFAULT_MAX_WORKERS = 4
+"""Module level default maximum number of concurrent segment downloads (per file)."""
+
+_CHECKSUM_SIDECAR_SUFFIX = '.md5'
+"""URL suffix of (md5sum formatted) sidecar checksum files, against which downloads are verified when available."""
+
+_CONNECTION_POOL_SIZE = 16
+"""Maximum number of pooled connections per host (bounds the useful number of concurrent segment downloads)."""
+
+_session = requests.Session()
+"""Module level requests session, pooling connections for all downloads."""
+_session.mount('http://', HTTPAdapter(pool_maxsize=_CONNECTION_POOL_SIZE))
+_session.mount('https://', HTTPAdapter(pool_maxsize=_CONNECTION_POOL_SIZE))
+_session.auth = s3.default_auth
+
+CACHE_POLICY_TYPE = Literal['validate', 'trust', 'refresh']
+
+_cache_policy: CACHE_POLICY_TYPE = 'validate'
 """
-Module level toggle defining local file cache reuse behaviour.
- * When True, reuse identically named files existing pre-runtime at local destination location for remote files
- * When False, delete identically named files existing pre-runtime at local destination location for remote files before downloading.
+Module level setting defining local file cache reuse behaviour for remote files.
+ * 'validate': reuse files at the local destination location when their cache manifest entry (size, ETag/Last-Modified)
+   is validated against the remote through a conditional request, download again when stale (default).
+ * 'trust': reuse identically named files existing at the local destination location without validation.
+ * 'refresh': delete identically named files existing at the local destination location and download again.
 
-Change the value through the `set_local_cache_reuse` function.
+Change the value through the `set_local_cache_policy` function.
 """
 
 
-def set_local_cache_reuse(reuse: bool) -> None:
+def set_local_cache_policy(policy: CACHE_POLICY_TYPE) -> None:
     """
     Define data_file_mover module-level behaviour on local file cache reuse.
 
-    data_file_mover will
-     * reuse identically named files at local target location when available pre-runtime when set to `True`.
-     * remove identically named files at local target location when present pre-runtime when set to `False`.
+    Args:
+        policy: local cache policy to apply (see `_cache_policy`), default `'validate'`.
+
+    Raises:
+        `ValueError`: if `policy` is not a valid cache policy.
+    """
+    if policy not in get_args(CACHE_POLICY_TYPE):
+        raise ValueError(f"Invalid local cache policy '{policy}', must be one of {get_args(CACHE_POLICY_TYPE)}.")
+
+    global _cache_policy
+    _cache_policy = policy
+
+
+_prestaged_dirs: List[str] = []
+"""
+Module level list of read-only pre-staged directories, searched (in order) for remote files before
+the local file cache (`dest_dir`) and the network. URLs are mapped to pre-staged files by the manifest
+in each directory (see `prestaged_store`).
+
+Change the value through the `set_prestaged_dirs` function.
+"""
+
+
+def set_prestaged_dirs(prestaged_dirs: List[str]) -> None:
+    """
+    Define data_file_mover module-level read-only pre-staged directories.
+
+    Args:
+        prestaged_dirs: pre-staged directories to search for remote files (in order).
+    """
+    global _prestaged_dirs
+    _prestaged_dirs = list(prestaged_dirs)
+
+
+FILE_TIER_TYPE = Literal['local', 'prestaged', 'cache', 'network']
+
+_served_tiers: Dict[str, FILE_TIER_TYPE] = dict()
+"""
+Module level record of the tier that served every file fetched through `fetch_file`, indexed by URL:
+ * 'local': local file (file:// URL)
+ * 'prestaged': read-only pre-staged directory
+ * 'cache': local file cache (scratch directory)
+ * 'network': downloaded from remote
+"""
+
+
+def served_tiers() -> Dict[str, FILE_TIER_TYPE]:
+    """
+    Report the tier that served every file fetched through `fetch_file`.
+
+    Returns:
+        Dict of tiers (see `_served_tiers`), indexed by URL.
+    """
+    return dict(_served_tiers)
+
+
+_cache_size_budget: Optional[int] = None
+"""
+Module level total size budget (bytes) of the local file cache, `None` for an unbounded cache.
+When exceeded after a download, least recently used cached files (together with their companion files) are evicted.
+
+Change the value through the `set_cache_size_budget` function.
+"""
+
+
+def set_cache_size_budget(size_budget: Optional[int]) -> None:
+    """
+    Define data_file_mover module-level total size budget of the local file cache.
 
     Args:
-        reuse (bool): set to `True` to enable local cache reuse behavior (default `False`)
+        size_budget: total size budget (bytes), `None` for an unbounded cache (default).
     """
-    global _reuse_local_cache
-    _reuse_local_cache = reuse
+    global _cache_size_budget
+    _cache_size_budget = size_budget
 
 
 def is_accessible_url(url: str) -> bool:
@@ -59,20 +157,27 @@ def is_accessible_url(url: str) -> bool:
         return False
 
 
-def fetch_file(url: str, dest_dir: str = _DEFAULT_DIR, reuse_local_cache: Optional[bool] = None) -> str:
+def fetch_file(url: str, dest_dir: str = DEFAULT_DIR, cache_policy: Optional[CACHE_POLICY_TYPE] = None,
+               expected_md5: Optional[str] = None) -> str:
     """
     Search local file path matching URL in caches, fetch file from URL if not found.
 
     First searched the data_file_mover module's `_stored_files` memory cache for result of previous retrievals,
-    then searches the local file cache if `reuse_local_file_cache` is True.
-    If not found, parses `url` to determine scheme and sends it to the appropriate data_file_mover function for retrieval.
+    then searches the read-only pre-staged directories (`_prestaged_dirs`),
+    then searches the local file cache as defined by `cache_policy`.
+    If not found (or stale), parses `url` to determine scheme and sends it to the appropriate data_file_mover function for retrieval.
+    Remote files are cached at the `dest_dir` location defined by `cache_store.cache_path`, and the local file cache
+    gets pruned to the `_cache_size_budget` after every download.
+    Concurrent processes fetching the same remote file coordinate through file locks, so it is downloaded only once.
     Result is cached in the data_file_mover module's `_stored_files` memory cache, which is used to speed up
-    repeated retrieval.
+    repeated retrieval, and the tier which served the file is recorded (see `served_tiers`).
 
     Args:
         url: URL to fetch local file for
         dest_dir: Destination directory to search/download remote files in/to.
-        reuse_local_cache: Argument to override local cache reuse behavior defined at data_file_mover level.
+        cache_policy: Argument to override local cache policy defined at data_file_mover level.
+        expected_md5: Expected MD5 checksum of remote files, verified on download \
+                      and compared against the checksum recorded in the cache manifest on local file cache reuse.
 
     Returns:
         Absolute path to local file matching the requested URL (string).
@@ -83,45 +188,212 @@ def fetch_file(url: str, dest_dir: str = _DEFAULT_DIR, reuse_local_cache: Option
 
     local_path: str
 
-    if reuse_local_cache is None:
-        reuse_local_cache = _reuse_local_cache
+    if cache_policy is None:
+        cache_policy = _cache_policy
 
     if url in _stored_files.keys():
         logger.debug(f"Fetching {url} from memory cache.")
         local_path = _stored_files[url]
     else:
+        tier: FILE_TIER_TYPE
         url_components = urlparse(url)
         if url_components.scheme == 'file':
             filepath = url_components.netloc + url_components.path
             local_path = find_local_file(filepath)
+            tier = 'local'
 
-        elif url_components.scheme in ['http', 'https']:
-
-            filename = unquote(os.path.basename(url_components.path))
-            local_file_path = os.path.join(dest_dir, filename)
-
-            if reuse_local_cache is True:
-
-                try:
-                    local_path = find_local_file(local_file_path)
-                except FileNotFoundError:
-                    logger.info(f"File for {url} not found on download destination, downloading from remote to {dest_dir}.")
-                    local_path = download_from_url(url, local_file_path)
-                else:
-                    logger.info(f"Found file for {url} in local file cache.")
-
+        elif url_components.scheme in ['http', 'https', 's3']:
+            prestaged_path = prestaged_store.find_prestaged_file(url, _prestaged_dirs)
+            if prestaged_path is not None:
+                local_path = prestaged_path
+                tier = 'prestaged'
             else:
-                logger.info(f"Downloading {url} from remote to {dest_dir}.")
-                local_path = download_from_url(url, local_file_path)
+                local_path, tier = _fetch_remote_file(url, dest_dir, cache_policy, expected_md5)
         else:
             # Currently not supported
             raise NotImplementedError(f"URL with scheme '{url_components.scheme}' is currently not supported.")
 
+        logger.debug(f"Fetched {url} from {tier} tier ({local_path}).")
         _stored_files[url] = local_path
+        _served_tiers[url] = tier
 
     return local_path
 
 
+def fetch_indexed_fasta_file(fasta_file_url: str, dest_dir: str = DEFAULT_DIR) -> str:
+    """
+    Fetch a fasta file and its faidx index files, deriving the index files locally when not available.
+
+    Fetches the fasta file and index files (`fasta_file_url`.fai + `fasta_file_url`.gzi if compressed) concurrently
+    (over the pooled data_file_mover session), so cold-start latency for small files approaches a single round trip.
+    When any index file is not available (alongside the fasta file),
+    or the fasta file is plain gzip-compressed (which does not support random access),
+    the fasta file is converted to BGZF (if required) and indexed locally once (see `fasta_indexing.index_local_fasta`).
+    Derived files are stored in the local file cache (alongside the cached fasta file) for reuse by later calls.
+
+    Args:
+        fasta_file_url: URL of the fasta file to fetch
+        dest_dir: Destination directory to search/download remote files in/to.
+
+    Returns:
+        Absolute path to the (local) faidx-indexed fasta file (string), with index files alongside.
+    """
+    index_file_urls = [fasta_file_url + '.fai']
+    if fasta_file_url.endswith('.gz'):
+        index_file_urls.append(fasta_file_url + '.gzi')
+
+    with ThreadPoolExecutor(max_workers=1 + len(index_file_urls)) as executor:
+        fasta_future = executor.submit(fetch_file, fasta_file_url, dest_dir)
+        index_futures = [executor.submit(fetch_file, index_file_url, dest_dir) for index_file_url in index_file_urls]
+
+        local_fasta_path = fasta_future.result()
+        indices_available = True
+        for index_file_url, index_future in zip(index_file_urls, index_futures):
+            try:
+                local_index_path = index_future.result()
+            except (ValueError, FileNotFoundError) as e:
+                logger.info(f"Index file {index_file_url} not available: {e}")
+                indices_available = False
+            else:
+                # Index files must be stored alongside the fasta file (which may not be the case
+                # when fasta and index files were served from different tiers)
+                if local_index_path != local_fasta_path + index_file_url[len(fasta_file_url):]:
+                    logger.info(f"Index file {index_file_url} not stored alongside fasta file {local_fasta_path}.")
+                    indices_available = False
+
+    if fasta_indexing.is_gzip(local_fasta_path):
+        usable = indices_available and len(index_file_urls) == 2 and fasta_indexing.is_bgzf(local_fasta_path)
+    else:
+        usable = indices_available
+
+    if usable:
+        return local_fasta_path
+
+    logger.info(f"No usable faidx index available for {fasta_file_url}, indexing locally.")
+    return fasta_indexing.index_local_fasta(local_fasta_path, derived_dir=os.path.dirname(cache_store.cache_path(fasta_file_url, dest_dir)))
+
+
+def _fetch_remote_file(url: str, dest_dir: str, cache_policy: CACHE_POLICY_TYPE, expected_md5: Optional[str]) -> Tuple[str, FILE_TIER_TYPE]:
+    """
+    Search the local file cache for a file matching remote `url` as defined by `cache_policy`, download it if not found.
+
+    Cache lookup and download are done while holding an (advisory) file lock on the local file path,
+    so concurrent processes fetching the same file wait for a single download rather than downloading it in parallel.
+    Processes that waited for a concurrent download reuse its result without further validation.
+    Concurrent downloads are detected by comparing the cache manifest entry read before the first lock attempt
+    with the one found once the lock is acquired (a new entry is only written by a completed download).
+
+    Returns:
+        Tuple of the absolute path to local file matching `url` (string) and the tier which served it ('cache' or 'network').
+    """
+    local_file_path = cache_store.cache_path(url, dest_dir)
+
+    prior_entry = cache_manifest.read_entry(local_file_path)
+    with file_lock.file_lock(local_file_path, blocking=False) as acquired:
+        if acquired:
+            return _fetch_remote_file_locked(url, dest_dir, local_file_path, cache_policy, expected_md5)
+
+    logger.info(f"Waiting for concurrent download of {url} by another process.")
+    with file_lock.file_lock(local_file_path):
+        entry = cache_manifest.read_entry(local_file_path)
+        if (entry is not None and entry != prior_entry and entry['url'] == url
+                and os.path.isfile(local_file_path) and os.path.getsize(local_file_path) == entry['size']
+                and (expected_md5 is None or entry['md5'] == expected_md5.lower())):
+            logger.info(f"Reusing file for {url} downloaded concurrently by another process.")
+            cache_store.record_use(local_file_path)
+            return find_local_file(local_file_path), 'cache'
+
+        return _fetch_remote_file_locked(url, dest_dir, local_file_path, cache_policy, expected_md5)
+
+
+def _fetch_remote_file_locked(url: str, dest_dir: str, local_file_path: str, cache_policy: CACHE_POLICY_TYPE,
+                              expected_md5: Optional[str]) -> Tuple[str, FILE_TIER_TYPE]:
+    """
+    Search the local file cache for a file matching remote `url` as defined by `cache_policy`, download it if not found.
+
+    Cached files are only reused when the checksum recorded in their cache manifest entry matches `expected_md5` (if defined),
+    which requires no re-reading of the cached file.
+
+    Must only be called while holding the file lock on `local_file_path`.
+
+    Returns:
+        Tuple of the absolute path to local file matching `url` (string) and the tier which served it ('cache' or 'network').
+    """
+    cached_path: Optional[str] = None
+    if cache_policy == 'trust':
+        try:
+            cached_path = find_local_file(local_file_path)
+        except FileNotFoundError:
+            logger.info(f"File for {url} not found on download destination.")
+        else:
+            logger.info(f"Found file for {url} in local file cache.")
+    elif cache_policy == 'validate':
+        cached_path = validate_cached_file(url, local_file_path)
+
+    if cached_path is not None and expected_md5 is not None:
+        entry = cache_manifest.read_entry(cached_path)
+        if entry is None or entry['md5'] != expected_md5.lower():
+            logger.warning(f"Cached file for {url} does not match expected MD5 checksum {expected_md5}.")
+            cached_path = None
+
+    if cached_path is not None:
+        cache_store.record_use(cached_path)
+        return cached_path, 'cache'
+
+    logger.info(f"Downloading {url} from remote to {dest_dir}.")
+    local_path = download_from_url(url, local_file_path, expected_md5=expected_md5)
+    if _cache_size_budget is not None:
+        # Never evict files in use by this process
+        in_use_keys = [cache_store.cache_key(stored_url) for stored_url in [url, *_stored_files.keys()]]
+        cache_store.prune_cache(dest_dir, size_budget=_cache_size_budget, keep=in_use_keys)
+
+    return local_path, 'network'
+
+
+def validate_cached_file(url: str, local_file_path: str) -> Optional[str]:
+    """
+    Validate a file in the local file cache against its remote source.
+
+    The cached file is considered valid when its cache manifest entry matches `url` and the local file size,
+    and a conditional request (using the recorded ETag and Last-Modified values) reports the remote file as unmodified (304).
+
+    Args:
+        url: URL of the remote file
+        local_file_path: path of the cached file for `url`
+
+    Returns:
+        Absolute path to the cached file when valid, `None` otherwise.
+    """
+    if not os.path.isfile(local_file_path):
+        logger.debug(f"File for {url} not found in local file cache.")
+        return None
+
+    entry = cache_manifest.read_entry(local_file_path)
+    if entry is None or entry['url'] != url:
+        logger.info(f"No cache manifest entry found for cached file {local_file_path}, cannot validate.")
+        return None
+    if entry['size'] != os.path.getsize(local_file_path):
+        logger.warning(f"Cached file {local_file_path} does not match the size recorded in its cache manifest entry.")
+        return None
+
+    conditional_headers: Dict[str, str] = {}
+    if entry['etag'] is not None:
+        conditional_headers['If-None-Match'] = entry['etag']
+    if entry['last_modified'] is not None:
+        conditional_headers['If-Modified-Since'] = entry['last_modified']
+    if not conditional_headers:
+        logger.info(f"Cached file {local_file_path} has no ETag or Last-Modified recorded, cannot validate.")
+        return None
+
+    with _session.get(s3.http_url(url), headers=conditional_headers, stream=True) as response:
+        if response.status_code == 304:
+            logger.info(f"Validated file for {url} in local file cache.")
+            return find_local_file(local_file_path)
+
+    logger.info(f"Cached file for {url} is stale (status {response.status_code}).")
+    return None
+
+
 def find_local_file(path: str) -> str:
     """
     Find a file locally based on path and return its absolute path.
@@ -144,51 +416,400 @@ def find_local_file(path: str) -> str:
             return str(Path(path).resolve())
 
 
-def download_from_url(url: str, dest_filepath: str, chunk_size: int = 10 * 1024) -> str:
+def download_from_url(url: str, dest_filepath: str, chunk_size: int = _DEFAULT_CHUNK_SIZE,
+                      segment_size: int = _DEFAULT_SEGMENT_SIZE, max_workers: int = _DEFAULT_MAX_WORKERS,
+                      expected_md5: Optional[str] = None) -> str:
     """
     Download file from remote URL and return its absolute local path.
 
-    Parses `url` to determine scheme and downloads the remote file to local filesystem as appropriate.
+    Parses `url` to determine scheme and downloads the remote file to local filesystem as appropriate
+    (s3:// URLs are downloaded from the S3 endpoint defined by `s3.endpoint_url`).
     Removes file at `dest_filepath` when found before initiating download.
+    Records a cache manifest entry for the downloaded file, used to validate it on later reuse.
+
+    The download starts with a single open-ended range request, whose response determines the file size
+    and whether the server supports range requests, and is streamed to disk directly (no separate HEAD round trip).
+    Files larger than `segment_size` are split into byte ranges (segments) which are downloaded concurrently
+    (when the server supports range requests), using the initial response for the first segment.
+    Download progress is kept in a `dest_filepath`.part file (and `dest_filepath`.part.progress file for segmented downloads),
+    from which failed downloads are resumed on retry.
+    The size of the downloaded file is verified against the size reported by the server.
+    The MD5 checksum of the downloaded file is calculated while downloading and verified against `expected_md5`,
+    or against the checksum in sidecar file `url`.md5 when available (looked up concurrently with the download).
+    The checksum is recorded in the cache manifest, so later cache hits need no re-verification.
 
     Args:
         url: URL to remote file to download
         dest_filepath: Destination filepath to download remote file to.
         chunk_size: Chunk size use while downloading
+        segment_size: Size of the byte ranges to download concurrently
+        max_workers: Maximum number of concurrent segment downloads
+        expected_md5: Expected MD5 checksum of the file (default: read from sidecar file `url`.md5 if available)
 
     Returns:
         Absolute path to the downloaded file (string).
 
     Raises:
         `ValueError`: if `url` is not accessible.
+        `IOError`: if the size of the downloaded file does not match the size reported by the server,
+                   or its checksum does not match the expected checksum.
         `NotImplementedError`: if `url` scheme is not supported
     """
 
     url_components = urlparse(url)
-    if url_components.scheme in ['http', 'https']:
-
-        if not is_accessible_url(url):
-            raise ValueError(f"URL {url} is not accessible.")
+    if url_components.scheme in ['http', 'https', 's3']:
+        # s3:// URLs are downloaded through their S3 REST endpoint (through signed requests when credentials are available)
+        http_url = s3.http_url(url)
 
         Path(os.path.dirname(dest_filepath)).mkdir(parents=True, exist_ok=True)
 
         if os.path.exists(dest_filepath) and os.path.isfile(dest_filepath):
             logger.warning(f"Pre-existing file {dest_filepath} found at download destination, deleting before download.")
             os.remove(dest_filepath)
+        cache_manifest.remove_entry(dest_filepath)
 
         logger.debug(f"Downloading {url}...")
-        # Download file through streaming to support large files
         tmp_file_path = f"{dest_filepath}.part"
-        response = requests.get(url, stream=True)
+        start_time = perf_counter()
+
+        with ThreadPoolExecutor(max_workers=1) as checksum_executor:
+            expected_md5_future = checksum_executor.submit(_fetch_checksum_sidecar, http_url) if expected_md5 is None else None
+            downloaded_bytes, md5, response_headers = _download_to_tmp_file(http_url, tmp_file_path, chunk_size=chunk_size,
+                                                                            segment_size=segment_size, max_workers=max_workers)
+            if expected_md5_future is not None:
+                expected_md5 = expected_md5_future.result()
 
-        with open(tmp_file_path, mode="wb") as local_file:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                local_file.write(chunk)
+        if expected_md5 is not None:
+            if md5 != expected_md5.lower():
+                _discard_partial_download(tmp_file_path)
+                raise IOError(f"Download of {url} corrupted: expected MD5 checksum {expected_md5}, found {md5}.")
+            logger.debug(f"Verified MD5 checksum of {url} download.")
 
         os.rename(tmp_file_path, dest_filepath)
-        logger.debug(f"Download of {url} completed.")
+        cache_manifest.write_entry(dest_filepath, url=url, etag=response_headers.get('ETag'),
+                                   last_modified=response_headers.get('Last-Modified'), md5=md5, md5_verified=expected_md5 is not None)
+
+        download_time = perf_counter() - start_time
+        logger.info(f"Download of {url} completed: {downloaded_bytes / 1024**2:.1f} MiB in {download_time:.2f}s "
+                    + f"({downloaded_bytes / 1024**2 / max(download_time, 1e-6):.1f} MiB/s).")
 
         return find_local_file(dest_filepath)
     else:
         # Currently not supported
         raise NotImplementedError(f"URL with scheme '{url_components.scheme}' is currently not supported.")
+
+
+def _download_to_tmp_file(url: str, tmp_file_path: str, chunk_size: int, segment_size: int,
+                          max_workers: int) -> Tuple[int, str, Mapping[str, str]]:
+    """
+    Download `url` to `tmp_file_path` (segmented or streamed, resuming a previous partial download when possible).
+
+    Returns:
+        Tuple of the number of bytes downloaded, the MD5 checksum of the downloaded file and the initial response headers.
+
+    Raises:
+        `ValueError`: if `url` is not accessible.
+        `IOError`: if the size of the downloaded file does not match the size reported by the server.
+    """
+    response, partial_download = _open_download(url, tmp_file_path, segment_size)
+    with response:
+        total_size: Optional[int] = None
+        if partial_download is not None:
+            total_size = partial_download.total_size
+        elif 'Content-Length' in response.headers:
+            total_size = int(response.headers['Content-Length'])
+
+        if partial_download is not None and max_workers > 1 and partial_download.total_size - partial_download.start > segment_size:
+            downloaded_bytes, md5 = _segmented_download(url, tmp_file_path, response, partial_download, chunk_size=chunk_size,
+                                                        segment_size=segment_size, max_workers=max_workers)
+        else:
+            downloaded_bytes, md5 = _streamed_download(url, tmp_file_path, response, partial_download, chunk_size=chunk_size)
+
+    file_size = os.path.getsize(tmp_file_path)
+    if total_size is not None and file_size != total_size:
+        raise IOError(f"Download of {url} incomplete: expected {total_size} bytes, found {file_size} bytes.")
+
+    return downloaded_bytes, md5, response.headers
+
+
+def _fetch_checksum_sidecar(url: str) -> Optional[str]:
+    """
+    Fetch the MD5 checksum of the file at `url` from its sidecar checksum file (`url`.md5), if available.
+
+    Sidecar files are expected in md5sum format (checksum, optionally followed by the filename).
+
+    Returns:
+        The (lowercase hexadecimal) MD5 checksum, or `None` if no valid sidecar file is available.
+    """
+    checksum_url = url + _CHECKSUM_SIDECAR_SUFFIX
+    try:
+        response = _session.get(checksum_url)
+    except requests.RequestException as e:
+        logger.debug(f"Checksum sidecar file {checksum_url} not accessible: {e}")
+        return None
+
+    if not response.ok:
+        logger.debug(f"No checksum sidecar file found for {url} (status {response.status_code}).")
+        return None
+
+    checksum = response.text.split()[0].lower() if response.text.split() else ''
+    if not re.fullmatch(r'[0-9a-f]{32}', checksum):
+        logger.warning(f"Invalid checksum sidecar file {checksum_url} ignored.")
+        return None
+
+    return checksum
+
+
+class _PartialDownload(NamedTuple):
+    """
+    Partial content (range request) download state.
+    """
+    start: int
+    """First byte served by the initial (open-ended range request) response"""
+    total_size: int
+    """Total size of the remote file (bytes)"""
+    completed: Set[int]
+    """Indices of completed segments (of the previous, interrupted, segmented download)"""
+
+
+def _read_download_progress(url: str, tmp_file_path: str, segment_size: int) -> Tuple[int, Optional[int], Set[int]]:
+    """
+    Determine the resume state of an interrupted download of `url` to `tmp_file_path`.
+
+    Returns:
+        Tuple of byte to resume downloading from, total size recorded by the previous download (if segmented)
+        and indices of the completed segments.
+    """
+    if not os.path.isfile(tmp_file_path):
+        return 0, None, set()
+
+    progress_file_path = f"{tmp_file_path}.progress"
+    if not os.path.isfile(progress_file_path):
+        # Streamed download, of which all content up to the file size is complete
+        resume_from = os.path.getsize(tmp_file_path)
+        return resume_from, None, set(range(resume_from // segment_size))
+
+    try:
+        with open(progress_file_path, 'r') as progress_file:
+            progress = json.load(progress_file)
+        if progress['url'] == url and progress['segment_size'] == segment_size:
+            total_size: int = progress['total_size']
+            completed: Set[int] = set(progress['completed'])
+            incomplete = [index for index in range((total_size + segment_size - 1) // segment_size) if index not in completed]
+            if incomplete:
+                return incomplete[0] * segment_size, total_size, completed
+    except (ValueError, KeyError):
+        logger.warning(f"Invalid download progress file {progress_file_path} found, restarting download.")
+
+    _discard_partial_download(tmp_file_path)
+    return 0, None, set()
+
+
+def _discard_partial_download(tmp_file_path: str) -> None:
+    """
+    Remove the partial download files for `tmp_file_path` (if any).
+    """
+    for file_path in [tmp_file_path, f"{tmp_file_path}.progress"]:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+
+def _open_download(url: str, tmp_file_path: str, segment_size: int) -> Tuple[requests.Response, Optional[_PartialDownload]]:
+    """
+    Send the initial (streamed) download request for `url`, resuming an interrupted download to `tmp_file_path` when possible.
+
+    The open-ended range request is answered with partial content (206) by servers supporting range requests,
+    and with the complete file (200) otherwise. Empty files, which cannot satisfy any byte range (416),
+    are requested again without range.
+
+    Returns:
+        Tuple of the (unconsumed) response and the partial download state (`None` when the complete file is returned).
+
+    Raises:
+        `ValueError`: if `url` is not accessible.
+    """
+    resume_from, recorded_total_size, completed = _read_download_progress(url, tmp_file_path, segment_size)
+
+    response = _session.get(url, stream=True, headers={'Range': f'bytes={resume_from}-'})
+
+    if response.status_code == 206:
+        content_range = response.headers.get('Content-Range', '')
+        total_size = int(content_range.rsplit('/', 1)[1]) if '/' in content_range and not content_range.endswith('*') else None
+        if total_size is not None and (recorded_total_size is None or recorded_total_size == total_size):
+            return response, _PartialDownload(start=resume_from, total_size=total_size, completed=completed)
+        if total_size is not None and resume_from == 0:
+            _discard_partial_download(tmp_file_path)
+            return response, _PartialDownload(start=0, total_size=total_size, completed=set())
+
+    if resume_from == 0 and response.status_code == 416:
+        # Empty remote files cannot satisfy any byte range, request the complete file instead
+        logger.debug(f"Range request for {url} not satisfiable, requesting complete (empty) file.")
+        response.close()
+        response = _session.get(url, stream=True)
+
+    if resume_from > 0 and (response.status_code in [206, 416]):
+        # Remote file does not match the interrupted download
+        logger.info(f"Partial download of {url} does not match remote file, restarting download.")
+        response.close()
+        _discard_partial_download(tmp_file_path)
+        return _open_download(url, tmp_file_path, segment_size)
+
+    if not response.ok:
+        response.close()
+        if response.status_code == 403 and s3.is_endpoint_url(url) and s3.default_auth.credentials() is None:
+            raise ValueError(f"URL {url} is not accessible (status 403): no AWS credentials found to access "
+                             + "non-public S3 objects, configure credentials through the default AWS credential chain.")
+        raise ValueError(f"URL {url} is not accessible (status {response.status_code}).")
+
+    return response, None
+
+
+def _write_response(response: requests.Response, tmp_file_path: str, start: int, length: Optional[int], chunk_size: int,
+                    hasher: Optional['hashlib._Hash'] = None) -> int:
+    """
+    Write (`length` bytes of) the content of a streamed `response` to `tmp_file_path`, starting at byte `start`.
+
+    Written content is added to `hasher` (when provided) while streaming.
+
+    Returns:
+        Number of bytes written.
+    """
+    written_bytes = 0
+    with open(tmp_file_path, mode='r+b') as local_file:
+        local_file.seek(start)
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if length is not None and written_bytes + len(chunk) >= length:
+                chunk = chunk[:length - written_bytes]
+            local_file.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            written_bytes += len(chunk)
+            if length is not None and written_bytes >= length:
+                break
+
+    return written_bytes
+
+
+def _hash_file_range(tmp_file_path: str, start: int, end: int, hasher: 'hashlib._Hash', chunk_size: int) -> None:
+    """
+    Add the content of `tmp_file_path` from byte `start` up to (excluding) byte `end` to `hasher`.
+    """
+    with open(tmp_file_path, mode='rb') as local_file:
+        local_file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = local_file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            remaining -= len(chunk)
+
+
+def _streamed_download(url: str, tmp_file_path: str, response: requests.Response, partial_download: Optional[_PartialDownload],
+                       chunk_size: int) -> Tuple[int, str]:
+    """
+    Download `url` to `tmp_file_path` by streaming the initial `response`,
+    resuming a pre-existing `tmp_file_path` when the response is partial content.
+
+    Returns:
+        Tuple of the number of bytes downloaded and the MD5 checksum of the downloaded file.
+    """
+    hasher = hashlib.md5()
+
+    if partial_download is not None and partial_download.start > 0:
+        logger.info(f"Resuming download of {url} from byte {partial_download.start}.")
+        with open(tmp_file_path, mode='ab') as local_file:
+            local_file.truncate(partial_download.start)
+        _hash_file_range(tmp_file_path, 0, partial_download.start, hasher, chunk_size=chunk_size)
+        downloaded_bytes = _write_response(response, tmp_file_path, start=partial_download.start, length=None,
+                                           chunk_size=chunk_size, hasher=hasher)
+        return downloaded_bytes, hasher.hexdigest()
+
+    with open(tmp_file_path, mode='wb'):
+        pass
+    downloaded_bytes = _write_response(response, tmp_file_path, start=0, length=None, chunk_size=chunk_size, hasher=hasher)
+    return downloaded_bytes, hasher.hexdigest()
+
+
+def _segmented_download(url: str, tmp_file_path: str, response: requests.Response, partial_download: _PartialDownload,
+                        chunk_size: int, segment_size: int, max_workers: int) -> Tuple[int, str]:
+    """
+    Download `url` to `tmp_file_path` by concurrently downloading byte range segments into a preallocated file.
+
+    The initial (open-ended range request) `response` is used to download the segment containing its first byte,
+    all other incomplete segments are requested separately.
+    Completed segments are recorded in a `tmp_file_path`.progress file, so only missing segments are downloaded
+    when resuming. A pre-existing `tmp_file_path` without progress file (from a streamed download) is resumed
+    from its last downloaded byte.
+
+    The MD5 checksum is calculated in segment order while downloading, hashing every segment as soon as
+    it and all preceding segments are complete (while still in the page cache).
+
+    Returns:
+        Tuple of the number of bytes downloaded and the MD5 checksum of the downloaded file.
+    """
+    progress_file_path = f"{tmp_file_path}.progress"
+    total_size = partial_download.total_size
+    segments: List[Tuple[int, int]] = [(start, min(start + segment_size, total_size) - 1) for start in range(0, total_size, segment_size)]
+
+    completed = set(partial_download.completed)
+    if partial_download.start > 0:
+        logger.info(f"Resuming download of {url} ({len(completed)} of {len(segments)} segments complete).")
+
+    with open(tmp_file_path, mode='ab') as local_file:
+        local_file.truncate(total_size)
+
+    progress_lock = Lock()
+    hasher = hashlib.md5()
+    hashed_segments = 0
+
+    def write_progress() -> None:
+        with open(progress_file_path, 'w') as progress_file:
+            json.dump(dict(url=url, total_size=total_size, segment_size=segment_size, completed=sorted(completed)), progress_file)
+
+    def complete_segment(index: int, segment_bytes: int, segment_start: int) -> int:
+        segment_end = segments[index][1]
+        if segment_bytes != segment_end - segment_start + 1:
+            raise IOError(f"Download of {url} segment {segment_start}-{segment_end} incomplete: received {segment_bytes} bytes.")
+
+        with progress_lock:
+            completed.add(index)
+            write_progress()
+
+            nonlocal hashed_segments
+            while hashed_segments < len(segments) and hashed_segments in completed:
+                _hash_file_range(tmp_file_path, segments[hashed_segments][0], segments[hashed_segments][1] + 1, hasher, chunk_size=chunk_size)
+                hashed_segments += 1
+
+        return segment_bytes
+
+    def download_initial_segment(index: int) -> int:
+        segment_end = segments[index][1]
+        segment_bytes = _write_response(response, tmp_file_path, start=partial_download.start,
+                                        length=segment_end - partial_download.start + 1, chunk_size=chunk_size)
+        return complete_segment(index, segment_bytes, partial_download.start)
+
+    def download_segment(index: int) -> int:
+        segment_start, segment_end = segments[index]
+        with _session.get(url, stream=True, headers={'Range': f'bytes={segment_start}-{segment_end}'}) as segment_response:
+            segment_response.raise_for_status()
+            if segment_response.status_code != 206:
+                raise IOError(f"Server for {url} did not respond to range request with partial content (status {segment_response.status_code}).")
+
+            segment_bytes = _write_response(segment_response, tmp_file_path, start=segment_start, length=None, chunk_size=chunk_size)
+
+        return complete_segment(index, segment_bytes, segment_start)
+
+    with progress_lock:
+        write_progress()
+
+    initial_index = partial_download.start // segment_size
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        segment_futures = [executor.submit(download_initial_segment, initial_index)]
+        segment_futures.extend(executor.submit(download_segment, index) for index in range(len(segments))
+                               if index not in completed and index != initial_index)
+        downloaded_bytes = sum(future.result() for future in segment_futures)
+
+    os.remove(progress_file_path)
+
+    return downloaded_bytes, hasher.hexdigest()
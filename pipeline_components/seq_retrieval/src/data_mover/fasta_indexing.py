@@ -0,0 +1,100 @@
+"""
+Module used to derive faidx-indexed (BGZF-compressed) fasta files for fasta files lacking (usable) indices
+"""
+import gzip
+import os.path
+import shutil
+
+import pysam
+
+from log_mgmt import get_logger
+from . import file_lock
+
+logger = get_logger(name=__name__)
+
+_BGZF_SUFFIX = '.bgz'
+"""Suffix of BGZF-compressed fasta files derived from (plain) gzip-compressed fasta files."""
+
+_LINK_SUFFIX = '.indexed'
+"""
+Suffix of links to fasta files not requiring conversion, alongside which derived indices are stored
+(distinct from the fasta file's own name, so derived indices never collide with downloaded ones).
+"""
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+"""Chunk size used while converting gzip-compressed files to BGZF."""
+
+
+def is_gzip(local_path: str) -> bool:
+    """
+    Check whether `local_path` is a gzip-compressed file (plain gzip or BGZF).
+    """
+    with open(local_path, 'rb') as local_file:
+        return local_file.read(2) == b'\x1f\x8b'
+
+
+def is_bgzf(local_path: str) -> bool:
+    """
+    Check whether `local_path` is a BGZF-compressed file (gzip with a 'BC' extra subfield in its first block header).
+    """
+    with open(local_path, 'rb') as local_file:
+        header = local_file.read(18)
+    return (len(header) == 18 and header[:4] == b'\x1f\x8b\x08\x04'
+            and header[10:12] == b'\x06\x00' and header[12:14] == b'BC')
+
+
+def _is_up_to_date(derived_path: str, source_path: str) -> bool:
+    """
+    Check whether derived file `derived_path` exists and is not older than `source_path`.
+    """
+    return os.path.isfile(derived_path) and os.path.getmtime(derived_path) >= os.path.getmtime(source_path)
+
+
+def index_local_fasta(local_fasta_path: str, derived_dir: str) -> str:
+    """
+    Derive a faidx-indexed fasta file for local fasta file `local_fasta_path`, for fasta files lacking (usable) indices.
+
+    Plain gzip-compressed fasta files (which do not support random access) are converted to BGZF first.
+    Derived files (and indices) are stored in `derived_dir` and reused as long as they are newer than `local_fasta_path`.
+    Derivation happens under a file lock, so concurrent processes derive the files only once.
+
+    Args:
+        local_fasta_path: path to the local (plain, gzip or BGZF-compressed) fasta file
+        derived_dir: directory to store derived files in (such as the local file cache directory of the fasta file)
+
+    Returns:
+        Absolute path to the faidx-indexed fasta file (string), with index files alongside.
+    """
+    os.makedirs(derived_dir, exist_ok=True)
+
+    compressed = is_gzip(local_fasta_path)
+    convert = compressed and not is_bgzf(local_fasta_path)
+
+    fasta_name = os.path.basename(local_fasta_path)
+    indexed_fasta_path = os.path.join(derived_dir, fasta_name + (_BGZF_SUFFIX if convert else _LINK_SUFFIX))
+    index_paths = [indexed_fasta_path + '.fai'] + ([indexed_fasta_path + '.gzi'] if compressed else [])
+
+    with file_lock.file_lock(indexed_fasta_path):
+        if all(_is_up_to_date(index_path, local_fasta_path) for index_path in index_paths):
+            logger.debug(f"Reusing derived faidx index files for {local_fasta_path}.")
+            return os.path.abspath(indexed_fasta_path)
+
+        if convert:
+            logger.info(f"Converting gzip-compressed fasta file {local_fasta_path} to BGZF.")
+            tmp_path = indexed_fasta_path + '.part'
+            with gzip.open(local_fasta_path, 'rb') as gzip_file, pysam.BGZFile(tmp_path, 'wb', index=None) as bgzf_file:
+                shutil.copyfileobj(gzip_file, bgzf_file, _COPY_CHUNK_SIZE)
+            os.replace(tmp_path, indexed_fasta_path)
+        else:
+            # Index files are stored alongside the fasta file, link it into the derived files directory
+            if os.path.lexists(indexed_fasta_path):
+                os.remove(indexed_fasta_path)
+            os.symlink(os.path.abspath(local_fasta_path), indexed_fasta_path)
+
+        logger.info(f"Building faidx index files for {indexed_fasta_path}.")
+        for index_path in index_paths:
+            if os.path.exists(index_path):
+                os.remove(index_path)
+        pysam.faidx(indexed_fasta_path)
+
+    return os.path.abspath(indexed_fasta_path)
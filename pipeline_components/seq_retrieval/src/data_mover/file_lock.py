@@ -0,0 +1,56 @@
+"""
+Module providing advisory file locks, used to coordinate access to the local file cache across processes
+"""
+from contextlib import contextmanager
+import fcntl
+import os
+from pathlib import Path
+from typing import Generator
+
+LOCK_SUFFIX = '.lock'
+"""Suffix of the lock file used to lock a (cached) file."""
+
+
+def lock_path(local_path: str) -> str:
+    """
+    Return the path of the lock file for (cached) file `local_path`.
+    """
+    return local_path + LOCK_SUFFIX
+
+
+def is_lock_file(filename: str) -> bool:
+    """
+    Return `True` when `filename` is a lock file.
+    """
+    return filename.endswith(LOCK_SUFFIX)
+
+
+@contextmanager
+def file_lock(local_path: str, blocking: bool = True) -> Generator[bool, None, None]:
+    """
+    Context manager holding an exclusive advisory lock on (cached) file `local_path` for its duration.
+
+    Locks are held on a separate lock file (created when required), so `local_path` itself can be replaced while locked.
+    Locks are released automatically when the holding process exits.
+
+    Args:
+        local_path: path to the file to lock
+        blocking: wait for the lock to be released when held by another process (`True`), or return immediately (`False`)
+
+    Returns:
+        `True` when the lock was acquired, `False` otherwise (only when not `blocking`).
+    """
+    Path(os.path.dirname(local_path) or '.').mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(lock_path(local_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+        else:
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+    finally:
+        os.close(lock_fd)
@@ -0,0 +1,80 @@
+"""
+Module used to find remote files in read-only pre-staged directories (such as genomes shipped on instance volumes)
+"""
+import json
+import os.path
+from threading import Lock
+from typing import Dict, List, Optional
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+_MANIFEST_FILENAME = 'pavi_manifest.json'
+"""
+Name of the manifest file at the root of every pre-staged directory, mapping URLs to (relative) file paths:
+`{"<url>": "<relative path>", ...}`. Companion files (`<url>.fai`, `<url>.gzi`) found alongside a mapped file
+need no separate manifest entry.
+"""
+
+_COMPANION_SUFFIXES = ('.fai', '.gzi')
+"""URL suffixes of companion (index) files, looked up alongside the pre-staged file they index."""
+
+_manifests: Dict[str, Dict[str, str]] = {}
+"""Module level memory cache of loaded pre-staged directory manifests, indexed by directory."""
+
+_manifests_lock = Lock()
+
+
+def load_manifest(prestaged_dir: str) -> Dict[str, str]:
+    """
+    Load the manifest of pre-staged directory `prestaged_dir` (cached after first load).
+
+    Returns:
+        Dict of absolute file paths, indexed by URL (empty when the directory has no valid manifest).
+    """
+    with _manifests_lock:
+        if prestaged_dir not in _manifests:
+            manifest: Dict[str, str] = {}
+            manifest_path = os.path.join(prestaged_dir, _MANIFEST_FILENAME)
+            try:
+                with open(manifest_path, 'r') as manifest_file:
+                    manifest_content = json.load(manifest_file)
+                if not isinstance(manifest_content, dict):
+                    raise ValueError('Manifest must be a JSON object.')
+                manifest = {url: os.path.abspath(os.path.join(prestaged_dir, str(relative_path)))
+                            for url, relative_path in manifest_content.items()}
+            except FileNotFoundError:
+                logger.warning(f"No manifest found for pre-staged directory {prestaged_dir}.")
+            except ValueError as e:
+                logger.warning(f"Invalid manifest {manifest_path} ignored: {e}")
+            _manifests[prestaged_dir] = manifest
+
+        return _manifests[prestaged_dir]
+
+
+def find_prestaged_file(url: str, prestaged_dirs: List[str]) -> Optional[str]:
+    """
+    Find the pre-staged file for `url` in `prestaged_dirs` (searched in order).
+
+    Args:
+        url: URL to find the pre-staged file for
+        prestaged_dirs: pre-staged directories to search
+
+    Returns:
+        Absolute path to the pre-staged file, or `None` when not found.
+    """
+    for prestaged_dir in prestaged_dirs:
+        manifest = load_manifest(prestaged_dir)
+
+        prestaged_path: Optional[str] = manifest.get(url)
+        if prestaged_path is None:
+            for suffix in _COMPANION_SUFFIXES:
+                if url.endswith(suffix) and url[:-len(suffix)] in manifest:
+                    prestaged_path = manifest[url[:-len(suffix)]] + suffix
+                    break
+
+        if prestaged_path is not None and os.path.isfile(prestaged_path):
+            return prestaged_path
+
+    return None
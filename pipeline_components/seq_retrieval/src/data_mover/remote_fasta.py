@@ -0,0 +1,287 @@
+"""
+Module providing random access to remote (faidx-indexed) fasta files through HTTP range requests
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+import requests
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+import zlib
+
+from log_mgmt import get_logger
+from . import s3
+
+logger = get_logger(name=__name__)
+
+_DEFAULT_BLOCK_CACHE_SIZE = 256
+"""Default maximum number of (decompressed) BGZF blocks to keep in the block cache (BGZF blocks are max 64 KiB each)."""
+
+_opened_files: Dict[str, 'RemoteFastaFile'] = dict()
+"""Module level memory cache of all RemoteFastaFile objects opened through `open_remote_fasta`."""
+
+
+class FaidxEntry(NamedTuple):
+    """Single sequence entry of a faidx (.fai) index file."""
+    length: int
+    """Sequence length (bases)"""
+    offset: int
+    """Uncompressed byte offset of the first base of the sequence"""
+    line_bases: int
+    """Number of bases per line"""
+    line_width: int
+    """Number of bytes per line (including newline characters)"""
+
+
+def is_remote_url(url: str) -> bool:
+    """
+    Check whether `url` is a URL supported for remote fasta access (http, https or s3).
+    """
+    return urlparse(url).scheme in ['http', 'https', 's3']
+
+
+def parse_fai(fai_content: str) -> Dict[str, FaidxEntry]:
+    """
+    Parse the content of a faidx (.fai) index file.
+
+    Returns:
+        Dict of FaidxEntry objects, indexed by sequence name.
+
+    Raises:
+        `ValueError`: if the content is not a valid faidx index.
+    """
+    entries: Dict[str, FaidxEntry] = {}
+    for line in fai_content.splitlines():
+        if line.strip() == '':
+            continue
+        columns = line.split('\t')
+        if len(columns) < 5:
+            raise ValueError(f"Invalid faidx index line: '{line}'.")
+        entries[columns[0]] = FaidxEntry(length=int(columns[1]), offset=int(columns[2]),
+                                         line_bases=int(columns[3]), line_width=int(columns[4]))
+    return entries
+
+
+def parse_gzi(gzi_content: bytes) -> List[Tuple[int, int]]:
+    """
+    Parse the content of a BGZF (.gzi) index file.
+
+    Returns:
+        List of (compressed offset, uncompressed offset) tuples for all BGZF blocks,
+        including the first block (at offset 0, 0), in file order.
+
+    Raises:
+        `ValueError`: if the content is not a valid gzi index.
+    """
+    if len(gzi_content) < 8:
+        raise ValueError('Invalid gzi index: missing block count.')
+
+    block_count = int.from_bytes(gzi_content[0:8], 'little')
+    if len(gzi_content) < 8 + block_count * 16:
+        raise ValueError(f'Invalid gzi index: expected {block_count} blocks, found less.')
+
+    blocks: List[Tuple[int, int]] = [(0, 0)]
+    for index in range(block_count):
+        entry_start = 8 + index * 16
+        compressed_offset = int.from_bytes(gzi_content[entry_start:entry_start + 8], 'little')
+        uncompressed_offset = int.from_bytes(gzi_content[entry_start + 8:entry_start + 16], 'little')
+        blocks.append((compressed_offset, uncompressed_offset))
+
+    return blocks
+
+
+class RemoteFastaFile():
+    """
+    Random-access reader for remote (faidx-indexed) fasta files, as alternative to downloading the complete file.
+
+    Reads the faidx index (`<url>.fai`) and, for BGZF-compressed files (url ending in `.gz`), the BGZF index (`<url>.gzi`),
+    after which only the (compressed) byte ranges needed for every requested region are fetched, through HTTP range requests.
+    Decompressed BGZF blocks are kept in an LRU block cache, so repeated or neighbouring requests reuse earlier fetches.
+    """
+
+    url: str
+    """URL of the remote fasta file"""
+
+    compressed: bool
+    """True if the remote fasta file is BGZF-compressed"""
+
+    def __init__(self, url: str, block_cache_size: int = _DEFAULT_BLOCK_CACHE_SIZE, session: Optional[requests.Session] = None):
+        """
+        Initializes a RemoteFastaFile instance, fetching its index file(s).
+
+        Args:
+            url: URL of the remote fasta file (http, https or s3). Index files must be accessible at `url`.fai (and `url`.gzi if compressed).
+            block_cache_size: Maximum number of decompressed BGZF blocks to keep in memory.
+            session: optional requests Session to use for all requests (a new session is created when not provided).
+
+        Raises:
+            `requests.HTTPError`: if any of the index files could not be retrieved.
+            `ValueError`: if any of the index files could not be parsed.
+        """
+        self.url = url
+        self._http_url = s3.http_url(url)
+        self.compressed = url.endswith('.gz')
+        self._session = session if session is not None else requests.Session()
+        self._block_cache_size = block_cache_size
+        self._block_cache: OrderedDict[int, bytes] = OrderedDict()
+
+        logger.debug(f"Fetching index files for remote fasta file {url}...")
+        fai_response = self._session.get(self._http_url + '.fai', auth=s3.default_auth)
+        fai_response.raise_for_status()
+        self._fai = parse_fai(fai_response.text)
+
+        self._blocks: List[Tuple[int, int]] = []
+        self._block_uncompressed_offsets: List[int] = []
+        if self.compressed:
+            gzi_response = self._session.get(self._http_url + '.gzi', auth=s3.default_auth)
+            gzi_response.raise_for_status()
+            self._blocks = parse_gzi(gzi_response.content)
+            self._block_uncompressed_offsets = [block[1] for block in self._blocks]
+
+    @property
+    def references(self) -> List[str]:
+        """Names of all sequences in the fasta file"""
+        return list(self._fai.keys())
+
+    def get_reference_length(self, reference: str) -> int:
+        """
+        Return the length of sequence `reference`.
+
+        Raises:
+            `KeyError`: if `reference` is not found in the fasta file.
+        """
+        return self._fai[reference].length
+
+    def fetch(self, reference: str, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Fetch the sequence of a region, analogous to `pysam.FastaFile.fetch`.
+
+        Args:
+            reference: name of the sequence to fetch from
+            start: start position of the region (0-based, inclusive)
+            end: end position of the region (0-based, exclusive). Defaults to the end of the sequence.
+
+        Returns:
+            The sequence of the requested region (string).
+
+        Raises:
+            `KeyError`: if `reference` is not found in the fasta file.
+            `ValueError`: if the requested region is invalid.
+        """
+        if reference not in self._fai:
+            raise KeyError(f"Sequence '{reference}' not found in remote fasta file {self.url}.")
+        entry = self._fai[reference]
+
+        start = max(start, 0)
+        end = entry.length if end is None else min(end, entry.length)
+        if start > end:
+            raise ValueError(f"Invalid region {reference}:{start}-{end}: start > end.")
+        if start == end:
+            return ''
+
+        # Translate sequence positions into (uncompressed) file byte offsets
+        byte_start = entry.offset + (start // entry.line_bases) * entry.line_width + start % entry.line_bases
+        last_pos = end - 1
+        byte_end = entry.offset + (last_pos // entry.line_bases) * entry.line_width + last_pos % entry.line_bases + 1
+
+        raw_bytes = self._read(byte_start, byte_end)
+
+        return raw_bytes.decode('ascii').replace('\n', '').replace('\r', '')
+
+    def _read(self, byte_start: int, byte_end: int) -> bytes:
+        """
+        Read the uncompressed byte range `byte_start`..`byte_end` (0-based, end exclusive) of the fasta file.
+        """
+        if not self.compressed:
+            return self._fetch_range(byte_start, byte_end)
+
+        first_block = bisect_right(self._block_uncompressed_offsets, byte_start) - 1
+        last_block = bisect_right(self._block_uncompressed_offsets, byte_end - 1) - 1
+
+        # Collect cached blocks before fetching the missing ones (which may evict cached blocks)
+        blocks: Dict[int, bytes] = {}
+        for index in range(first_block, last_block + 1):
+            if index in self._block_cache:
+                blocks[index] = self._get_cached_block(index)
+        blocks.update(self._fetch_blocks(first_block, last_block, skip=set(blocks.keys())))
+
+        data = b''.join(blocks[index] for index in range(first_block, last_block + 1))
+        data_offset = self._block_uncompressed_offsets[first_block]
+
+        return data[byte_start - data_offset:byte_end - data_offset]
+
+    def _fetch_blocks(self, first_block: int, last_block: int, skip: Set[int]) -> Dict[int, bytes]:
+        """
+        Fetch and decompress all BGZF blocks `first_block`..`last_block` (inclusive) not in `skip`,
+        using one range request for every consecutive run of blocks to fetch.
+
+        Returns:
+            Dict of decompressed blocks, indexed by block index.
+        """
+        fetched_blocks: Dict[int, bytes] = {}
+
+        index = first_block
+        while index <= last_block:
+            if index in skip:
+                index += 1
+                continue
+
+            run_end = index
+            while run_end + 1 <= last_block and run_end + 1 not in skip:
+                run_end += 1
+
+            compressed_start = self._blocks[index][0]
+            compressed_end: Optional[int] = self._blocks[run_end + 1][0] if run_end + 1 < len(self._blocks) else None
+            compressed_data = self._fetch_range(compressed_start, compressed_end)
+
+            for block_index in range(index, run_end + 1):
+                block_start = self._blocks[block_index][0] - compressed_start
+                block_end = self._blocks[block_index + 1][0] - compressed_start if block_index + 1 < len(self._blocks) else len(compressed_data)
+                # Final block run can include the BGZF EOF marker block, which decompresses into nothing
+                decompressor = zlib.decompressobj(wbits=31)
+                fetched_blocks[block_index] = decompressor.decompress(compressed_data[block_start:block_end])
+                self._cache_block(block_index, fetched_blocks[block_index])
+
+            index = run_end + 1
+
+        return fetched_blocks
+
+    def _fetch_range(self, byte_start: int, byte_end: Optional[int]) -> bytes:
+        """
+        Fetch the byte range `byte_start`..`byte_end` (0-based, end exclusive, None for end of file) of the remote file.
+
+        Raises:
+            `requests.HTTPError`: if the request failed.
+            `IOError`: if the server does not support range requests.
+        """
+        range_header = f'bytes={byte_start}-{byte_end - 1 if byte_end is not None else ""}'
+        logger.debug(f"Fetching {self.url} range {range_header}...")
+        response = self._session.get(self._http_url, headers={'Range': range_header}, auth=s3.default_auth)
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"Server for {self.url} does not support range requests (status {response.status_code}).")
+        return response.content
+
+    def _cache_block(self, index: int, data: bytes) -> None:
+        self._block_cache[index] = data
+        self._block_cache.move_to_end(index)
+        while len(self._block_cache) > self._block_cache_size:
+            self._block_cache.popitem(last=False)
+
+    def _get_cached_block(self, index: int) -> bytes:
+        self._block_cache.move_to_end(index)
+        return self._block_cache[index]
+
+
+def open_remote_fasta(url: str) -> RemoteFastaFile:
+    """
+    Open a RemoteFastaFile for `url`, reusing previously opened RemoteFastaFile objects (and their block cache).
+
+    Args:
+        url: URL of the remote fasta file to open.
+
+    Returns:
+        RemoteFastaFile object for `url`.
+    """
+    if url not in _opened_files:
+        _opened_files[url] = RemoteFastaFile(url)
+    return _opened_files[url]
@@ -0,0 +1,135 @@
+"""
+Module used to resolve s3:// URLs into HTTP(S) URLs for their S3 REST endpoint, and to sign requests to that endpoint
+"""
+from botocore.auth import S3SigV4Auth  # type: ignore
+from botocore.awsrequest import AWSRequest  # type: ignore
+from botocore.credentials import Credentials  # type: ignore
+import botocore.session  # type: ignore
+import os
+import requests
+from threading import Lock
+from typing import Optional, override
+from urllib.parse import quote, urlparse
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+_DEFAULT_REGION = 'us-east-1'
+"""AWS region used to resolve S3 endpoints when none is defined in the environment."""
+
+
+def is_s3_url(url: str) -> bool:
+    """
+    Check whether `url` is an S3 URL (s3:// scheme).
+    """
+    return urlparse(url).scheme == 's3'
+
+
+def region() -> str:
+    """
+    Return the AWS region to access S3 in, as defined by the AWS standard environment variables
+    (`AWS_REGION` or `AWS_DEFAULT_REGION`).
+    """
+    return os.environ.get('AWS_REGION', os.environ.get('AWS_DEFAULT_REGION', _DEFAULT_REGION))
+
+
+def endpoint_url() -> str:
+    """
+    Return the S3 endpoint URL to use, as defined by the AWS standard environment variables.
+
+    Custom endpoints (such as local S3 stand-ins) are read from `AWS_ENDPOINT_URL_S3` or `AWS_ENDPOINT_URL`,
+    the regional AWS endpoint (see `region`) is used otherwise.
+    Regional endpoints are routed through S3 gateway endpoints when accessed from within a VPC.
+    """
+    custom_endpoint = os.environ.get('AWS_ENDPOINT_URL_S3', os.environ.get('AWS_ENDPOINT_URL'))
+    if custom_endpoint:
+        return custom_endpoint.rstrip('/')
+
+    return f'https://s3.{region()}.amazonaws.com'
+
+
+def is_endpoint_url(url: str) -> bool:
+    """
+    Check whether `url` is an HTTP(S) URL on the S3 endpoint (see `endpoint_url`).
+    """
+    return url.startswith(endpoint_url() + '/')
+
+
+def http_url(url: str) -> str:
+    """
+    Resolve an s3:// URL into the HTTP(S) URL of the object on its S3 endpoint (path-style addressing).
+
+    Requests to the resolved URL must be signed to access private objects (see `S3RequestAuth`).
+    URLs of any other scheme are returned as is.
+
+    Args:
+        url: URL to resolve (`s3://<bucket>/<key>`).
+
+    Returns:
+        HTTP(S) URL for `url` (string).
+    """
+    url_components = urlparse(url)
+    if url_components.scheme != 's3':
+        return url
+
+    return f'{endpoint_url()}/{url_components.netloc}/{quote(url_components.path.lstrip("/"))}'
+
+
+class S3RequestAuth(requests.auth.AuthBase):
+    """
+    requests authentication handler, signing all requests to the S3 endpoint (see `endpoint_url`)
+    with AWS Signature Version 4.
+
+    Credentials are resolved through the default AWS credential chain (environment variables, shared credentials
+    and config files, container or instance role) on the first request to the S3 endpoint.
+    When no credentials are found, requests are sent unsigned, so only publicly readable objects can be accessed.
+    Requests to any other host are sent as is.
+    """
+
+    def __init__(self) -> None:
+        self._credentials: Optional[Credentials] = None
+        self._credentials_resolved = False
+        self._credentials_lock = Lock()
+
+    def credentials(self) -> Optional[Credentials]:
+        """
+        Return the AWS credentials used to sign requests (resolved on first call), or `None` when none were found.
+        """
+        with self._credentials_lock:
+            if not self._credentials_resolved:
+                self._credentials = botocore.session.get_session().get_credentials()
+                self._credentials_resolved = True
+                if self._credentials is None:
+                    logger.info("No AWS credentials found, sending unsigned S3 requests (public objects only).")
+
+        return self._credentials
+
+    def reset_credentials(self) -> None:
+        """
+        Discard the resolved credentials, to resolve them again on the next request to the S3 endpoint
+        (e.g. after changes to the AWS credential environment variables).
+        """
+        with self._credentials_lock:
+            self._credentials = None
+            self._credentials_resolved = False
+
+    @override
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        if request.url is None or not is_endpoint_url(request.url):
+            return request
+
+        credentials = self.credentials()
+        if credentials is None:
+            return request
+
+        # Sign the host and x-amz-* headers only, as other headers may be altered in transit
+        aws_request = AWSRequest(method=request.method, url=request.url)
+        S3SigV4Auth(credentials.get_frozen_credentials(), 's3', region()).add_auth(aws_request)
+        request.headers.update(dict(aws_request.headers.items()))
+
+        return request
+
+
+default_auth = S3RequestAuth()
+"""Module level S3 request authentication handler, shared by all S3 requests (resolving credentials once)."""
@@ -1,2 +1,7 @@
 from .alt_seq_info import AltSeqInfo
 from .seq_info import EnumValueHandler, SeqInfo
+from .seq_info_serializer import (decode_normalized_seq_info_dict, decode_seq_info, decode_seq_info_dict,
+                                  encode_normalized_seq_info_dict, encode_seq_info, encode_seq_info_dict, encode_seq_info_dict_as,
+                                  SEQ_INFO_FORMAT_TYPE, SeqInfoJsonWriter)
+from .seq_info_loader import merge_seq_info_files, read_seq_info_file, SeqInfoFilesMerge
+from .alignment_variant_index import AlignmentVariantIndex
@@ -0,0 +1,111 @@
+"""
+Module containing the AlignmentVariantIndex class, a column-indexed overlay of the variants embedded in an alignment
+"""
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from variant import AlignmentEmbeddedVariantsList
+
+from .seq_info import SeqInfo
+
+
+class AlignmentVariantIndex():
+    """
+    Column-indexed overlay of the variants embedded in an alignment.
+
+    Holds one interval (alignment start and end position) per aligned embedded variant as sorted parallel arrays,
+    allowing the variants overlapping any alignment column range to be found through binary search
+    (see `overlapping`), rather than by scanning the embedded variants of every sequence.
+    """
+
+    alignment_start_pos: List[int]
+    """Alignment start positions of all intervals (1-based, sorted ascending)."""
+    alignment_end_pos: List[int]
+    """Alignment end positions of all intervals (1-based), in `alignment_start_pos` order."""
+    max_alignment_end_pos: List[int]
+    """Running maximum of `alignment_end_pos` (non-decreasing, enabling binary search on interval ends)."""
+    variant_ids: List[str]
+    """Variant ID of all intervals, in `alignment_start_pos` order."""
+    seq_names: List[str]
+    """Name of the aligned sequence of all intervals, in `alignment_start_pos` order."""
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, str, str]]):
+        """
+        Args:
+            intervals: (alignment start position, alignment end position, variant ID, sequence name) tuples, in any order.
+                       Intervals with identical positions keep their relative order.
+        """
+        sorted_intervals = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+
+        self.alignment_start_pos = [interval[0] for interval in sorted_intervals]
+        self.alignment_end_pos = [interval[1] for interval in sorted_intervals]
+        self.max_alignment_end_pos = list(accumulate(self.alignment_end_pos, max))
+        self.variant_ids = [interval[2] for interval in sorted_intervals]
+        self.seq_names = [interval[3] for interval in sorted_intervals]
+
+    @classmethod
+    def from_seq_info(cls, aligned_seq_info: Mapping[str, Optional[SeqInfo]]) -> 'AlignmentVariantIndex':
+        """
+        Build the index of all aligned embedded variants in `aligned_seq_info`.
+
+        Sequences without aligned embedded variants (e.g. sequences missing from the alignment) are skipped.
+
+        Args:
+            aligned_seq_info: dict of (aligned) SeqInfo objects, indexed by sequence name
+        """
+        intervals: List[Tuple[int, int, str, str]] = []
+        for seq_name, seq_info in aligned_seq_info.items():
+            intervals.extend(cls.seq_info_intervals(seq_name, seq_info))
+
+        return cls(intervals)
+
+    @staticmethod
+    def seq_info_intervals(seq_name: str, seq_info: Optional[SeqInfo]) -> List[Tuple[int, int, str, str]]:
+        """
+        List the index intervals of the aligned embedded variants of a single sequence
+        (to build an index incrementally, without keeping all aligned SeqInfo objects).
+
+        Returns:
+            (alignment start position, alignment end position, variant ID, sequence name) tuples,
+            empty if `seq_info` holds no aligned embedded variants.
+        """
+        embedded_variants = getattr(seq_info, 'embedded_variants', None)
+        if not isinstance(embedded_variants, AlignmentEmbeddedVariantsList):
+            return []
+
+        return [(variant.alignment_start_pos, variant.alignment_end_pos, variant.variant_id, seq_name) for variant in embedded_variants]
+
+    def __len__(self) -> int:
+        return len(self.alignment_start_pos)
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """
+        Find all variants overlapping alignment columns `start` to `end` (1-based, inclusive).
+
+        Intervals starting after `end` are excluded by binary search on the start positions,
+        intervals ending before `start` are excluded by binary search on the running maximum end positions
+        (and by a check of the individual end positions of the remaining intervals).
+
+        Returns:
+            List of (sequence name, variant ID) tuples of all overlapping variants, in alignment start position order.
+        """
+        upper = bisect_right(self.alignment_start_pos, end)
+        lower = bisect_left(self.max_alignment_end_pos, start, hi=upper)
+
+        return [(self.seq_names[i], self.variant_ids[i]) for i in range(lower, upper) if self.alignment_end_pos[i] >= start]
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Return the index as dict of parallel arrays (the JSON output format)."""
+        return {
+            'alignment_start_pos': self.alignment_start_pos,
+            'alignment_end_pos': self.alignment_end_pos,
+            'max_alignment_end_pos': self.max_alignment_end_pos,
+            'variant_id': self.variant_ids,
+            'seq_name': self.seq_names
+        }
+
+    def to_json(self) -> str:
+        """Return the index as compact JSON string (see `to_dict`)."""
+        return json.dumps(self.to_dict(), separators=(',', ':'))
@@ -1,11 +1,12 @@
 """
 Module containing classes related to sequence information reporting
 """
+from Bio.SeqRecord import SeqRecord
 from enum import Enum
 import jsonpickle.handlers  # type: ignore
-from typing import Any, override, Optional
+from typing import Any, override, Optional, Tuple
 
-from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, SeqEmbeddedVariantsList
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, AlignmentPositionIndex, SeqEmbeddedVariant, SeqEmbeddedVariantsList
 
 
 class SeqInfo():
@@ -64,6 +65,33 @@ class SeqInfo():
 
         return cls(sequence=sequence, embedded_variants=embedded_variants, error=error)
 
+    def to_aligned(self, alignment_record: SeqRecord | Tuple[str, str]) -> 'SeqInfo':
+        """
+        Return a new SeqInfo object for the aligned sequence, with embedded variants converted to AlignmentEmbeddedVariant objects.
+
+        The sequence and error are shared with `self` (immutable strings) and only the embedded variant objects are newly created,
+        so `self` is left untouched without needing to (deep)copy it.
+        Embedded variants that are already aligned are reused as is.
+
+        Args:
+            alignment_record: Alignment record of the sequence (as SeqRecord or as (record ID, gapped sequence) tuple),
+                              used to convert sequence positions into alignment positions.
+
+        Returns:
+            New SeqInfo object representing the aligned sequence.
+        """
+        aligned_variants: Optional[AlignmentEmbeddedVariantsList] = None
+
+        embedded_variants = getattr(self, 'embedded_variants', None)
+        if isinstance(embedded_variants, AlignmentEmbeddedVariantsList):
+            aligned_variants = embedded_variants
+        elif embedded_variants is not None:
+            aligned_variants = AlignmentEmbeddedVariantsList()
+            if embedded_variants:
+                aligned_variants = AlignmentEmbeddedVariantsList.from_embedded_variants(embedded_variants, AlignmentPositionIndex(alignment_record))
+
+        return SeqInfo(sequence=getattr(self, 'sequence', None), embedded_variants=aligned_variants, error=getattr(self, 'error', None))
+
     @override
     def __repr__(self) -> str:
         return f'SeqInfo(sequence={self.sequence}, embedded_variants={self.embedded_variants})'
@@ -0,0 +1,76 @@
+"""
+Module containing functions to read and merge (many) sequence info files concurrently
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple
+
+from log_mgmt import get_logger
+
+from .seq_info import SeqInfo
+from .seq_info_serializer import decode_seq_info_dict
+
+logger = get_logger(name=__name__)
+
+_DEFAULT_MAX_WORKERS = 8
+"""Module level default maximum number of sequence info files read concurrently."""
+
+
+class SeqInfoFilesMerge(NamedTuple):
+    """Result of merging a list of sequence info files."""
+
+    seq_info: Dict[str, SeqInfo]
+    """Merged sequence info of all files read successfully, indexed by sequence name."""
+    errors: Dict[str, Exception]
+    """Errors of all files that failed to be read, indexed by file path (in input order)."""
+
+
+def read_seq_info_file(file_path: str) -> Dict[str, SeqInfo]:
+    """
+    Read and decode a (JSON-formatted) sequence info file.
+
+    Raises:
+        `OSError`: if the file could not be read
+        `ValueError`, `KeyError`, `TypeError`: if the file content is not valid sequence info
+    """
+    with open(file_path, 'rb') as f:
+        return decode_seq_info_dict(f.read())
+
+
+def merge_seq_info_files(file_paths: List[str], max_workers: int = _DEFAULT_MAX_WORKERS) -> SeqInfoFilesMerge:
+    """
+    Read and merge sequence info files, reading and decoding up to `max_workers` files concurrently.
+
+    Files are merged in input order regardless of the order in which they complete,
+    so sequence names present in multiple files get the sequence info of the last of those files (as in sequential merging).
+    Files that fail to be read are reported (logged and returned) without aborting the merge of the other files.
+
+    Args:
+        file_paths: paths of the sequence info files to merge
+        max_workers: maximum number of files to read concurrently
+
+    Returns:
+        SeqInfoFilesMerge with the merged sequence info and the errors of all files that failed to be read.
+
+    Raises:
+        `ValueError`: if `max_workers` is smaller than 1
+    """
+    if max_workers < 1:
+        raise ValueError(f'max_workers must be at least 1 (got {max_workers}).')
+
+    merge = SeqInfoFilesMerge(seq_info={}, errors={})
+    if not file_paths:
+        return merge
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        futures: List[Future[Dict[str, SeqInfo]]] = [executor.submit(read_seq_info_file, file_path) for file_path in file_paths]
+
+        for file_path, future in zip(file_paths, futures):
+            try:
+                merge.seq_info.update(future.result())
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Failed to read sequence info file '{file_path}': {e}")
+                merge.errors[file_path] = e
+
+    logger.debug(f"Merged {len(file_paths) - len(merge.errors)} of {len(file_paths)} sequence info files.")
+
+    return merge
@@ -0,0 +1,406 @@
+"""
+Module containing the schema-driven JSON encoder and decoder for (indexed) SeqInfo objects,
+producing the same JSON as `jsonpickle.encode(..., make_refs=False, unpicklable=False)` (with EnumValueHandler registered)
+without reflecting over every object.
+"""
+from enum import Enum
+from io import StringIO
+import json
+from operator import attrgetter
+from types import TracebackType
+from typing import Any, Dict, List, Literal, Mapping, Optional, TextIO, Tuple, Type
+
+from variant import (AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, SeqEmbeddedVariantsList,
+                     SeqSubstitutionType, Variant)
+
+from .seq_info import SeqInfo
+
+VARIANT_SCHEMA: Tuple[Tuple[str, type], ...] = (
+    ('variant_id', str),
+    ('genomic_seq_id', str),
+    ('genomic_start_pos', int),
+    ('genomic_end_pos', int),
+    ('seq_length', int),
+    ('genomic_ref_seq', str),
+    ('genomic_alt_seq', str),
+    ('seq_substitution_type', SeqSubstitutionType)
+)
+"""Serialized attributes (and their types) of Variant objects, in serialization (slot definition) order."""
+
+SEQ_EMBEDDED_VARIANT_SCHEMA: Tuple[Tuple[str, type], ...] = VARIANT_SCHEMA + (
+    ('seq_start_pos', int),
+    ('seq_end_pos', int),
+    ('embedded_ref_seq_len', int),
+    ('embedded_alt_seq_len', int)
+)
+"""Serialized attributes (and their types) of SeqEmbeddedVariant objects, in serialization (slot definition) order."""
+
+ALIGNMENT_EMBEDDED_VARIANT_SCHEMA: Tuple[Tuple[str, type], ...] = SEQ_EMBEDDED_VARIANT_SCHEMA + (
+    ('alignment_start_pos', int),
+    ('alignment_end_pos', int)
+)
+"""Serialized attributes (and their types) of AlignmentEmbeddedVariant objects, in serialization (slot definition) order."""
+
+SCHEMAS: Dict[Type[Variant], Tuple[Tuple[str, type], ...]] = {
+    Variant: VARIANT_SCHEMA,
+    SeqEmbeddedVariant: SEQ_EMBEDDED_VARIANT_SCHEMA,
+    AlignmentEmbeddedVariant: ALIGNMENT_EMBEDDED_VARIANT_SCHEMA
+}
+"""Serialization schema per (embedded) variant class."""
+
+SEQ_INFO_FORMAT_TYPE = Literal['full', 'normalized']
+"""
+Supported JSON formats for (indexed) SeqInfo objects:
+ * full: every embedded variant holds all its attributes (see `encode_seq_info_dict`)
+ * normalized: Variant attributes are stored once per variant in a variant table (see `encode_normalized_seq_info_dict`)
+"""
+
+_NORMALIZED_VARIANT_ATTRS = frozenset(attr for attr, _ in VARIANT_SCHEMA if attr != 'variant_id')
+"""Attributes stored in the variant table (rather than in every embedded variant) in the normalized format."""
+
+
+def _encode_default(value: Any) -> Any:
+    """
+    Encode enums by value (as EnumValueHandler does), rejecting any other object not part of the schema.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f'Object of type {type(value).__name__} is not part of the SeqInfo serialization schema.')
+
+
+_json_encoder = json.JSONEncoder(default=_encode_default)
+"""JSON encoder, using the same (default) options as the jsonpickle json backend."""
+
+
+class _VariantStateGetter():
+    """Getter of the serializable state of (embedded) variant objects of one class, compiled from its schema."""
+
+    def __init__(self, schema: Tuple[Tuple[str, type], ...]):
+        self.attrs = tuple(attr for attr, _ in schema)
+        self.getter = attrgetter(*self.attrs)
+
+    def __call__(self, variant: Variant) -> Dict[str, Any]:
+        try:
+            return dict(zip(self.attrs, self.getter(variant)))
+        except AttributeError:
+            # Unset attributes are omitted
+            return {attr: getattr(variant, attr) for attr in self.attrs if hasattr(variant, attr)}
+
+
+_variant_state_getters: Dict[type, _VariantStateGetter] = {variant_class: _VariantStateGetter(schema)
+                                                           for variant_class, schema in SCHEMAS.items()}
+"""Compiled state getters, indexed by (embedded) variant class."""
+
+
+def seq_info_state(seq_info: Optional[SeqInfo]) -> Optional[Dict[str, Any]]:
+    """
+    Return the serializable state of a SeqInfo object: its set attributes (in definition order),
+    with embedded variants as dicts of their schema attributes.
+
+    Raises:
+        `TypeError`: if `seq_info` holds attributes or embedded variants that are not part of the SeqInfo schema.
+    """
+    if seq_info is None:
+        return None
+
+    state: Dict[str, Any] = {}
+    for attr in vars(seq_info):
+        value = getattr(seq_info, attr)
+        if attr == 'embedded_variants' and value is not None:
+            variant_states: List[Dict[str, Any]] = []
+            for variant in value:
+                state_getter = _variant_state_getters.get(type(variant))
+                if state_getter is None:
+                    raise TypeError(f'No serialization schema defined for {type(variant).__name__} objects.')
+                variant_states.append(state_getter(variant))
+            state[attr] = variant_states
+        elif attr in ('sequence', 'error', 'embedded_variants'):
+            state[attr] = value
+        else:
+            raise TypeError(f"Attribute '{attr}' is not part of the SeqInfo serialization schema.")
+
+    return state
+
+
+def encode_seq_info(seq_info: Optional[SeqInfo]) -> str:
+    """
+    Encode a SeqInfo object into JSON (attributes in definition order, unset attributes omitted).
+
+    Raises:
+        `TypeError`: if `seq_info` holds attributes or embedded variants that are not part of the SeqInfo schema.
+    """
+    return _json_encoder.encode(seq_info_state(seq_info))
+
+
+def encode_seq_info_dict(indexed_seq_info: Mapping[str, Optional[SeqInfo]]) -> str:
+    """
+    Encode a dict of SeqInfo objects (indexed by sequence name) into JSON, preserving the dict's key order.
+
+    Args:
+        indexed_seq_info: dict of SeqInfo objects (or None), indexed by sequence name
+
+    Returns:
+        JSON string, identical to the `jsonpickle.encode(indexed_seq_info, make_refs=False, unpicklable=False)` output.
+
+    Raises:
+        `TypeError`: if any SeqInfo object holds attributes or embedded variants that are not part of the SeqInfo schema.
+    """
+    return _json_encoder.encode({seq_name: seq_info_state(seq_info) for seq_name, seq_info in indexed_seq_info.items()})
+
+
+def _normalized_state(seq_name: str, state: Optional[Dict[str, Any]], variants: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize the serializable state of a SeqInfo object, moving the Variant attributes of its embedded variants into `variants`.
+
+    Raises:
+        `ValueError`: if embedded variants lack a variant ID, or have different Variant attributes than in `variants`.
+    """
+    if state is not None and state.get('embedded_variants') is not None:
+        embeddings: List[Dict[str, Any]] = []
+        for variant_state in state['embedded_variants']:
+            if 'variant_id' not in variant_state:
+                raise ValueError(f"Embedded variant without variant_id in '{seq_name}' cannot be normalized.")
+
+            variant_attrs = {attr: value for attr, value in variant_state.items() if attr in _NORMALIZED_VARIANT_ATTRS}
+            if variants.setdefault(variant_state['variant_id'], variant_attrs) != variant_attrs:
+                raise ValueError(f"Conflicting attributes for variant '{variant_state['variant_id']}' in '{seq_name}'.")
+
+            embeddings.append({attr: value for attr, value in variant_state.items() if attr not in _NORMALIZED_VARIANT_ATTRS})
+        state['embedded_variants'] = embeddings
+
+    return state
+
+
+class SeqInfoJsonWriter():
+    """
+    Streaming JSON writer for (indexed) SeqInfo objects, encoding and writing every SeqInfo object as soon as it is provided,
+    so memory usage scales with the largest single entry rather than with all entries.
+
+    Output is identical to `encode_seq_info_dict_as` for the same entries (in writing order).
+    In the normalized format, the variant table is written after all sequence info entries (on close).
+    Use as context manager to close the writer once all entries were written successfully
+    (the JSON document is left incomplete when an error occurs while writing).
+    """
+
+    seq_info_format: SEQ_INFO_FORMAT_TYPE
+    """JSON format being written."""
+
+    def __init__(self, file: TextIO, seq_info_format: SEQ_INFO_FORMAT_TYPE = 'full'):
+        """
+        Args:
+            file: (text) file to write to
+            seq_info_format: JSON format to write (see `SEQ_INFO_FORMAT_TYPE`)
+        """
+        self.seq_info_format = seq_info_format
+        self._file = file
+        self._variants: Dict[str, Dict[str, Any]] = {}
+        self._entry_count = 0
+        self._closed = False
+
+        file.write('{"seq_info": {' if seq_info_format == 'normalized' else '{')
+
+    def write(self, seq_name: str, seq_info: Optional[SeqInfo]) -> None:
+        """
+        Encode and write the SeqInfo object of sequence `seq_name`.
+
+        Raises:
+            `TypeError`: if `seq_info` holds attributes or embedded variants that are not part of the SeqInfo schema.
+            `ValueError`: if the writer is closed, or (normalized format) `seq_info` cannot be normalized.
+        """
+        if self._closed:
+            raise ValueError('Cannot write to a closed SeqInfoJsonWriter.')
+
+        state = seq_info_state(seq_info)
+        if self.seq_info_format == 'normalized':
+            state = _normalized_state(seq_name, state, self._variants)
+
+        separator = ', ' if self._entry_count > 0 else ''
+        self._file.write(f'{separator}{_json_encoder.encode(seq_name)}: {_json_encoder.encode(state)}')
+        self._entry_count += 1
+
+    def close(self) -> None:
+        """Complete the JSON document (writing the variant table in the normalized format)."""
+        if self._closed:
+            return
+
+        if self.seq_info_format == 'normalized':
+            self._file.write(f'}}, "variants": {_json_encoder.encode(self._variants)}}}')
+        else:
+            self._file.write('}')
+        self._closed = True
+
+    def __enter__(self) -> 'SeqInfoJsonWriter':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:  # noqa: U100
+        if exc_type is None:
+            self.close()
+
+
+def encode_normalized_seq_info_dict(indexed_seq_info: Mapping[str, Optional[SeqInfo]]) -> str:
+    """
+    Encode a dict of SeqInfo objects (indexed by sequence name) into normalized JSON.
+
+    The Variant attributes of all embedded variants (genomic positions, alleles, substitution type)
+    are stored once per variant, in a variant table indexed by variant ID, while the embedded variants of every sequence
+    only hold the variant ID and their (sequence and alignment) positions and lengths:
+    `{"seq_info": {seq_name: {"sequence": ..., "embedded_variants": [{"variant_id": ..., ...}]}}, "variants": {variant_id: {...}}}`
+
+    Args:
+        indexed_seq_info: dict of SeqInfo objects (or None), indexed by sequence name
+
+    Returns:
+        JSON string, decodable through `decode_normalized_seq_info_dict`.
+
+    Raises:
+        `TypeError`: if any SeqInfo object holds attributes or embedded variants that are not part of the SeqInfo schema.
+        `ValueError`: if embedded variants lack a variant ID, or embedded variants with identical variant IDs have different Variant attributes.
+    """
+    output = StringIO()
+    with SeqInfoJsonWriter(output, 'normalized') as writer:
+        for seq_name, seq_info in indexed_seq_info.items():
+            writer.write(seq_name, seq_info)
+
+    return output.getvalue()
+
+
+def encode_seq_info_dict_as(indexed_seq_info: Mapping[str, Optional[SeqInfo]], seq_info_format: SEQ_INFO_FORMAT_TYPE) -> str:
+    """
+    Encode a dict of SeqInfo objects (indexed by sequence name) into JSON of format `seq_info_format`.
+
+    Raises:
+        `TypeError`, `ValueError`: see `encode_seq_info_dict` and `encode_normalized_seq_info_dict`.
+    """
+    if seq_info_format == 'normalized':
+        return encode_normalized_seq_info_dict(indexed_seq_info)
+    return encode_seq_info_dict(indexed_seq_info)
+
+
+def decode_embedded_variants(variant_dicts: List[Any]) -> SeqEmbeddedVariantsList | AlignmentEmbeddedVariantsList:
+    """
+    Decode a list of (JSON-parsed) embedded variant dicts into an embedded variants list, validating it against the schema.
+
+    Validation is batched per list: every schema attribute is collected and type-checked for all variants at once,
+    after which the variant objects are built without any further per-object validation.
+    Lists containing variant dicts lacking derived attributes (`seq_length`, `seq_substitution_type`) are loaded through `from_dict`.
+
+    Returns:
+        AlignmentEmbeddedVariantsList if any of the variant dicts holds alignment positions, SeqEmbeddedVariantsList otherwise.
+
+    Raises:
+        `KeyError`: if a required attribute is missing
+        `TypeError`: if `variant_dicts` or any of its attributes has an invalid type
+        `ValueError`: if a `seq_substitution_type` value is invalid
+    """
+    if not isinstance(variant_dicts, list):
+        raise TypeError('embedded_variants must be a list')
+    if not all(type(variant_dict) is dict for variant_dict in variant_dicts):
+        raise TypeError('embedded_variants must be a list of dicts')
+
+    embedded_variants: SeqEmbeddedVariantsList | AlignmentEmbeddedVariantsList
+    variant_class: Type[SeqEmbeddedVariant]
+    if any('alignment_start_pos' in variant_dict for variant_dict in variant_dicts):
+        embedded_variants, variant_class = AlignmentEmbeddedVariantsList(), AlignmentEmbeddedVariant
+    else:
+        embedded_variants, variant_class = SeqEmbeddedVariantsList(), SeqEmbeddedVariant
+
+    if not all('seq_length' in variant_dict and 'seq_substitution_type' in variant_dict for variant_dict in variant_dicts):
+        embedded_variants.extend(variant_class.from_dict(variant_dict) for variant_dict in variant_dicts)  # type: ignore[misc]
+        return embedded_variants
+
+    variants = [variant_class.__new__(variant_class) for _ in variant_dicts]
+    for attr, attr_type in SCHEMAS[variant_class]:
+        try:
+            values = [variant_dict[attr] for variant_dict in variant_dicts]
+        except KeyError:
+            raise KeyError(f'{attr} not in {variant_class.__name__} dict') from None
+
+        if attr_type is SeqSubstitutionType:
+            values = [SeqSubstitutionType(value) for value in values]
+        elif not set(map(type, values)) <= {attr_type}:
+            raise TypeError(f'{attr} must be of type {attr_type.__name__}')
+
+        # Set the attribute on all variants through its slot descriptor
+        set_slot = getattr(variant_class, attr).__set__
+        for variant, value in zip(variants, values):
+            set_slot(variant, value)
+
+    embedded_variants.extend(variants)  # type: ignore[arg-type]
+    return embedded_variants
+
+
+def decode_seq_info(seq_info_dict: Dict[str, Any]) -> SeqInfo:
+    """
+    Decode a (JSON-parsed) SeqInfo dict into a SeqInfo object, validating it against the SeqInfo schema.
+
+    Equivalent to `SeqInfo.from_dict`, but validates the embedded variants in one batch against their schema
+    (see `decode_embedded_variants`) instead of through the (nested) `from_dict` methods of every embedded variant.
+
+    Raises:
+        `KeyError`: if a required embedded variant attribute is missing
+        `TypeError`: if `seq_info_dict` or any of its attributes has an invalid type
+    """
+    if not isinstance(seq_info_dict, dict):
+        raise TypeError('seq info must be a dict')
+
+    sequence = seq_info_dict.get('sequence')
+    if 'sequence' in seq_info_dict and not isinstance(sequence, str):
+        raise TypeError('sequence must be a string')
+
+    error = seq_info_dict.get('error')
+    if 'error' in seq_info_dict and not isinstance(error, str):
+        raise TypeError('error must be a string')
+
+    embedded_variants: Optional[SeqEmbeddedVariantsList | AlignmentEmbeddedVariantsList] = None
+    if 'embedded_variants' in seq_info_dict:
+        embedded_variants = decode_embedded_variants(seq_info_dict['embedded_variants'])
+
+    return SeqInfo(sequence=sequence, embedded_variants=embedded_variants, error=error)
+
+
+def decode_seq_info_dict(json_content: str | bytes) -> Dict[str, SeqInfo]:
+    """
+    Decode a JSON string of SeqInfo objects (indexed by sequence name), as written by `encode_seq_info_dict`.
+
+    Raises:
+        `ValueError`: if `json_content` is not valid JSON
+        `KeyError`, `TypeError`: if `json_content` does not match the SeqInfo schema
+    """
+    indexed_seq_info_dicts = json.loads(json_content)
+    if not isinstance(indexed_seq_info_dicts, dict):
+        raise TypeError('sequence info must be a JSON object')
+
+    return {seq_name: decode_seq_info(seq_info_dict) for seq_name, seq_info_dict in indexed_seq_info_dicts.items()}
+
+
+def decode_normalized_seq_info_dict(json_content: str | bytes) -> Dict[str, SeqInfo]:
+    """
+    Decode a normalized JSON string of SeqInfo objects, as written by `encode_normalized_seq_info_dict`.
+
+    Raises:
+        `ValueError`: if `json_content` is not valid JSON
+        `KeyError`: if an embedded variant refers to a variant ID missing from the variant table
+        `TypeError`: if `json_content` does not match the (normalized) SeqInfo schema
+    """
+    content = json.loads(json_content)
+    if not isinstance(content, dict) or not isinstance(content.get('variants'), dict) or not isinstance(content.get('seq_info'), dict):
+        raise TypeError('normalized sequence info must be a JSON object with variants and seq_info objects')
+    variants: Dict[str, Any] = content['variants']
+
+    indexed_seq_info: Dict[str, SeqInfo] = {}
+    for seq_name, seq_info_dict in content['seq_info'].items():
+        if isinstance(seq_info_dict, dict) and isinstance(seq_info_dict.get('embedded_variants'), list):
+            embedded_variant_dicts: List[Any] = []
+            for embedding in seq_info_dict['embedded_variants']:
+                if not isinstance(embedding, dict):
+                    raise TypeError('embedded_variants must be a list of dicts')
+                if embedding.get('variant_id') not in variants:
+                    raise KeyError(f"variant {embedding.get('variant_id')} of '{seq_name}' not in variant table")
+                variant_attrs = variants[embedding['variant_id']]
+                if not isinstance(variant_attrs, dict):
+                    raise TypeError('variant table entries must be dicts')
+                embedded_variant_dicts.append(variant_attrs | embedding)
+            seq_info_dict = seq_info_dict | {'embedded_variants': embedded_variant_dicts}
+        indexed_seq_info[seq_name] = decode_seq_info(seq_info_dict)
+
+    return indexed_seq_info
@@ -3,23 +3,17 @@
 Main module serving the CLI for PAVI sequence info align component.
 
 Collects and merges sequence info generated by the sequence retrieval component
- + adds relative alignment positions for all variants using alignment results.
+ + adds relative alignment positions for all variants using alignment results
+ + indexes all aligned variants by alignment column.
 """
-from Bio import AlignIO
-from Bio.SeqRecord import SeqRecord
-from Bio.Align import MultipleSeqAlignment
-from copy import deepcopy
 import click
-from enum import Enum
-import json
-import jsonpickle  # type: ignore
 import logging
 from os import path, access, R_OK
-from typing import Any, List, Optional
+from typing import get_args, List, Tuple
 
+from alignment_io import parse_alignment
 from log_mgmt import set_log_level, get_logger
-from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList
-from seq_info import EnumValueHandler, SeqInfo
+from seq_info import AlignmentVariantIndex, merge_seq_info_files, SEQ_INFO_FORMAT_TYPE, SeqInfo, SeqInfoJsonWriter
 
 logger = get_logger(name=__name__)
 
@@ -76,10 +70,17 @@ def process_alignment_result_file_param(ctx: click.Context, param: click.Paramet
 @click.option("--sequence-info-files", type=click.UNPROCESSED, required=True, callback=process_sequence_info_files_param,
               help="Space separated list of sequence info files to read.")
 @click.option("--alignment-result-file", type=click.UNPROCESSED, required=True, callback=process_alignment_result_file_param,
-              help="Path to alignment output file.")
+              help="Path to alignment output file (clustal or aligned FASTA format).")
+@click.option("--max-read-workers", type=click.IntRange(min=1), default=8,
+              help="Maximum number of sequence info files to read concurrently.")
+@click.option("--skip-invalid-files", is_flag=True,
+              help="Flag to merge all valid sequence info files when some fail to be read, rather than exiting with an error.")
+@click.option("--output-format", type=click.Choice(get_args(SEQ_INFO_FORMAT_TYPE)), default='full',
+              help="Format of the aligned sequence info output file ('normalized' stores variant attributes once, in a variant table).")
 @click.option("--debug", is_flag=True,
               help="""Flag to enable debug printing.""")
-def main(alignment_result_file: str, sequence_info_files: List[str], debug: bool) -> None:
+def main(alignment_result_file: str, sequence_info_files: List[str], max_read_workers: int, skip_invalid_files: bool,
+         output_format: SEQ_INFO_FORMAT_TYPE, debug: bool) -> None:
     if debug:
         set_log_level(logging.DEBUG)
     else:
@@ -88,67 +89,42 @@ def main(alignment_result_file: str, sequence_info_files: List[str], debug: bool
     logger.debug(f"sequence_info_files: {sequence_info_files}")
     logger.debug(f"alignment output file: {alignment_result_file}")
 
-    alt_sequence_info_dict: dict[str, SeqInfo] = {}
-
-    # * Read each of the sequence_info_files (JSON) and merge into a single dict
-    for file in sequence_info_files:
-        try:
-            with open(file, 'r') as f:
-                sequence_info_json_dict: dict[str, Any] = json.load(f)
-                sequence_info_dict: dict[str, SeqInfo] = {}
-                for key, value in sequence_info_json_dict.items():
-                    sequence_info_dict[key] = SeqInfo.from_dict(value)
-                alt_sequence_info_dict.update(sequence_info_dict)
-        except Exception as e:
-            logger.error(f"Failed to read sequence info file '{file}': {e}")
+    # * Read the sequence_info_files (JSON) concurrently and merge into a single dict (in input order)
+    sequence_info_merge = merge_seq_info_files(sequence_info_files, max_workers=max_read_workers)
+    if sequence_info_merge.errors:
+        if not skip_invalid_files:
+            logger.error(f"Failed to read {len(sequence_info_merge.errors)} of {len(sequence_info_files)} sequence info files.")
             exit(1)
+        logger.warning(f"Skipped {len(sequence_info_merge.errors)} of {len(sequence_info_files)} sequence info files that failed to be read.")
+    alt_sequence_info_dict: dict[str, SeqInfo] = sequence_info_merge.seq_info
 
-    # * Read alignment_result_file
-    alignment: MultipleSeqAlignment
+    # * Read all rows of the alignment_result_file
     try:
-        alignment = next(AlignIO.parse(alignment_result_file, "clustal"))
-    except Exception as e:
+        alignment_rows: dict[str, str] = dict(parse_alignment(alignment_result_file))
+    except (OSError, ValueError) as e:
         logger.error(f"Failed to read alignment result file '{alignment_result_file}': {e}")
         exit(1)
 
-    if not isinstance(alignment, MultipleSeqAlignment):
-        logger.error(f"Alignment result file '{alignment_result_file}' does not contain a multiple sequence alignment.")
-        exit(1)
-
-    # * Loop over each record in the alignment_result_file and update the sequence info dict with relative alignment positions
-    aligned_seq_info_dict: dict[str, SeqInfo] = deepcopy(alt_sequence_info_dict)
-    for record in alignment:
-        if not isinstance(record, SeqRecord):
-            logger.error(f"Error while parsing record of alignment result file '{alignment_result_file}'.")
-            exit(1)
-        if record.seq is None:
-            logger.error(f"Error while reading record sequence for alignment record '{record.id}'.")
-            exit(1)
-
-        aligned_variants: Optional[AlignmentEmbeddedVariantsList] = None
-
-        if record.id in alt_sequence_info_dict:
-            aligned_seq_info = deepcopy(alt_sequence_info_dict[record.id])
-
-            # Replace the embedded variants with their aligned counterparts
-            if hasattr(alt_sequence_info_dict[record.id], 'embedded_variants'):
-                embedded_variants = deepcopy(alt_sequence_info_dict[record.id].embedded_variants)
-                delattr(aligned_seq_info, 'embedded_variants')
-                if isinstance(embedded_variants, AlignmentEmbeddedVariantsList):
-                    aligned_variants = embedded_variants
-                else:
-                    aligned_variants = AlignmentEmbeddedVariantsList()
-                    if embedded_variants:
-                        for variant in embedded_variants:
-                            aligned_variants.append(AlignmentEmbeddedVariant(variant, record))
-                aligned_seq_info.embedded_variants = aligned_variants
-
-            aligned_seq_info_dict[record.id] = aligned_seq_info
-
-    jsonpickle.set_encoder_options("simplejson", sort_maps=True)
-    jsonpickle.register(Enum, EnumValueHandler, base=True)
-    with open('aligned_seq_info.json', 'w') as f:
-        f.write(jsonpickle.encode(aligned_seq_info_dict, make_refs=False, unpicklable=False))
+    # * Replace the sequence info of each aligned sequence by its aligned counterpart and write it out as soon as it is computed,
+    #   in merged order. Entries are released once written, so memory usage scales with the largest entry rather than the whole job.
+    #   The variant index only keeps the alignment intervals of every entry.
+    variant_index_intervals: List[Tuple[int, int, str, str]] = []
+    with open('aligned_seq_info.json', 'w') as f, SeqInfoJsonWriter(f, output_format) as writer:
+        for seq_name in list(alt_sequence_info_dict.keys()):
+            seq_info = alt_sequence_info_dict.pop(seq_name)
+            if seq_name in alignment_rows:
+                try:
+                    seq_info = seq_info.to_aligned((seq_name, alignment_rows.pop(seq_name)))
+                except ValueError as e:
+                    logger.error(f"Failed to align sequence info of '{seq_name}': {e}")
+                    exit(1)
+
+            writer.write(seq_name, seq_info)
+            variant_index_intervals.extend(AlignmentVariantIndex.seq_info_intervals(seq_name, seq_info))
+
+    # * Write the column-indexed variant overlay, for clients to look up the variants in alignment column ranges
+    with open('aligned_variant_index.json', 'w') as f:
+        f.write(AlignmentVariantIndex(variant_index_intervals).to_json())
 
 
 if __name__ == '__main__':
@@ -30,7 +30,7 @@ class InvalidatedOrfException(OrfException):
 
 def exception_description(e: Exception) -> str:
     descr: str
-    if len(e.__notes__) > 0:
+    if len(getattr(e, '__notes__', [])) > 0:
         descr = str(e.__notes__[0])
     else:
         descr = str(e)
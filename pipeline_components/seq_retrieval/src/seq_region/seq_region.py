@@ -5,8 +5,9 @@ from typing import cast, Dict, List, Literal, Optional, override, TypedDict, TYP
 
 from Bio import Seq  # Bio.Seq biopython submodule
 import pysam
+import requests
 
-from data_mover import data_file_mover
+from data_mover import data_file_mover, remote_fasta
 from log_mgmt import get_logger
 
 if TYPE_CHECKING:
@@ -17,6 +18,15 @@ from variant import SeqEmbeddedVariant, SeqEmbeddedVariantsList, SeqSubstitution
 
 logger = get_logger(name=__name__)
 
+_remote_fasta_access = False
+"""
+Module level toggle defining remote fasta file access behaviour.
+ * When True, remote (http/https) fasta files are accessed through HTTP range requests, fetching only the regions required
+ * When False, remote fasta files are downloaded completely before reading.
+
+Change the value through the `set_remote_fasta_access` function.
+"""
+
 
 class SeqRegion():
     """
@@ -44,7 +54,7 @@ class SeqRegion():
     """Sequence length (expected) of the sequence region."""
 
     fasta_file_path: str
-    """Absolute path to (faidx indexed) FASTA file containing reference sequences"""
+    """Absolute path to (faidx indexed) FASTA file containing reference sequences (or its URL, when accessed remotely)"""
 
     sequence: Optional[str]
     """the DNA sequence of a sequence region"""
@@ -181,7 +191,7 @@ class SeqRegion():
     def fetch_seq(self) -> str:
         """
         Fetch sequence found at `seq_id`:`start`-`end`(:`strand`)
-        by reading from faidx files at `fasta_file_path`.
+        by reading from faidx files at `fasta_file_path` (locally or through remote access).
 
         Assumes `+` as strand if undefined.
         Stores resulting sequence in `sequence` attribute.
@@ -189,18 +199,22 @@ class SeqRegion():
         Returns:
             Return the fetched sequence as a string
         """
-        try:
-            fasta_file = pysam.FastaFile(self.fasta_file_path)
-        except ValueError:
-            raise FileNotFoundError(f"Missing index file matching path {self.fasta_file_path}.")
-        except IOError:
-            raise IOError(f"Error while reading fasta file or index matching path {self.fasta_file_path}.")
+        seq: str
+        if remote_fasta.is_remote_url(self.fasta_file_path):
+            seq = remote_fasta.open_remote_fasta(self.fasta_file_path).fetch(reference=self.seq_id, start=(self.start - 1), end=self.end)
         else:
-            seq: str = fasta_file.fetch(reference=self.seq_id, start=(self.start - 1), end=self.end)
-            fasta_file.close()
+            try:
+                fasta_file = pysam.FastaFile(self.fasta_file_path)
+            except ValueError:
+                raise FileNotFoundError(f"Missing index file matching path {self.fasta_file_path}.")
+            except IOError:
+                raise IOError(f"Error while reading fasta file or index matching path {self.fasta_file_path}.")
+            else:
+                seq = fasta_file.fetch(reference=self.seq_id, start=(self.start - 1), end=self.end)
+                fasta_file.close()
 
-            if self.strand == '-':
-                seq = str(Seq.reverse_complement(seq))
+        if self.strand == '-':
+            seq = str(Seq.reverse_complement(seq))
 
         self.set_sequence(seq)
 
@@ -520,29 +534,47 @@ class PositionedVariant(TypedDict):
     """Strand-corrected part of the variant's alternative sequence that overlaps the SeqRegion"""
 
 
-def fetch_faidx_files(fasta_file_url: str) -> str:
+def set_remote_fasta_access(enabled: bool) -> None:
+    """
+    Define seq_region module-level default behaviour on remote fasta file access.
+
+    Args:
+        enabled (bool): set to `True` to access remote (http/https/s3) fasta files through HTTP range requests \
+                        rather than downloading them (default `False`).
+    """
+    global _remote_fasta_access
+    _remote_fasta_access = enabled
+
+
+def fetch_faidx_files(fasta_file_url: str, remote_access: Optional[bool] = None) -> str:
     """
     Fetch faidx-indexed fasta file and index files.
 
-    Fetches fasta file and index files (.fai + .gzi if fasta file is (bgzip) compressed).
+    Fetches fasta file and index files (.fai + .gzi if fasta file is (bgzip) compressed) concurrently,
+    unless remote access is selected for `fasta_file_url`, in which case the URL is opened for remote access
+    (only fetching the index files) and returned as is.
+    When index files are not available (or the fasta file is plain gzip-compressed), the fasta file is fetched
+    and indexed locally instead (see `data_file_mover.fetch_indexed_fasta_file`).
 
     Args:
-        fasta_file_url: URL of faidx-indexed FASTA file to fetch.\
-                        Index files `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta file must be accessible URLs.
+        fasta_file_url: URL of FASTA file to fetch.\
+                        Index files are expected at `fasta_file_url`.fai and `fasta_file_url`.gzi for compressed fasta files.
+        remote_access: Argument to override remote access behaviour defined at seq_region module level. \
+                       Remote access only applies to http(s) and s3 URLs (see `remote_fasta.is_remote_url`).
 
     Returns:
-        Absolute path to fasta file matching the requested URL (string).
+        Absolute path to fasta file matching the requested URL (string),\
+        or `fasta_file_url` when accessed remotely.
     """
-    # Fetch the fasta file
-    local_fasta_file_path = data_file_mover.fetch_file(fasta_file_url)
-
-    # Fetch additional faidx index files in addition to fasta file itself
-    # (to the same location)
-    index_files = [fasta_file_url + '.fai']
-    if fasta_file_url.endswith('.gz'):
-        index_files.append(fasta_file_url + '.gzi')
+    if remote_access is None:
+        remote_access = _remote_fasta_access
 
-    for index_file in index_files:
-        data_file_mover.fetch_file(index_file)
+    if remote_access and remote_fasta.is_remote_url(fasta_file_url):
+        try:
+            remote_fasta.open_remote_fasta(fasta_file_url)
+        except (requests.RequestException, ValueError, OSError) as e:
+            logger.warning(f"Remote access to {fasta_file_url} not possible ({e}), fetching it instead.")
+        else:
+            return fasta_file_url
 
-    return local_fasta_file_path
+    return data_file_mover.fetch_indexed_fasta_file(fasta_file_url)
@@ -6,9 +6,10 @@ from Bio import Seq  # Bio.Seq biopython submodule
 from Bio.Data import CodonTable
 from typing import Dict, List, Literal, Optional, override, Set, TypedDict
 
-from .exceptions import InvalidatedOrfException, OrfNotFoundException, OrfException, TranslationException, SequenceNotFoundException
+from .exceptions import exception_description, InvalidatedOrfException, OrfNotFoundException, OrfException, TranslationException, SequenceNotFoundException
 from .seq_region import SeqRegion, AltSeqInfo
 from .multipart_seq_region import MultiPartSeqRegion
+from seq_info import SeqInfo
 from variant import SeqEmbeddedVariantsList, Variant
 from log_mgmt import get_logger
 
@@ -448,6 +449,49 @@ class TranslatedSeqRegion():
 
         return alt_seq_info
 
+    def get_alt_sequences(self, type: Literal['transcript', 'coding', 'protein'], variant_groups: Dict[str, List[Variant]],
+                          unmasked: bool = False, autofetch: bool = True) -> Dict[str, AltSeqInfo | SeqInfo]:
+        """
+        Get multiple alternative sequences of the object, one for each group of variants, from a single reference retrieval.
+
+        The reference sequence (and for `type` 'coding' and 'protein', the reference coding sequence and ORF)
+        is retrieved once and stored on the object, after which it is shared by all alternative sequences generated.
+
+        Args:
+            type: type of sequences to return (see `get_alt_sequence`)
+            variant_groups: Dict of variant lists (values) to apply to the reference sequence,\
+                            each generating one alternative sequence (keys are used to identify the results).
+            unmasked: Flag to remove soft masking (lowercase letters) \
+                      and return unmasked sequences instead (uppercase). Default `False`.
+            autofetch: Flag to enable/disable automatic fetching of the reference sequence \
+                       when not already available. Default `True` (enabled).
+
+        Returns:
+            Dict with an `AltSeqInfo` object for every variant group (same keys as `variant_groups`).\
+            Groups for which no alternative sequence could be generated get a `SeqInfo` object reporting the error instead.
+        """
+
+        alt_seq_infos: Dict[str, AltSeqInfo | SeqInfo] = {}
+
+        # Retrieve the shared reference sequence(s) once
+        try:
+            self.get_sequence(type='transcript' if type == 'transcript' else 'coding', autofetch=autofetch)
+        except Exception as e:
+            logger.error(f'Failed to retrieve reference {type} sequence for alternative sequence generation: {e}')
+            error_msg = exception_description(e)
+            for group_name in variant_groups.keys():
+                alt_seq_infos[group_name] = SeqInfo(error=error_msg)
+            return alt_seq_infos
+
+        for group_name, variants in variant_groups.items():
+            try:
+                alt_seq_infos[group_name] = self.get_alt_sequence(type=type, variants=variants, unmasked=unmasked, autofetch=autofetch)
+            except Exception as e:
+                logger.error(f'Failed to retrieve alternative {type} sequence for variant group {group_name} ({variants}): {e}')
+                alt_seq_infos[group_name] = SeqInfo(error=exception_description(e))
+
+        return alt_seq_infos
+
     def set_sequence(self, type: Literal['transcript', 'coding', 'protein'], sequence: str) -> None:
         """
         Method to set the different TranslatedSeqRegion sequences, analogous to `get_sequence` method.
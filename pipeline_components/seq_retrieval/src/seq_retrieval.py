@@ -5,17 +5,18 @@ Main module serving the CLI for PAVI sequence retrieval.
 Retrieves multiple sequence regions and returns them as one chained sequence.
 """
 import click
-from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 import json
-import jsonpickle  # type: ignore
 import logging
 import re
-from typing import Any, get_args, List, TypedDict, Optional
+from time import perf_counter
+from typing import get_args, Iterable, List, TypedDict, Optional
 
-from data_mover import data_file_mover
-from seq_info import EnumValueHandler, SeqInfo
+from data_mover import cache_store, data_file_mover
+from seq_info import encode_seq_info_dict, SeqInfo
 from seq_region import SeqRegion, TranslatedSeqRegion
 from seq_region.exceptions import exception_description
+from seq_region.seq_region import fetch_faidx_files, set_remote_fasta_access
 from variant import Variant
 from log_mgmt import set_log_level, get_logger
 
@@ -142,44 +143,208 @@ def process_variants_param(ctx: click.Context, param: click.Parameter, value: st
         return variants
 
 
-def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, variants_flag: bool, alt_seq_name_suffix: str,
-                 ref_seq: Optional[str], alt_seq: Optional[str], ref_info: SeqInfo, alt_info: Optional[SeqInfo], sequence_output_file: str | None = None) -> None:
+def process_variants_file_param(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> dict[str, Variant]:  # noqa: U100
+    """
+    Read the file provided through click input parameter variants_file and parse its content into Variant objects.
+
+    File is expected to contain a JSON-formatted object of pre-resolved variant records, indexed by variant ID.
+    Each record is expected to be formatted as a dict accepted by `Variant.from_dict`.
+    Invalid records are logged and skipped, so their variants are fetched through the public web API instead
+    (the file is shared by all tasks of a job, which must not all fail on a variant most of them don't use).
+
+    Returns:
+        Dict of Variant objects, indexed by variant ID (empty if no file was provided)
+
+    Raises:
+        click.BadParameter: If the file could not be read or parsed, or had an invalid structure.
+    """
+    variants: dict[str, Variant] = {}
+    if value is None:
+        return variants
+
+    try:
+        with open(value, 'r') as variants_file:
+            variants_input = json.load(variants_file)
+    except OSError as e:
+        raise click.BadParameter(f"Variants file '{value}' could not be read: {e}")
+    except Exception:
+        raise click.BadParameter(f"Variants file '{value}' must contain valid JSON.")
+
+    if not isinstance(variants_input, dict):
+        raise click.BadParameter(f"Variants file '{value}' must contain a valid dict (JSON-object) of variant records, indexed by variant ID.")
+    for variant_id, variant_record in variants_input.items():
+        if not isinstance(variant_record, dict):
+            logger.warning(f"Pre-resolved variant record for {variant_id} is not a valid dict (JSON-object), skipping it.")
+            continue
+        try:
+            variants[variant_id] = Variant.from_dict(variant_record)
+        except Exception as e:
+            logger.warning(f"Pre-resolved variant record for {variant_id} is invalid, skipping it: {e}")
+
+    return variants
+
+
+def process_variant_groups_param(ctx: click.Context, param: click.Parameter, value: str) -> dict[str, List[str]]:  # noqa: U100
+    """
+    Parse the value of click input parameter variant_groups and validate it's structure.
+
+    Value is expected to be a JSON-formatted object, with group names as keys
+    and lists of variant IDs to embed together as values.
+
+    Returns:
+        Dict of lists of strings representing variant IDs, indexed by group name
+
+    Raises:
+        click.BadParameter: If value could not be parsed as JSON or had an invalid structure or values.
+    """
+    variant_groups: dict[str, List[str]] = {}
+    try:
+        variant_groups_input = json.loads(value)
+    except Exception:
+        raise click.BadParameter("Must be a valid JSON-formatted string.")
+    else:
+        if not isinstance(variant_groups_input, dict):
+            raise click.BadParameter("Must be a valid dict (JSON-object) of variant ID lists, indexed by group name.")
+        for group_name, group_variants in variant_groups_input.items():
+            if not re.fullmatch(r'[A-Za-z0-9_.-]+', group_name):
+                raise click.BadParameter(f"Group name '{group_name}' is invalid. Group names can only contain alphanumeric characters, '_', '.' and '-'.")
+            if not isinstance(group_variants, list) or len(group_variants) == 0:
+                raise click.BadParameter(f"Group {group_name} is not a valid non-empty list (JSON-array) of variant IDs.")
+            for variant in group_variants:
+                if not isinstance(variant, str):
+                    raise click.BadParameter(f"Variant {variant} in group {group_name} is not a valid string. All variants in variant groups must be valid strings.")
+            variant_groups[group_name] = list(dict.fromkeys(group_variants))
+
+        return variant_groups
+
+
+def process_size_budget_param(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[int]:  # noqa: U100
+    """
+    Parse the value of click input parameter local_cache_size_budget into bytes.
+
+    Returns:
+        Size budget in bytes, or `None` when not defined.
+
+    Raises:
+        click.BadParameter: If value could not be parsed as size.
+    """
+    if value is None:
+        return None
+    try:
+        return cache_store.parse_size(value)
+    except ValueError:
+        raise click.BadParameter(f"Invalid size '{value}', expected a number of bytes optionally followed by a K, M, G or T unit.")
+
+
+def alt_seq_name_for_variant(variant_id: str) -> str:
+    """
+    Convert a variant ID into a string safe to use as part of a sequence name.
+
+    Returns:
+        The variant ID, with all characters other than alphanumerics, '_', '.' and '-' replaced by '_'.
+    """
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', variant_id)
+
+
+def define_alt_variant_groups(variant_info: dict[str, Variant], alt_seq_name_suffix: str,
+                              per_variant_alt_seqs: bool, variant_groups: dict[str, List[str]]) -> dict[str, List[Variant]]:
+    """
+    Define the groups of variants to generate an alt sequence for.
+
+    Args:
+        variant_info: Variant objects for all requested variant IDs (indexed by variant ID).
+        alt_seq_name_suffix: Suffix to use for naming the alt sequence(s).
+        per_variant_alt_seqs: Flag to generate one alt sequence per variant.
+        variant_groups: Lists of variant IDs to generate one alt sequence per list for (indexed by group name).
+
+    Returns:
+        Dict of variant lists, indexed by the alt sequence name suffix to use for the resulting alt sequence.
+        Without `per_variant_alt_seqs` or `variant_groups`, all variants are grouped into a single alt sequence.
+    """
+    alt_variant_groups: dict[str, List[Variant]] = {}
+    if variant_groups:
+        for group_name, group_variant_ids in variant_groups.items():
+            alt_variant_groups[f'{alt_seq_name_suffix}_{group_name}'] = [variant_info[variant_id] for variant_id in group_variant_ids]
+    elif per_variant_alt_seqs:
+        for variant_id in sorted(variant_info.keys()):
+            alt_variant_groups[f'{alt_seq_name_suffix}_{alt_seq_name_for_variant(variant_id)}'] = [variant_info[variant_id]]
+    elif variant_info:
+        alt_variant_groups[alt_seq_name_suffix] = list(variant_info.values())
+
+    return alt_variant_groups
+
+
+def fetch_variants(variant_ids: Iterable[str], pre_resolved_variants: Optional[dict[str, Variant]] = None) -> dict[str, Variant]:
+    """
+    Fetch variant info for all variant IDs through the public web API.
+
+    Args:
+        variant_ids: IDs of the variants to fetch
+        pre_resolved_variants: Dict of Variant objects resolved beforehand (indexed by variant ID),\
+                               which are reused rather than fetched.
+
+    Returns:
+        Dict of Variant objects, indexed by variant ID.
+    """
+    if pre_resolved_variants is None:
+        pre_resolved_variants = {}
+
+    variant_info: dict[str, Variant] = {}
+    for variant_id in variant_ids:
+        if variant_id in pre_resolved_variants:
+            logger.debug(f"Using pre-resolved variant info for {variant_id}.")
+            variant_info[variant_id] = pre_resolved_variants[variant_id]
+            continue
+        logger.debug(f"Fetching variant info for {variant_id}...")
+        variant_info[variant_id] = Variant.from_variant_id(variant_id)
+        logger.debug(f"Variant info for {variant_id} fetched: {variant_info[variant_id]}")
+
+    return variant_info
+
+
+def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, variants_flag: bool,
+                 ref_seq: Optional[str], ref_info: SeqInfo, alt_results: dict[str, tuple[Optional[str], Optional[SeqInfo]]],
+                 sequence_output_file: str | None = None) -> None:
+    """
+    Write the retrieved sequences to a fasta file and the accompanying sequence info to a JSON file.
+
+    Args:
+        alt_results: Dict of (alt sequence, alt sequence info) tuples, indexed by the alt sequence name suffix to use.
+    """
     # Define sequence names
     ref_seq_name: str = base_seq_name
-    alt_seq_name: str
 
     if variants_flag:
         ref_seq_name = base_seq_name + '_ref'
-        alt_seq_name = base_seq_name + alt_seq_name_suffix
 
     # Print sequence output
     if sequence_output_file is None:
         sequence_output_file = f'{unique_entry_id}-{output_type}.fa'
 
-    if ref_seq is not None or alt_seq is not None:
+    if ref_seq is not None or any(alt_seq is not None for alt_seq, _ in alt_results.values()):
         with open(sequence_output_file, 'w') as output_file:
             logger.debug(f'Writing sequences to {sequence_output_file}...')
 
             if ref_seq is not None:
                 output_file.write(f'>{ref_seq_name}\n{ref_seq}\n')
 
-            if alt_seq is not None:
-                output_file.write(f'>{alt_seq_name}\n{alt_seq}\n')
+            for alt_seq_name_suffix, (alt_seq, _) in alt_results.items():
+                if alt_seq is not None:
+                    output_file.write(f'>{base_seq_name + alt_seq_name_suffix}\n{alt_seq}\n')
 
     # Print seq info
-    indexed_seq_info: dict[str, Any] = {}
+    indexed_seq_info: dict[str, Optional[SeqInfo]] = {}
     indexed_seq_info[ref_seq_name] = ref_info
     if variants_flag:
-        indexed_seq_info[alt_seq_name] = alt_info
+        for alt_seq_name_suffix, (_, alt_info) in alt_results.items():
+            indexed_seq_info[base_seq_name + alt_seq_name_suffix] = alt_info
 
     seq_info_output_file = f'{unique_entry_id}-seqinfo.json'
 
-    jsonpickle.register(Enum, EnumValueHandler, base=True)
-
     with open(seq_info_output_file, 'w') as output_file:
         logger.debug(f'Writing sequence info to {seq_info_output_file}...')
 
-        output_file.write(jsonpickle.encode(indexed_seq_info, make_refs=False, unpicklable=False))
+        output_file.write(encode_seq_info_dict(indexed_seq_info))
 
 
 @click.command(context_settings={'show_default': True})
@@ -195,13 +360,24 @@ def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, var
                    + "(dicts formatted '{\"start\": 1234, \"end\": 5678, \"frame\": 0}' or strings formatted '`start`..`end`').")
 @click.option("--variant_ids", type=click.UNPROCESSED, default='[]', callback=process_variants_param,
               help="A JSON string list of variant IDs to embed into the transcript (and protein) sequence")
+@click.option("--variants_file", type=click.STRING, required=False, callback=process_variants_file_param,
+              help="""JSON file of pre-resolved variant records, indexed by variant ID.
+              Variants found in this file are not fetched through the public web API.""")
 @click.option("--alt_seq_name_suffix", type=click.STRING, default='_alt',
               help="Suffix to use for naming the alt sequence embedding the variants.")
+@click.option("--per_variant_alt_seqs", is_flag=True,
+              help="""When defined, generate one alt sequence per variant (named `base_seq_name``alt_seq_name_suffix`_`variant_id`)
+              rather than one alt sequence embedding all variants. The reference sequence is only retrieved once.""")
+@click.option("--variant_groups", type=click.UNPROCESSED, default='{}', callback=process_variant_groups_param,
+              help="""A JSON object of variant ID lists, indexed by group name, to generate one alt sequence per group for
+              (named `base_seq_name``alt_seq_name_suffix`_`group_name`). The reference sequence is only retrieved once.""")
 @click.option("--fasta_file_url", type=click.STRING, required=True,
               help="""URL to (faidx-indexed) fasta file to retrieve sequences from.
                    Assumes additional index files can be found at `<fasta_file_url>.fai`,
                    and at `<fasta_file_url>.gzi` if the fastafile is compressed.
-                   Use "file://*" for local file or "http(s)://*" for remote files.""")
+                   Use "file://*" for local file, "http(s)://*" for remote files or "s3://*" for files in S3
+                   (accessed through the endpoint defined by the AWS_ENDPOINT_URL_S3 or AWS_REGION environment variables,
+                   through requests signed with the default AWS credential chain when credentials are available).""")
 @click.option("--output_type", type=click.Choice(['transcript', 'protein'], case_sensitive=False), required=True,
               help="""The output type to return.""")
 @click.option("--base_seq_name", type=click.STRING, required=True,
@@ -210,16 +386,27 @@ def write_output(unique_entry_id: str, base_seq_name: str, output_type: str, var
               help="Unique name to identify the sequence pair by and used for output file names.")
 @click.option("--sequence_output_file", type=click.STRING, required=False,
               help="""The sequence output file to write to (default "`name`-`output_type`.fa").""")
-@click.option("--reuse_local_cache", is_flag=True,
-              help="""When defined and using remote `fasta_file_url`, reused local files
-              if file already exists at destination path, rather than re-downloading and overwritting.""")
+@click.option("--local_cache_policy", type=click.Choice(get_args(data_file_mover.CACHE_POLICY_TYPE)), default='validate',
+              help="""When using remote `fasta_file_url`, defines reuse of local files already existing at destination path:
+              'validate' reuses them after validation against the remote (conditional request),
+              'trust' reuses them without validation, 'refresh' always re-downloads and overwrites them.""")
+@click.option("--local_cache_size_budget", type=click.STRING, required=False, callback=process_size_budget_param,
+              help="""Total size budget of the local file cache (for example '20G'). When exceeded after a download,
+              least recently used cached files are evicted. Unbounded when not defined.""")
+@click.option("--prestaged_dir", "prestaged_dirs", type=click.STRING, multiple=True, envvar='PAVI_PRESTAGED_DIRS',
+              help="""Read-only pre-staged directory (containing a pavi_manifest.json file mapping URLs to files),
+              searched for remote files before the local file cache and the network. Can be repeated (searched in order).""")
+@click.option("--remote_fasta_access", is_flag=True,
+              help="""When defined and using remote `fasta_file_url`, read the required sequence regions through HTTP range requests
+              (using the remote index files) rather than downloading the complete fasta file.""")
 @click.option("--unmasked", is_flag=True,
               help="""When defined, return unmasked sequences (undo soft masking present in reference files).""")
 @click.option("--debug", is_flag=True,
               help="""Flag to enable debug printing.""")
 def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[SeqRegionDict], cds_seq_regions: List[SeqRegionDict],
-         variant_ids: set[str], alt_seq_name_suffix: str, fasta_file_url: str, output_type: str, base_seq_name: str, unique_entry_id: str,
-         sequence_output_file: str, reuse_local_cache: bool, unmasked: bool, debug: bool) -> None:
+         variant_ids: set[str], variants_file: dict[str, Variant], alt_seq_name_suffix: str, per_variant_alt_seqs: bool, variant_groups: dict[str, List[str]],
+         fasta_file_url: str, output_type: str, base_seq_name: str, unique_entry_id: str,
+         sequence_output_file: str, local_cache_policy: data_file_mover.CACHE_POLICY_TYPE, local_cache_size_budget: Optional[int], prestaged_dirs: tuple[str, ...], remote_fasta_access: bool, unmasked: bool, debug: bool) -> None:
     """
     Main method for sequence retrieval from JBrowse faidx indexed fasta files. Receives input args from click.
 
@@ -232,16 +419,35 @@ def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[
     else:
         set_log_level(logging.INFO)
 
-    logger.info(f'Running seq_retrieval for {unique_entry_id}.')
+    if per_variant_alt_seqs and variant_groups:
+        raise click.BadParameter("Options --per_variant_alt_seqs and --variant_groups are mutually exclusive.")
 
-    data_file_mover.set_local_cache_reuse(reuse_local_cache)
+    logger.info(f'Running seq_retrieval for {unique_entry_id}.')
 
-    # Fetch variant info for all variant IDs through the public web API
-    variant_info: dict[str, Variant] = {}
-    for variant_id in variant_ids:
-        logger.debug(f"Fetching variant info for {variant_id}...")
-        variant_info[variant_id] = Variant.from_variant_id(variant_id)
-        logger.debug(f"Variant info for {variant_id} fetched: {variant_info[variant_id]}")
+    data_file_mover.set_local_cache_policy(local_cache_policy)
+    data_file_mover.set_cache_size_budget(local_cache_size_budget)
+    data_file_mover.set_prestaged_dirs(list(prestaged_dirs))
+    set_remote_fasta_access(remote_fasta_access)
+
+    # Fetch variant info (through the public web API) and reference files concurrently,
+    # as both are independent I/O-bound operations.
+    # SeqRegion objects created below reuse the fetched reference files from the data_file_mover memory cache.
+    start_time = perf_counter()
+    fetch_times: dict[str, float] = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        variant_info_future = executor.submit(fetch_variants, variant_ids.union(*variant_groups.values()), variants_file)
+        variant_info_future.add_done_callback(lambda future: fetch_times.update(variant_info=perf_counter() - start_time))  # noqa: U100
+        reference_future = executor.submit(fetch_faidx_files, fasta_file_url)
+        reference_future.add_done_callback(lambda future: fetch_times.update(reference_files=perf_counter() - start_time))  # noqa: U100
+
+        variant_info = variant_info_future.result()
+        reference_future.result()
+
+    # Done callbacks have all completed once the executor has shut down
+    logger.debug(f"Input retrieval completed in {perf_counter() - start_time:.2f}s "
+                 + f"(variant info: {fetch_times['variant_info']:.2f}s, reference files: {fetch_times['reference_files']:.2f}s).")
+    for url, tier in data_file_mover.served_tiers().items():
+        logger.info(f"Reference file {url} served from {tier} tier.")
 
     # Parse exon_seq_regions and cds_seq_regions into respective SeqRegion objects
     exon_seq_region_objs: List[SeqRegion] = []
@@ -260,12 +466,14 @@ def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[
 
     logger.debug(f"full region: {fullRegion.seq_id}:{fullRegion.start}-{fullRegion.end}:{fullRegion.strand}")
 
+    # Define the variant groups to generate alt sequences for (indexed by alt sequence name suffix)
+    alt_variant_groups = define_alt_variant_groups(variant_info=variant_info, alt_seq_name_suffix=alt_seq_name_suffix,
+                                                   per_variant_alt_seqs=per_variant_alt_seqs, variant_groups=variant_groups)
+
     # Initiate output variables
     ref_seq: str | None = None
-    alt_seq: str | None = None
     ref_info: SeqInfo = SeqInfo()
-    alt_info: SeqInfo | None = None
-    error_msg: str
+    alt_results: dict[str, tuple[Optional[str], Optional[SeqInfo]]] = {}
 
     # Retrieve relevant sequence info
     if output_type == 'transcript':
@@ -276,44 +484,32 @@ def main(seq_id: str, seq_strand: SeqRegion.STRAND_TYPE, exon_seq_regions: List[
             error_msg = exception_description(e)
             ref_info = SeqInfo(error=error_msg)
 
-        if variant_info:
-            # Generate additional sequence for full region with variants embedded
-            try:
-                seq_info = fullRegion.get_alt_sequence(type='transcript', unmasked=unmasked, variants=list(variant_info.values()))
-            except Exception as e:  # pragma: no cover
-                logger.error(f'Failed to retrieve alternative transcript sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
-                error_msg = exception_description(e)
-                ref_info = SeqInfo(error=error_msg)
-            else:
-                alt_seq = seq_info.sequence
-                alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
-
     elif output_type == 'protein':
         try:
             ref_seq = fullRegion.get_sequence(type='protein')
         except Exception as e:
             error_msg = exception_description(e)
             ref_info = SeqInfo(error=error_msg)
+    else:
+        raise NotImplementedError(f"Output_type {output_type} is currently not implemented.")
 
-        if variant_info:
-            # Generate additional sequence for full region with variants embedded
-            try:
-                seq_info = fullRegion.get_alt_sequence(type='protein', variants=list(variant_info.values()))
-            except Exception as e:
-                logger.error(f'Failed to retrieve alternative protein sequence for TranslatedSeqRegion {fullRegion} with variants ({variant_ids}): {e}')
-                error_msg = exception_description(e)
-                alt_info = SeqInfo(error=error_msg)
+    if alt_variant_groups:
+        # Generate additional sequences for full region with variants embedded,
+        # reusing the reference sequence retrieved above for every variant group.
+        alt_seq_infos = fullRegion.get_alt_sequences(type='transcript' if output_type == 'transcript' else 'protein',
+                                                     variant_groups=alt_variant_groups,
+                                                     unmasked=unmasked if output_type == 'transcript' else False)
+        for alt_seq_suffix, alt_seq_info in alt_seq_infos.items():
+            if isinstance(alt_seq_info, SeqInfo):
+                alt_results[alt_seq_suffix] = (None, alt_seq_info)
             else:
-                alt_seq = seq_info.sequence
-                alt_info = SeqInfo(embedded_variants=seq_info.embedded_variants)
+                alt_results[alt_seq_suffix] = (alt_seq_info.sequence, SeqInfo(embedded_variants=alt_seq_info.embedded_variants))
 
-            if alt_seq == '':
-                logger.error(f'No ORF found for TranslatedSeqRegion {fullRegion} with variants embedded ({variant_ids})')
-    else:
-        raise NotImplementedError(f"Output_type {output_type} is currently not implemented.")
+                if output_type == 'protein' and alt_seq_info.sequence == '':
+                    logger.error(f'No ORF found for TranslatedSeqRegion {fullRegion} with variants embedded ({alt_variant_groups[alt_seq_suffix]})')
 
-    write_output(unique_entry_id=unique_entry_id, base_seq_name=base_seq_name, output_type=output_type, sequence_output_file=sequence_output_file, alt_seq_name_suffix=alt_seq_name_suffix,
-                 ref_seq=ref_seq, alt_seq=alt_seq, ref_info=ref_info, alt_info=alt_info, variants_flag=len(variant_info) > 0)
+    write_output(unique_entry_id=unique_entry_id, base_seq_name=base_seq_name, output_type=output_type, sequence_output_file=sequence_output_file,
+                 ref_seq=ref_seq, ref_info=ref_info, alt_results=alt_results, variants_flag=len(alt_variant_groups) > 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1 @@
+from .transcript_index import PipelineSeqRegionDict, Transcript, TranscriptIndex, TranscriptOverlap
@@ -0,0 +1,422 @@
+"""
+Module containing the TranscriptIndex class and related classes and functions,
+used to map (batches of) variants to the transcripts they affect, based on a GFF3 genome annotation.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+import gzip
+from os import path
+from typing import Dict, IO, Iterable, Iterator, List, Literal, Optional, Tuple, TypedDict
+from urllib.parse import unquote
+
+from log_mgmt import get_logger
+from variant import Variant
+
+logger = get_logger(name=__name__)
+
+TRANSCRIPT_PART_TYPES = ('exon', 'CDS')
+"""GFF3 feature types indexed as transcript parts."""
+
+
+class CdsRegionDict(TypedDict):
+    """
+    Type representing a CDS region, formatted as expected by the `cds_seq_regions` pipeline input.
+    """
+    start: int
+    end: int
+    frame: int
+
+
+class ExonRegionDict(TypedDict):
+    """
+    Type representing an exon region, formatted as expected by the `exon_seq_regions` pipeline input.
+    """
+    start: int
+    end: int
+
+
+class PipelineSeqRegionDict(TypedDict):
+    """
+    Type representing a ready-made pipeline input entry (mirroring the API's `Pipeline_seq_region` model).
+    """
+    base_seq_name: str
+    unique_entry_id: str
+    seq_id: str
+    seq_strand: str
+    exon_seq_regions: List[ExonRegionDict]
+    cds_seq_regions: List[CdsRegionDict]
+    fasta_file_url: str
+    variant_ids: List[str]
+    alt_seq_name_suffix: str
+
+
+class TranscriptOverlap(TypedDict):
+    """
+    Type representing the overlap of a variant with a transcript.
+    """
+    transcript_id: str
+    """ID of the overlapped transcript"""
+    exon_numbers: List[int]
+    """Numbers of the exons overlapped by the variant (1-based, in transcription order)"""
+    in_cds: bool
+    """True if the variant overlaps (part of) the coding sequence of the transcript"""
+
+
+class Transcript():
+    """
+    Defines a transcript annotation, as read from a GFF3 file.
+    """
+
+    transcript_id: str
+    """ID of the transcript"""
+
+    name: str
+    """Name of the transcript (defaults to `transcript_id` when not defined)"""
+
+    gene_name: Optional[str]
+    """Name of the parent gene, if any"""
+
+    seq_id: str
+    """ID of the genomic sequence the transcript is located on"""
+
+    strand: Literal['+', '-']
+    """Strand of the transcript"""
+
+    exon_regions: List[Tuple[int, int]]
+    """Exon regions of the transcript, as (start, end) tuples (1-based, inclusive), in transcription order"""
+
+    cds_regions: List[Tuple[int, int, int]]
+    """CDS regions of the transcript, as (start, end, frame) tuples (1-based, inclusive), in transcription order"""
+
+    def __init__(self, transcript_id: str, seq_id: str, strand: Literal['+', '-'],
+                 name: Optional[str] = None, gene_name: Optional[str] = None):
+        """
+        Initializes a Transcript instance.
+
+        Args:
+            transcript_id: ID of the transcript
+            seq_id: ID of the genomic sequence the transcript is located on
+            strand: Strand of the transcript ('+' or '-')
+            name: optional name of the transcript
+            gene_name: optional name of the parent gene
+        """
+        self.transcript_id = transcript_id
+        self.name = name if name else transcript_id
+        self.gene_name = gene_name
+        self.seq_id = seq_id
+        self.strand = strand
+        self.exon_regions = []
+        self.cds_regions = []
+
+    def sort_regions(self) -> None:
+        """
+        Sort the exon and CDS regions of the transcript in transcription order.
+        """
+        reverse = self.strand == '-'
+        self.exon_regions.sort(key=lambda region: region[0], reverse=reverse)
+        self.cds_regions.sort(key=lambda region: region[0], reverse=reverse)
+
+    def to_pipeline_seq_region(self, fasta_file_url: str, variant_ids: Iterable[str] = (),
+                               alt_seq_name_suffix: str = '_alt') -> PipelineSeqRegionDict:
+        """
+        Generate a pipeline input entry for the transcript.
+
+        Args:
+            fasta_file_url: URL to the (faidx-indexed) fasta file to retrieve the sequence from
+            variant_ids: IDs of the variants to embed in the alternative sequence
+            alt_seq_name_suffix: suffix to use for naming the alternative sequence
+
+        Returns:
+            Dict with all properties of the API's `Pipeline_seq_region` model.
+        """
+        base_seq_name = f'{self.gene_name}_{self.name}' if self.gene_name else self.name
+        sorted_variant_ids = sorted(set(variant_ids))
+
+        unique_entry_id = base_seq_name
+        if sorted_variant_ids:
+            unique_entry_id += alt_seq_name_suffix
+
+        return PipelineSeqRegionDict(
+            base_seq_name=base_seq_name,
+            unique_entry_id=unique_entry_id,
+            seq_id=self.seq_id,
+            seq_strand=self.strand,
+            exon_seq_regions=[ExonRegionDict(start=start, end=end) for start, end in self.exon_regions],
+            cds_seq_regions=[CdsRegionDict(start=start, end=end, frame=frame) for start, end, frame in self.cds_regions],
+            fasta_file_url=fasta_file_url,
+            variant_ids=sorted_variant_ids,
+            alt_seq_name_suffix=alt_seq_name_suffix
+        )
+
+
+class _IntervalArray():
+    """
+    Sorted-array interval index for the transcript parts of a single genomic sequence.
+
+    Intervals are sorted by start position. Overlap queries bisect the start positions
+    and only scan the intervals starting within `max_length` of the query region.
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int, int, int]]):
+        """
+        Args:
+            intervals: list of (start, end, transcript index, part index) tuples,\
+                       where part index is the exon index for exons and -1 for CDS parts.
+        """
+        intervals.sort()
+
+        self.starts = array('l', [interval[0] for interval in intervals])
+        self.ends = array('l', [interval[1] for interval in intervals])
+        self.transcript_idx = array('l', [interval[2] for interval in intervals])
+        self.part_idx = array('l', [interval[3] for interval in intervals])
+        self.max_length = max((end - start + 1 for start, end, _, _ in intervals), default=0)
+
+    def overlapping(self, start: int, end: int) -> Iterator[int]:
+        """
+        Find all intervals overlapping the region `start`..`end` (1-based, inclusive).
+
+        Returns:
+            Iterator of indices of all overlapping intervals.
+        """
+        first = bisect_left(self.starts, start - self.max_length + 1)
+        last = bisect_right(self.starts, end)
+        for index in range(first, last):
+            if self.ends[index] >= start:
+                yield index
+
+
+def _parse_gff3_attributes(attributes_column: str) -> Dict[str, str]:
+    """
+    Parse the attributes column of a GFF3 feature line into a dict (values are returned unparsed).
+    """
+    attributes: Dict[str, str] = {}
+    for attribute in attributes_column.strip().split(';'):
+        if '=' in attribute:
+            key, value = attribute.split('=', 1)
+            attributes[key] = value
+    return attributes
+
+
+def _read_gff3_feature_lines(gff3_file: str) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Read all feature lines from a GFF3 file (optionally gzip-compressed), skipping comments, directives and any embedded FASTA.
+
+    Returns:
+        Iterator of (line number, feature columns) tuples.
+
+    Raises:
+        ValueError: if a feature line does not have 9 columns.
+    """
+    file_handle: IO[str]
+    if gff3_file.endswith('.gz'):
+        file_handle = gzip.open(gff3_file, 'rt')
+    else:
+        file_handle = open(gff3_file, 'r')
+
+    with file_handle:
+        for line_number, line in enumerate(file_handle, start=1):
+            if line.startswith('##FASTA'):
+                break
+            if line.startswith('#') or line.strip() == '':
+                continue
+
+            columns = line.rstrip('\n').split('\t')
+            if len(columns) != 9:
+                raise ValueError(f"Invalid GFF3 feature line {line_number} in '{gff3_file}': expected 9 columns, found {len(columns)}.")
+
+            yield line_number, columns
+
+
+class TranscriptIndex():
+    """
+    Genome-wide index of transcripts and their exon and CDS parts, used to map variants to the transcripts they affect.
+    """
+
+    transcripts: List[Transcript]
+    """All indexed transcripts"""
+
+    def __init__(self, transcripts: Iterable[Transcript]):
+        """
+        Initializes a TranscriptIndex instance.
+
+        Args:
+            transcripts: Transcripts to index. Transcripts without exons are not indexed.
+        """
+        self.transcripts = []
+        self._transcript_lookup: Dict[str, int] = {}
+
+        intervals: Dict[str, List[Tuple[int, int, int, int]]] = {}
+        for transcript in transcripts:
+            if len(transcript.exon_regions) == 0:
+                logger.debug(f'Skipping transcript {transcript.transcript_id} without exons.')
+                continue
+
+            transcript.sort_regions()
+            transcript_index = len(self.transcripts)
+            self.transcripts.append(transcript)
+            self._transcript_lookup[transcript.transcript_id] = transcript_index
+
+            seq_intervals = intervals.setdefault(transcript.seq_id, [])
+            for exon_index, (start, end) in enumerate(transcript.exon_regions):
+                seq_intervals.append((start, end, transcript_index, exon_index))
+            for start, end, _ in transcript.cds_regions:
+                seq_intervals.append((start, end, transcript_index, -1))
+
+        self._seq_indices: Dict[str, _IntervalArray] = {seq_id: _IntervalArray(seq_intervals) for seq_id, seq_intervals in intervals.items()}
+
+    def __len__(self) -> int:
+        return len(self.transcripts)
+
+    def get_transcript(self, transcript_id: str) -> Transcript:
+        """
+        Get an indexed transcript by ID.
+
+        Raises:
+            KeyError: if no transcript with ID `transcript_id` is indexed.
+        """
+        return self.transcripts[self._transcript_lookup[transcript_id]]
+
+    @classmethod
+    def from_gff3(cls, gff3_file: str) -> 'TranscriptIndex':
+        """
+        Build a TranscriptIndex from a local GFF3 file (optionally gzip-compressed).
+
+        All features with exon or CDS child features are indexed as transcripts.
+        Gene names are taken from the `Name` attribute of the transcripts' parent features.
+
+        Args:
+            gff3_file: path to the GFF3 file to read (files ending in `.gz` are read as gzip-compressed)
+
+        Returns:
+            TranscriptIndex of all transcripts found in the GFF3 file.
+
+        Raises:
+            FileNotFoundError: if `gff3_file` does not exist.
+            ValueError: if a feature line in `gff3_file` does not have 9 columns, or has invalid positions.
+        """
+        if not path.isfile(gff3_file):
+            raise FileNotFoundError(f"No file found at path '{gff3_file}'.")
+
+        # Attributes of (non-part) features, indexed by ID: (type, name, parent ID)
+        features: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {}
+        # Transcript parts, indexed by parent ID
+        exons: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        cdss: Dict[str, List[Tuple[int, int, int]]] = {}
+
+        for line_number, columns in _read_gff3_feature_lines(gff3_file):
+            seq_id, _, feature_type, start_column, end_column, _, strand, phase, attributes_column = columns
+            attributes = _parse_gff3_attributes(attributes_column)
+
+            try:
+                start = int(start_column)
+                end = int(end_column)
+            except ValueError:
+                raise ValueError(f"Invalid positions on GFF3 feature line {line_number} in '{gff3_file}'.")
+
+            if feature_type in TRANSCRIPT_PART_TYPES:
+                for parent_id in attributes.get('Parent', '').split(','):
+                    if not parent_id:
+                        continue
+                    parent_id = unquote(parent_id)
+                    if feature_type == 'exon':
+                        exons.setdefault(parent_id, []).append((seq_id, strand, start, end))
+                    else:
+                        cdss.setdefault(parent_id, []).append((start, end, int(phase) if phase.isdigit() else 0))
+            elif 'ID' in attributes:
+                name = unquote(attributes['Name']) if 'Name' in attributes else None
+                parent = unquote(attributes['Parent'].split(',')[0]) if 'Parent' in attributes else None
+                features[unquote(attributes['ID'])] = (feature_type, name, parent)
+
+        transcripts: List[Transcript] = []
+        for transcript_id, transcript_exons in exons.items():
+            seq_id, strand = transcript_exons[0][0], transcript_exons[0][1]
+            transcript_strand: Literal['+', '-']
+            if strand == '+':
+                transcript_strand = '+'
+            elif strand == '-':
+                transcript_strand = '-'
+            else:
+                logger.warning(f'Skipping transcript {transcript_id} with unsupported strand "{strand}".')
+                continue
+
+            transcript_name: Optional[str] = None
+            gene_name: Optional[str] = None
+            if transcript_id in features:
+                _, transcript_name, gene_id = features[transcript_id]
+                if gene_id is not None and gene_id in features:
+                    gene_name = features[gene_id][1]
+
+            transcript = Transcript(transcript_id=transcript_id, seq_id=seq_id, strand=transcript_strand,
+                                    name=transcript_name, gene_name=gene_name)
+            transcript.exon_regions = [(start, end) for _, _, start, end in transcript_exons]
+            transcript.cds_regions = cdss.get(transcript_id, [])
+            transcripts.append(transcript)
+
+        return cls(transcripts)
+
+    def map_variant(self, variant: Variant) -> List[TranscriptOverlap]:
+        """
+        Find all transcripts with exons overlapped by a variant.
+
+        Insertions are mapped to all exons containing either of the insertion site's flanking bases.
+
+        Args:
+            variant: the variant to map
+
+        Returns:
+            List of transcript overlaps, in order of transcript indexing.
+        """
+        seq_index = self._seq_indices.get(variant.genomic_seq_id)
+        if seq_index is None:
+            return []
+
+        exon_numbers: Dict[int, List[int]] = {}
+        in_cds: Dict[int, bool] = {}
+        for index in seq_index.overlapping(variant.genomic_start_pos, variant.genomic_end_pos):
+            transcript_index = seq_index.transcript_idx[index]
+            part_index = seq_index.part_idx[index]
+            if part_index < 0:
+                in_cds[transcript_index] = True
+            else:
+                exon_numbers.setdefault(transcript_index, []).append(part_index + 1)
+
+        return [TranscriptOverlap(transcript_id=self.transcripts[transcript_index].transcript_id,
+                                  exon_numbers=sorted(exon_numbers[transcript_index]),
+                                  in_cds=in_cds.get(transcript_index, False))
+                for transcript_index in sorted(exon_numbers.keys())]
+
+    def map_variants(self, variants: Iterable[Variant]) -> Dict[str, List[TranscriptOverlap]]:
+        """
+        Find all transcripts with exons overlapped by each of a batch of variants.
+
+        Args:
+            variants: the variants to map
+
+        Returns:
+            Dict of transcript overlaps lists (see `map_variant`), indexed by variant ID.
+        """
+        return {variant.variant_id: self.map_variant(variant) for variant in variants}
+
+    def pipeline_seq_regions(self, variants: Iterable[Variant], fasta_file_url: str,
+                             alt_seq_name_suffix: str = '_alt') -> List[PipelineSeqRegionDict]:
+        """
+        Generate pipeline input entries for all transcripts affected by a batch of variants.
+
+        Args:
+            variants: the variants to map
+            fasta_file_url: URL to the (faidx-indexed) fasta file to retrieve the sequences from
+            alt_seq_name_suffix: suffix to use for naming the alternative sequences
+
+        Returns:
+            List of pipeline input entries, one per affected transcript (in order of transcript indexing),
+            each defining all variants that overlap the exons of that transcript.
+        """
+        transcript_variants: Dict[str, List[str]] = {}
+        for variant in variants:
+            for overlap in self.map_variant(variant):
+                transcript_variants.setdefault(overlap['transcript_id'], []).append(variant.variant_id)
+
+        return [self.get_transcript(transcript_id).to_pipeline_seq_region(fasta_file_url=fasta_file_url,
+                                                                          variant_ids=variant_ids,
+                                                                          alt_seq_name_suffix=alt_seq_name_suffix)
+                for transcript_id, variant_ids in sorted(transcript_variants.items(), key=lambda item: self._transcript_lookup[item[0]])]
@@ -1,3 +1,3 @@
 from .variant import SeqSubstitutionType, Variant, variants_overlap
 from .seq_embedded_variant import SeqEmbeddedVariant, SeqEmbeddedVariantsList
-from .alignment_embedded_variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList
+from .alignment_embedded_variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, AlignmentPositionIndex
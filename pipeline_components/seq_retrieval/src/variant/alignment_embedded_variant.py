@@ -1,5 +1,7 @@
 from Bio.SeqRecord import SeqRecord
-from typing import Any, Iterable, override, Optional
+import numpy as np
+import numpy.typing as npt
+from typing import Any, Iterable, List, override, Optional, Sequence, Tuple
 
 from .seq_embedded_variant import SeqEmbeddedVariant
 
@@ -11,20 +13,33 @@ class AlignmentEmbeddedVariant(SeqEmbeddedVariant):
     Contains additional properties related to the embedding into the alignment (gapped sequence).
     """
 
+    __slots__ = ('alignment_start_pos', 'alignment_end_pos')
+
     alignment_start_pos: int
     """The relative start position of the variant in the alignment sequence (1-based)."""
     alignment_end_pos: int
     """The relative end position of the variant in the alignment sequence (1-based)."""
 
-    def __init__(self, embedded_variant: SeqEmbeddedVariant, alignment_record: Optional[SeqRecord] = None, alignment_start_pos: Optional[int] = None, alignment_end_pos: Optional[int] = None):
-        self.__dict__.update(vars(embedded_variant))
+    def __init__(self, embedded_variant: SeqEmbeddedVariant, alignment_record: Optional[SeqRecord] = None, alignment_start_pos: Optional[int] = None, alignment_end_pos: Optional[int] = None,
+                 alignment_index: Optional['AlignmentPositionIndex'] = None):
+        """
+        Initializes an AlignmentEmbeddedVariant instance.
+
+        Alignment positions are either provided explicitly, or converted from the embedded variant's sequence positions
+        using `alignment_index` or `alignment_record`. When embedding multiple variants into the same alignment record,
+        build its AlignmentPositionIndex once and provide it as `alignment_index`.
+        """
+        self.copy_slots_from(embedded_variant)
+
+        if alignment_index is None and alignment_record is not None:
+            alignment_index = AlignmentPositionIndex(alignment_record)
 
-        if alignment_record is not None:
-            self.alignment_start_pos = seq_to_alignment_position(alignment_record, embedded_variant.seq_start_pos)
-            self.alignment_end_pos = seq_to_alignment_position(alignment_record, embedded_variant.seq_end_pos)
+        if alignment_index is not None:
+            self.alignment_start_pos = alignment_index.alignment_position(embedded_variant.seq_start_pos)
+            self.alignment_end_pos = alignment_index.alignment_position(embedded_variant.seq_end_pos)
         else:
             if alignment_start_pos is None or alignment_end_pos is None:
-                raise ValueError('alignment_record or (alignment_start_pos and alignment_end_pos) must be provided')
+                raise ValueError('alignment_record, alignment_index or (alignment_start_pos and alignment_end_pos) must be provided')
             self.alignment_start_pos = alignment_start_pos
             self.alignment_end_pos = alignment_end_pos
 
@@ -61,11 +76,139 @@ class AlignmentEmbeddedVariantsList(list[AlignmentEmbeddedVariant]):
                 raise TypeError(f"Expected AlignmentEmbeddedVariant, got {type(item)}")
         super().__init__(iterable)
 
+    @classmethod
+    def from_embedded_variants(cls, embedded_variants: Iterable[SeqEmbeddedVariant],
+                               alignment_index: 'AlignmentPositionIndex') -> 'AlignmentEmbeddedVariantsList':
+        """
+        Embed all `embedded_variants` of a sequence into its alignment record.
+
+        The start and end positions of all variants are converted in one batch (see `AlignmentPositionIndex.alignment_positions`),
+        rather than one lookup per variant position.
+
+        Args:
+            embedded_variants: variants embedded in the (ungapped) sequence of the alignment record
+            alignment_index: AlignmentPositionIndex of the alignment record
+
+        Returns:
+            AlignmentEmbeddedVariantsList, holding an AlignmentEmbeddedVariant for every variant in `embedded_variants` (in the same order).
+
+        Raises:
+            `ValueError`: if any of the variant positions is out of bounds of the alignment record's sequence.
+        """
+        embedded_variants = list(embedded_variants)
+        alignment_positions = alignment_index.alignment_positions([variant.seq_start_pos for variant in embedded_variants]
+                                                                  + [variant.seq_end_pos for variant in embedded_variants])
+
+        variant_count = len(embedded_variants)
+        return cls([AlignmentEmbeddedVariant(variant, alignment_start_pos=start_pos, alignment_end_pos=end_pos)
+                    for variant, start_pos, end_pos in zip(embedded_variants, alignment_positions[:variant_count], alignment_positions[variant_count:])])
+
+
+class AlignmentPositionIndex():
+    """
+    Index of the alignment positions of all sequence positions of an alignment record.
+
+    Built once per alignment record (in a single vectorized pass over the gapped sequence),
+    after which every sequence position is converted in O(1), with results identical to `seq_to_alignment_position`.
+    """
+
+    record_id: str
+    """ID of the indexed alignment record."""
+    no_gap_seq_len: int
+    """The ungapped sequence length of the indexed alignment record."""
+
+    def __init__(self, seq_record: SeqRecord | Tuple[str, str]):
+        """
+        Initializes an AlignmentPositionIndex instance.
+
+        Args:
+            seq_record: Alignment sequence record to index, as SeqRecord or as (record ID, gapped sequence) tuple.
+
+        Raises:
+            `ValueError`: if `seq_record` has no sequence.
+        """
+        if isinstance(seq_record, tuple):
+            self.record_id, gapped_seq = seq_record
+        else:
+            if seq_record.seq is None:
+                raise ValueError(f"Sequence record '{seq_record.id}' has no sequence.")
+            self.record_id = str(seq_record.id)
+            gapped_seq = str(seq_record.seq)
+
+        # One code point per array element, so positions match string indices for any character
+        residue_mask = np.frombuffer(gapped_seq.encode('utf-32-le'), dtype=np.uint32) != ord('-')
+
+        # Alignment positions (1-based) of sequence positions 1 to no_gap_seq_len
+        residue_positions = np.flatnonzero(residue_mask) + 1
+        self.no_gap_seq_len = len(residue_positions)
+
+        # Position 1 beyond the end of the sequence converts to the last residue's alignment position,
+        # +1 if a trailing gap is present (the first alignment position for sequences without residues).
+        last_residue_pos = int(residue_positions[-1]) if self.no_gap_seq_len > 0 else 1
+        end_pos = min(len(gapped_seq), last_residue_pos + 1)
+
+        self._alignment_positions: npt.NDArray[np.int64] = np.append(residue_positions, end_pos).astype(np.int64)
+
+    def alignment_position(self, pos: int) -> int:
+        """
+        Convert a sequence position to its corresponding alignment position.
+
+        Args:
+            pos: Sequence position to be converted.
+
+        Returns:
+            Alignment position of the sequence record.
+
+        Raises:
+            `ValueError`: if `pos` is out of bounds (< 1 or > (ungapped sequence length + 1)).
+        """
+        self._check_bounds(pos)
+
+        return int(self._alignment_positions[pos - 1])
+
+    def alignment_positions(self, positions: Sequence[int]) -> List[int]:
+        """
+        Convert multiple sequence positions (e.g. of all variants embedded in the record) to their alignment positions,
+        bounds-checking and looking up all positions in one vectorized operation.
+
+        Args:
+            positions: Sequence positions to be converted (in any order).
+
+        Returns:
+            Alignment positions of the sequence record, in `positions` order (identical to `alignment_position` for each position).
+
+        Raises:
+            `ValueError`: if any position is out of bounds (< 1 or > (ungapped sequence length + 1)).
+        """
+        if len(positions) == 0:
+            return []
+
+        pos_array = np.asarray(positions, dtype=np.int64)
+        out_of_bounds = (pos_array < 1) | (pos_array > self.no_gap_seq_len + 1)
+        if out_of_bounds.any():
+            self._check_bounds(int(pos_array[np.argmax(out_of_bounds)]))
+
+        alignment_positions: List[int] = self._alignment_positions[pos_array - 1].tolist()
+        return alignment_positions
+
+    def _check_bounds(self, pos: int) -> None:
+        """
+        Raises:
+            `ValueError`: if `pos` is out of bounds (< 1 or > (ungapped sequence length + 1)).
+        """
+        if pos < 1:
+            raise ValueError(f"Out of bounds: sequence position ({pos}) before start of sequence.")
+        elif pos > (self.no_gap_seq_len + 1):
+            raise ValueError(f"Out of bounds: sequence position ({pos}) after end of sequence (({self.no_gap_seq_len})+1).")
+
 
 def seq_to_alignment_position(seq_record: SeqRecord, pos: int) -> int:
     """
     Convert a sequence position to its corresponding alignment position.
 
+    Scans the alignment sequence up to `pos`, use an AlignmentPositionIndex
+    to convert multiple positions of the same sequence record.
+
     Args:
         seq: Alignment sequence record to generate relative position for.
         pos: Sequence position to be converted.
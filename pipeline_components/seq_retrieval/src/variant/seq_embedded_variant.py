@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy
 from math import ceil
 from typing import Any, Iterable, override
 
@@ -12,6 +12,8 @@ class SeqEmbeddedVariant(Variant):
     Contains additional properties related to the embedding into the sequence.
     """
 
+    __slots__ = ('seq_start_pos', 'seq_end_pos', 'embedded_ref_seq_len', 'embedded_alt_seq_len')
+
     seq_start_pos: int
     """The relative start position of the variant in the sequence (1-based)."""
     seq_end_pos: int
@@ -22,7 +24,7 @@ class SeqEmbeddedVariant(Variant):
     """The length of the variant's reference sequence portion embedded in the sequence."""
 
     def __init__(self, variant: 'Variant', seq_start_pos: int, seq_end_pos: int, embedded_ref_seq_len: int, embedded_alt_seq_len: int):
-        self.__dict__.update(vars(variant))
+        self.copy_slots_from(variant)
         self.seq_start_pos = seq_start_pos
         self.seq_end_pos = seq_end_pos
         self.embedded_ref_seq_len = embedded_ref_seq_len
@@ -82,7 +84,7 @@ class SeqEmbeddedVariant(Variant):
         if not (other.seq_start_pos == 1 or (self.seq_substitution_type == SeqSubstitutionType.DELETION and other.seq_start_pos == 0)):
             raise ValueError(f'`other` SeqEmbeddedVariant must start at the start of its sequence to be fusable ({other.seq_start_pos} is not a start position for substitution type {self.seq_substitution_type}).')
 
-        fused_seq_embedded_variant: SeqEmbeddedVariant = deepcopy(self)
+        fused_seq_embedded_variant: SeqEmbeddedVariant = copy(self)
 
         fused_seq_embedded_variant.seq_end_pos += other.seq_end_pos
         fused_seq_embedded_variant.embedded_ref_seq_len += other.embedded_ref_seq_len
@@ -162,7 +164,7 @@ class SeqEmbeddedVariant(Variant):
         else:
             raise ValueError(f"Unsupported substitution type: {self.seq_substitution_type}")
 
-        translated_seq_embedded_variant: SeqEmbeddedVariant = deepcopy(self)
+        translated_seq_embedded_variant: SeqEmbeddedVariant = copy(self)
         translated_seq_embedded_variant.seq_start_pos = translated_start_pos
         translated_seq_embedded_variant.seq_end_pos = translated_end_pos
         translated_seq_embedded_variant.embedded_ref_seq_len = translate_seq_position(self.embedded_ref_seq_len)
@@ -214,8 +216,10 @@ class SeqEmbeddedVariantsList(list[SeqEmbeddedVariant]):
                 del list_copy[index]
             elif embedded_variant.seq_end_pos > trim_end:
                 # Embedded variant partially outside of in-frame window
-                # Trim seq_end_pos to trim_end
-                embedded_variant.seq_end_pos = trim_end
+                # Trim seq_end_pos to trim_end (on a copy, to leave the input list's variants untouched)
+                trimmed_variant = copy(embedded_variant)
+                trimmed_variant.seq_end_pos = trim_end
+                list_copy[index] = trimmed_variant
             else:
                 # Embedded variant is fully within in-frame window
                 continue
@@ -6,7 +6,7 @@ from enum import Enum
 
 import requests
 
-from typing import Any, List, Optional, override, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, override, Self, TYPE_CHECKING
 from log_mgmt import get_logger
 
 # Only import on type-checking to prevent circular dependency at runtime
@@ -31,8 +31,14 @@ class SeqSubstitutionType(Enum):
 class Variant():
     """
     Defines a sequence region variant.
+
+    Uses `__slots__` to keep per-instance memory low, as jobs can hold thousands of (embedded) variants.
+    Attributes are in practice immutable once set, so (embedded) variant copies can safely share their values.
     """
 
+    __slots__ = ('variant_id', 'genomic_seq_id', 'genomic_start_pos', 'genomic_end_pos', 'seq_length',
+                 'genomic_ref_seq', 'genomic_alt_seq', 'seq_substitution_type')
+
     variant_id: str
     """ID of the variant"""
 
@@ -45,6 +51,9 @@ class Variant():
     genomic_end_pos: int
     """Genomic end position of the variant (1-based, inclusive)"""
 
+    seq_length: int
+    """Genomic length of the variant (end - start + 1)"""
+
     genomic_ref_seq: str
     """Genomic reference sequence of the variant"""
 
@@ -97,6 +106,48 @@ class Variant():
         self.genomic_alt_seq = genomic_alt_seq or ""
         self.seq_substitution_type = substitution_type
 
+    @override
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Return the state of the (slotted) object as a dict, for pickling, copying and serialization.
+
+        Attributes are ordered from base class to subclass, in slot definition order.
+        """
+        state: dict[str, Any] = {}
+        for attr in all_slots(type(self)):
+            if hasattr(self, attr):
+                state[attr] = getattr(self, attr)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def __copy__(self) -> Self:
+        """
+        Return a shallow copy of the object.
+
+        Attribute values are shared with the original, which is safe as they are immutable (str, int or enum).
+        Attributes that are changed on the copy afterwards do not affect the original (copy-on-write).
+        """
+        object_copy = self.__class__.__new__(self.__class__)
+        object_copy.copy_slots_from(self)
+        return object_copy
+
+    def copy_slots_from(self, other: 'Variant') -> None:
+        """
+        Copy all attributes defined on `other` (and shared with `self`'s class) onto `self`.
+
+        Values are shared rather than copied, which is safe as they are immutable (str, int or enum).
+
+        Args:
+            other: Variant (or subclass) instance to copy the attributes from.
+        """
+        own_slots = set(all_slots(type(self)))
+        for attr in all_slots(type(other)):
+            if attr in own_slots and hasattr(other, attr):
+                setattr(self, attr, getattr(other, attr))
+
     @classmethod
     def from_dict(cls, variant_dict: dict[str, Any]) -> 'Variant':
         if 'variant_id' not in variant_dict:
@@ -230,6 +281,28 @@ class Variant():
         return overlaps
 
 
+_all_slots_cache: Dict[type, List[str]] = {}
+"""Module level cache of `all_slots` results, indexed by class."""
+
+
+def all_slots(cls: type) -> List[str]:
+    """
+    List all `__slots__` attribute names defined on a class and its base classes.
+
+    Args:
+        cls: the class to list slots for.
+
+    Returns:
+        List of attribute names, ordered from base class to subclass (cached per class, do not modify).
+    """
+    if cls not in _all_slots_cache:
+        slots: List[str] = []
+        for klass in reversed(cls.__mro__):
+            slots.extend(klass.__dict__.get('__slots__', ()))
+        _all_slots_cache[cls] = slots
+    return _all_slots_cache[cls]
+
+
 def variants_overlap(variants: List[Variant]) -> bool:
     """
     Checks if any two Variants in a list overlap.
@@ -0,0 +1,64 @@
+"""
+Unit testing for the streaming alignment parsers
+"""
+from io import StringIO
+
+from Bio import AlignIO
+import pytest
+
+from alignment_io import detect_alignment_format, parse_aligned_fasta, parse_alignment, parse_clustal
+
+ALIGNMENT_RESULT_FILE = '../../tests/resources/submit-workflow-success-output.aln'
+
+
+@pytest.fixture
+def biopython_alignment_rows() -> list[tuple[str, str]]:
+    """Alignment rows of the alignment result file, as parsed by Biopython."""
+    return [(str(record.id), str(record.seq)) for record in AlignIO.read(ALIGNMENT_RESULT_FILE, 'clustal')]
+
+
+def test_parse_clustal(biopython_alignment_rows) -> None:
+    assert list(parse_alignment(ALIGNMENT_RESULT_FILE)) == biopython_alignment_rows
+    assert list(parse_alignment(ALIGNMENT_RESULT_FILE, alignment_format='clustal')) == biopython_alignment_rows
+
+
+def test_parse_aligned_fasta(biopython_alignment_rows, tmp_path) -> None:
+    fasta_file_path = str(tmp_path / 'alignment.fa')
+    AlignIO.write(AlignIO.read(ALIGNMENT_RESULT_FILE, 'clustal'), fasta_file_path, 'fasta')
+
+    assert list(parse_alignment(fasta_file_path)) == biopython_alignment_rows
+
+
+def test_parse_aligned_fasta_streaming() -> None:
+    alignment_rows = parse_aligned_fasta(StringIO('>seq_1 description\nMK-\nL\n>seq_2\nM--K\n>seq_3\nMKL'))
+
+    # Rows are yielded as soon as they are read, so invalid rows only fail when reached
+    assert next(alignment_rows) == ('seq_1', 'MK-L')
+    assert next(alignment_rows) == ('seq_2', 'M--K')
+    with pytest.raises(ValueError, match='length'):
+        next(alignment_rows)
+
+
+def test_detect_alignment_format() -> None:
+    alignment_file = StringIO('\n>seq_1\nMKL\n')
+    assert detect_alignment_format(alignment_file) == 'fasta'
+    assert alignment_file.tell() == 0
+
+    assert detect_alignment_format(StringIO('CLUSTAL O(1.2.4) multiple sequence alignment\n')) == 'clustal'
+    with pytest.raises(ValueError):
+        detect_alignment_format(StringIO('# STOCKHOLM 1.0\n'))
+
+
+@pytest.mark.parametrize('clustal_content', [
+    # Missing header
+    'seq_1  MK\nseq_2  ML\n',
+    # Row missing from second block
+    'CLUSTAL W\n\nseq_1  MK\nseq_2  ML\n       *\n\nseq_1  L-\n',
+    # Duplicate row in block
+    'CLUSTAL W\n\nseq_1  MK\nseq_1  ML\n',
+    # Rows of different lengths
+    'CLUSTAL W\n\nseq_1  MK 2\nseq_2  MLK 3\n',
+])
+def test_parse_clustal_errors(clustal_content: str) -> None:
+    with pytest.raises(ValueError):
+        list(parse_clustal(StringIO(clustal_content)))
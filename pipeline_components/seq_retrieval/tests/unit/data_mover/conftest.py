@@ -0,0 +1 @@
+from .fixtures.http_server import *  # noqa: F401, F403
@@ -0,0 +1,164 @@
+"""
+Local HTTP server fixtures for unit testing remote file access
+"""
+
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional, override
+
+import pysam
+import pytest
+
+
+class RecordingHTTPServer(ThreadingHTTPServer):
+    """HTTP server recording all requests received, with toggleable support for range requests."""
+
+    request_log: List[Dict[str, Optional[str]]]
+    """Method, path, Range and If-Modified-Since headers of all requests received"""
+
+    range_support: bool
+    """When False, Range headers are ignored and complete files are returned"""
+
+    response_delay: float
+    """Delay (seconds) before responding to GET requests, to simulate slow transfers"""
+
+    access_check: Optional[Callable[[BaseHTTPRequestHandler], Optional[int]]]
+    """Optional check of every request, returning the error status to respond with (None to serve the request)"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.request_log = []
+        self.range_support = True
+        self.response_delay = 0
+        self.access_check = None
+        self.log_lock = threading.Lock()
+
+    def url(self, filename: str) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/{filename}'
+
+    def range_requests(self, filename: str) -> List[str]:
+        """Return the Range headers of all GET requests received for `filename`."""
+        return [str(request['range']) for request in self.request_log
+                if request['method'] == 'GET' and request['path'] == f'/{filename}' and request['range'] is not None]
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file request handler adding support for (single) byte range requests."""
+
+    server: RecordingHTTPServer
+
+    @override
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: U100
+        pass
+
+    @override
+    def end_headers(self) -> None:
+        if self.server.range_support:
+            self.send_header('Accept-Ranges', 'bytes')
+        super().end_headers()
+
+    def _record_request(self) -> None:
+        with self.server.log_lock:
+            self.server.request_log.append(dict(method=self.command, path=self.path, range=self.headers.get('Range'),
+                                                if_modified_since=self.headers.get('If-Modified-Since')))
+
+    def _denied(self) -> bool:
+        """Respond with an error when the request is denied by the server's `access_check`."""
+        error_status = self.server.access_check(self) if self.server.access_check is not None else None
+        if error_status is not None:
+            self.send_error(error_status)
+            return True
+        return False
+
+    @override
+    def do_HEAD(self) -> None:
+        self._record_request()
+        if self._denied():
+            return
+        super().do_HEAD()
+
+    @override
+    def do_GET(self) -> None:
+        self._record_request()
+        if self._denied():
+            return
+        time.sleep(self.server.response_delay)
+
+        range_match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        file_path = self.translate_path(self.path)
+        if not self.server.range_support or range_match is None or not os.path.isfile(file_path):
+            super().do_GET()
+            return
+
+        file_size = os.path.getsize(file_path)
+        start = int(range_match.group(1))
+        end = int(range_match.group(2)) if range_match.group(2) else file_size - 1
+        end = min(end, file_size - 1)
+        if start >= file_size:
+            self.send_error(416)
+            return
+
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            content = f.read(end - start + 1)
+
+        self.send_response(206)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Range', f'bytes {start}-{end}/{file_size}')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Last-Modified', self.date_time_string(int(os.path.getmtime(file_path))))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def http_server_dir(tmp_path) -> str:
+    """Directory served by the `http_server` fixture."""
+    served_dir = tmp_path / 'served'
+    served_dir.mkdir()
+    return str(served_dir)
+
+
+@pytest.fixture
+def http_server(http_server_dir: str) -> Generator[RecordingHTTPServer, None, None]:
+    """Local HTTP server serving all files in `http_server_dir` (with range request support)."""
+    server = RecordingHTTPServer(('127.0.0.1', 0), partial(RangeRequestHandler, directory=http_server_dir))
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def synthetic_fasta_files(http_server_dir: str) -> Dict[str, str]:
+    """
+    Synthetic multi-block fasta file, written to `http_server_dir` both uncompressed and BGZF-compressed (with faidx indices).
+
+    Returns:
+        Dict with the filenames of the uncompressed ('plain') and compressed ('bgzip') fasta files.
+    """
+    random.seed(42)
+    sequences = {'I': ''.join(random.choice('ACGTacgt') for _ in range(150000)),
+                 'II': ''.join(random.choice('ACGT') for _ in range(90001))}
+
+    plain_path = os.path.join(http_server_dir, 'synthetic.fa')
+    with open(plain_path, 'w') as fasta_file:
+        for name, sequence in sequences.items():
+            fasta_file.write(f'>{name}\n')
+            for line_start in range(0, len(sequence), 60):
+                fasta_file.write(sequence[line_start:line_start + 60] + '\n')
+    pysam.faidx(plain_path)
+
+    bgzip_path = plain_path + '.gz'
+    pysam.tabix_compress(plain_path, bgzip_path, force=True)
+    pysam.faidx(bgzip_path)
+
+    return {'plain': 'synthetic.fa', 'bgzip': 'synthetic.fa.gz'}
@@ -0,0 +1,119 @@
+"""
+Unit testing for cache_manifest module and validated local file cache reuse
+"""
+
+import os
+from typing import Generator
+
+import pytest
+
+from data_mover import data_file_mover
+from data_mover.cache_manifest import file_md5, read_entry, remove_entry
+from data_mover.data_file_mover import fetch_file
+
+from .fixtures.http_server import RecordingHTTPServer
+
+FILENAME = 'cached.txt'
+
+
+@pytest.fixture
+def served_file(http_server_dir: str) -> str:
+    served_path = os.path.join(http_server_dir, FILENAME)
+    with open(served_path, 'w') as served_file:
+        served_file.write('ACGT' * 1000)
+    os.utime(served_path, (1_600_000_000, 1_600_000_000))
+    return served_path
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache() -> Generator[None, None, None]:
+    data_file_mover._stored_files.clear()
+    yield
+    data_file_mover._stored_files.clear()
+
+
+def file_gets(http_server: RecordingHTTPServer) -> int:
+    return len([request for request in http_server.request_log if request['method'] == 'GET' and request['path'] == f'/{FILENAME}'])
+
+
+def test_manifest_entry_recorded(http_server: RecordingHTTPServer, served_file: str, tmp_path) -> None:
+    local_path = fetch_file(http_server.url(FILENAME), dest_dir=str(tmp_path))
+
+    entry = read_entry(local_path)
+    assert entry is not None
+    assert entry['url'] == http_server.url(FILENAME)
+    assert entry['size'] == os.path.getsize(served_file)
+    assert entry['md5'] == file_md5(served_file)
+    assert entry['last_modified'] is not None
+
+
+def test_validated_cache_reuse(http_server: RecordingHTTPServer, served_file: str, tmp_path) -> None:
+    url = http_server.url(FILENAME)
+    local_path = fetch_file(url, dest_dir=str(tmp_path))
+    assert file_gets(http_server) == 1
+    download_mtime = os.path.getmtime(local_path)
+
+    # Unmodified remote file: a single conditional request (304), no re-download
+    data_file_mover._stored_files.clear()
+    assert fetch_file(url, dest_dir=str(tmp_path)) == local_path
+    assert file_gets(http_server) == 2
+    assert os.path.getmtime(local_path) == download_mtime
+
+    # Modified remote file: stale local file gets refreshed
+    with open(served_file, 'w') as f:
+        f.write('TTTT' * 500)
+    data_file_mover._stored_files.clear()
+    assert fetch_file(url, dest_dir=str(tmp_path)) == local_path
+    with open(local_path, 'r') as f:
+        assert f.read() == 'TTTT' * 500
+
+
+def test_unvalidated_cache_refreshed(http_server: RecordingHTTPServer, served_file: str, tmp_path) -> None:
+    url = http_server.url(FILENAME)
+    local_path = fetch_file(url, dest_dir=str(tmp_path))
+
+    # Local file without manifest entry cannot be validated and gets re-downloaded
+    remove_entry(local_path)
+    data_file_mover._stored_files.clear()
+    fetch_file(url, dest_dir=str(tmp_path))
+    assert read_entry(local_path) is not None
+    assert http_server.range_requests(FILENAME) == ['bytes=0-', 'bytes=0-']
+    assert file_gets(http_server) == 2
+
+    # Local file not matching the size recorded gets re-downloaded
+    with open(local_path, 'a') as f:
+        f.write('truncated or corrupted')
+    data_file_mover._stored_files.clear()
+    fetch_file(url, dest_dir=str(tmp_path))
+    assert os.path.getsize(local_path) == os.path.getsize(served_file)
+
+
+@pytest.mark.usefixtures('served_file')
+@pytest.mark.parametrize('cache_policy,expected_gets', [('trust', 1), ('refresh', 2)])
+def test_cache_policy_override(http_server: RecordingHTTPServer, tmp_path,
+                               cache_policy: data_file_mover.CACHE_POLICY_TYPE, expected_gets: int) -> None:
+    url = http_server.url(FILENAME)
+    fetch_file(url, dest_dir=str(tmp_path))
+
+    data_file_mover._stored_files.clear()
+    fetch_file(url, dest_dir=str(tmp_path), cache_policy=cache_policy)
+    assert file_gets(http_server) == expected_gets
+
+    with pytest.raises(ValueError):
+        data_file_mover.set_local_cache_policy('always')  # type: ignore[arg-type]
+
+
+def test_cache_reuse_expected_md5(http_server: RecordingHTTPServer, served_file: str, tmp_path) -> None:
+    url = http_server.url(FILENAME)
+    fetch_file(url, dest_dir=str(tmp_path), expected_md5=file_md5(served_file))
+
+    # Matching checksum recorded in cache manifest, reused without re-download
+    data_file_mover._stored_files.clear()
+    fetch_file(url, dest_dir=str(tmp_path), cache_policy='trust', expected_md5=file_md5(served_file))
+    assert file_gets(http_server) == 1
+
+    # Checksum not matching the one recorded, re-downloaded (and rejected)
+    data_file_mover._stored_files.clear()
+    with pytest.raises(IOError):
+        fetch_file(url, dest_dir=str(tmp_path), cache_policy='trust', expected_md5='0' * 32)
+    assert file_gets(http_server) == 2
@@ -0,0 +1,117 @@
+"""
+Unit testing for cache_store module and the cache management CLI
+"""
+
+from click.testing import CliRunner
+import os
+from typing import Generator
+
+import pytest
+
+from cache import main as cache_cli
+from data_mover import data_file_mover
+from data_mover.cache_store import cache_key, cache_path, cache_stats, list_cache_groups, parse_size, prune_cache
+from data_mover.data_file_mover import fetch_file
+
+from .fixtures.http_server import RecordingHTTPServer
+
+
+def write_cached_file(cache_dir: str, url: str, size: int, last_used: float) -> str:
+    local_path = cache_path(url, cache_dir)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    with open(local_path, 'wb') as local_file:
+        local_file.write(b'A' * size)
+    os.utime(local_path, (last_used, last_used))
+    os.utime(os.path.dirname(local_path), (last_used, last_used))
+    return local_path
+
+
+@pytest.fixture(autouse=True)
+def reset_data_file_mover() -> Generator[None, None, None]:
+    data_file_mover._stored_files.clear()
+    yield
+    data_file_mover._stored_files.clear()
+    data_file_mover.set_cache_size_budget(None)
+
+
+def test_cache_layout(tmp_path) -> None:
+    url_a = 'https://host-a.org/assemblies/genome.fa.gz'
+    url_b = 'https://host-b.org/genome.fa.gz'
+
+    # Identically named files from different URLs do not collide
+    assert os.path.basename(cache_path(url_a, str(tmp_path))) == 'genome.fa.gz'
+    assert cache_path(url_a, str(tmp_path)) != cache_path(url_b, str(tmp_path))
+
+    # Companion files are stored alongside the file they index
+    assert cache_key(url_a + '.fai') == cache_key(url_a + '.gzi') == cache_key(url_a)
+    assert cache_path(url_a + '.fai', str(tmp_path)) == cache_path(url_a, str(tmp_path)) + '.fai'
+
+
+def test_prune_cache_lru(tmp_path) -> None:
+    cache_dir = str(tmp_path)
+    for url, last_used in [('https://host.org/old.fa.gz', 1000), ('https://host.org/recent.fa.gz', 3000), ('https://host.org/mid.fa.gz', 2000)]:
+        write_cached_file(cache_dir, url, size=100, last_used=last_used)
+        write_cached_file(cache_dir, url + '.fai', size=10, last_used=last_used)
+        write_cached_file(cache_dir, url + '.gzi', size=10, last_used=last_used)
+
+    assert [group.files for group in list_cache_groups(cache_dir)][0] == ['old.fa.gz', 'old.fa.gz.fai', 'old.fa.gz.gzi']
+    assert cache_stats(cache_dir)['total_size'] == 360
+
+    # Groups in use are never evicted
+    evicted = prune_cache(cache_dir, size_budget=250, keep=[cache_key('https://host.org/old.fa.gz')])
+    assert [group.files[0] for group in evicted] == ['mid.fa.gz']
+
+    evicted = prune_cache(cache_dir, size_budget=120)
+    assert [group.files[0] for group in evicted] == ['old.fa.gz']
+    assert not os.path.exists(cache_path('https://host.org/old.fa.gz.fai', cache_dir))
+
+    stats = cache_stats(cache_dir, size_budget=120)
+    assert stats['groups'] == 1
+    assert stats['files'] == 3
+    assert stats['total_size'] == 120
+
+
+def test_fetch_file_size_budget(http_server: RecordingHTTPServer, http_server_dir: str, tmp_path) -> None:
+    cache_dir = str(tmp_path / 'cache')
+    for filename in ['first.txt', 'second.txt']:
+        with open(os.path.join(http_server_dir, filename), 'w') as served_file:
+            served_file.write('ACGT' * 250)
+
+    data_file_mover.set_cache_size_budget(1500)
+    first_path = fetch_file(http_server.url('first.txt'), dest_dir=cache_dir)
+
+    # A new process (empty memory cache) evicts the least recently used file to fit the new download
+    data_file_mover._stored_files.clear()
+    second_path = fetch_file(http_server.url('second.txt'), dest_dir=cache_dir)
+
+    assert not os.path.exists(first_path)
+    assert os.path.isfile(second_path)
+
+
+def test_cache_cli(tmp_path) -> None:
+    cache_dir = str(tmp_path)
+    write_cached_file(cache_dir, 'https://host.org/old.fa.gz', size=2 * 1024**2, last_used=1000)
+    write_cached_file(cache_dir, 'https://host.org/new.fa.gz', size=1024**2, last_used=2000)
+
+    runner = CliRunner()
+    result = runner.invoke(cache_cli, ['--cache-dir', cache_dir, 'stats', '--size-budget', '1M'])
+    assert result.exit_code == 0
+    assert 'Cached files: 2' in result.output
+    assert '300% used' in result.output
+
+    result = runner.invoke(cache_cli, ['--cache-dir', cache_dir, 'prune', '--size-budget', '1M'])
+    assert result.exit_code == 0
+    assert 'Evicted old.fa.gz' in result.output
+    assert cache_stats(cache_dir)['total_size'] == 1024**2
+
+    result = runner.invoke(cache_cli, ['--cache-dir', cache_dir, 'prune', '--size-budget', 'lots'])
+    assert result.exit_code != 0
+
+
+def test_parse_size() -> None:
+    assert parse_size('1234') == 1234
+    assert parse_size('500M') == 500 * 1024**2
+    assert parse_size('1.5GiB') == int(1.5 * 1024**3)
+
+    with pytest.raises(ValueError):
+        parse_size('-1G')
@@ -6,6 +6,7 @@ from pathlib import Path
 import os.path
 
 from data_mover import is_accessible_url, download_from_url, find_local_file, fetch_file
+from data_mover.cache_store import cache_path
 
 
 FASTA_URL = 'https://s3.amazonaws.com/agrjbrowse/fasta/GCF_000146045.2_R64_genomic.fna.gz'
@@ -21,7 +22,7 @@ def test_is_accessible_url() -> None:
 
 def test_download_from_url() -> None:
 
-    expected_rel_file_path = os.path.join(DOWNLOAD_DIR, 'GCF_000146045.2_R64_genomic.fna.gz')
+    expected_rel_file_path = cache_path(FASTA_URL, DOWNLOAD_DIR)
     expected_abs_file_path = str(Path(expected_rel_file_path).resolve())
 
     downloaded_file_path = download_from_url(url=FASTA_URL, dest_filepath=expected_rel_file_path)
@@ -34,7 +35,7 @@ def test_download_from_url() -> None:
     # Test cached retrieval
     download_last_modified = os.path.getmtime(filename=downloaded_file_path)
 
-    fetched_file_path = fetch_file(url=FASTA_URL, dest_dir=DOWNLOAD_DIR, reuse_local_cache=True)
+    fetched_file_path = fetch_file(url=FASTA_URL, dest_dir=DOWNLOAD_DIR, cache_policy='trust')
     fetch_last_modified = os.path.getmtime(filename=fetched_file_path)
 
     # Assert fetched file has not been redownloaded but is the previously downloaded file
@@ -0,0 +1,78 @@
+"""
+Unit testing for checksum verification of downloads in data_mover module
+"""
+
+import os
+
+import pytest
+
+from data_mover import download_from_url
+from data_mover.cache_manifest import file_md5, read_entry
+
+from .fixtures.http_server import RecordingHTTPServer
+
+SEGMENT_SIZE = 16 * 1024
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_download_checksum_recorded(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path,
+                                    max_workers: int) -> None:
+    filename = synthetic_fasta_files['plain']
+    dest_file_path = str(tmp_path / filename)
+
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE, max_workers=max_workers)
+
+    entry = read_entry(dest_file_path)
+    assert entry is not None
+    assert entry['md5'] == file_md5(os.path.join(http_server_dir, filename))
+    assert entry['md5_verified'] is False
+
+
+def test_download_checksum_resumed(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    source_file_path = os.path.join(http_server_dir, filename)
+    dest_file_path = str(tmp_path / filename)
+
+    with open(source_file_path, 'rb') as source_file, open(dest_file_path + '.part', 'wb') as part_file:
+        part_file.write(source_file.read(int(SEGMENT_SIZE * 2.5)))
+
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE, max_workers=4,
+                      expected_md5=file_md5(source_file_path))
+
+    entry = read_entry(dest_file_path)
+    assert entry is not None
+    assert entry['md5_verified'] is True
+
+
+def test_download_checksum_sidecar(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    source_md5 = file_md5(os.path.join(http_server_dir, filename))
+    dest_file_path = str(tmp_path / filename)
+
+    with open(os.path.join(http_server_dir, filename + '.md5'), 'w') as sidecar_file:
+        sidecar_file.write(f'{source_md5.upper()}  {filename}\n')
+
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE)
+
+    entry = read_entry(dest_file_path)
+    assert entry is not None
+    assert entry['md5'] == source_md5
+    assert entry['md5_verified'] is True
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_download_checksum_mismatch(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path,
+                                    max_workers: int) -> None:
+    filename = synthetic_fasta_files['plain']
+    dest_file_path = str(tmp_path / filename)
+
+    with open(os.path.join(http_server_dir, filename + '.md5'), 'w') as sidecar_file:
+        sidecar_file.write('0' * 32 + '\n')
+
+    with pytest.raises(IOError, match='corrupted'):
+        download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE, max_workers=max_workers)
+
+    # Corrupted downloads should not be kept (nor resumed)
+    assert not os.path.exists(dest_file_path)
+    assert not os.path.exists(dest_file_path + '.part')
+    assert read_entry(dest_file_path) is None
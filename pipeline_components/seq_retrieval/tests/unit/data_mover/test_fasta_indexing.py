@@ -0,0 +1,85 @@
+"""
+Unit testing for local derivation of faidx-indexed fasta files
+"""
+
+import gzip
+import os
+import shutil
+from typing import Generator
+
+import pysam
+import pytest
+
+from data_mover import data_file_mover
+from data_mover.data_file_mover import fetch_indexed_fasta_file
+from data_mover.fasta_indexing import is_bgzf, is_gzip
+
+from .fixtures.http_server import RecordingHTTPServer
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache() -> Generator[None, None, None]:
+    data_file_mover._stored_files.clear()
+    yield
+    data_file_mover._stored_files.clear()
+
+
+@pytest.fixture
+def unindexed_fasta_files(http_server_dir: str, synthetic_fasta_files) -> dict[str, str]:
+    """Unindexed copies of the synthetic fasta file: uncompressed ('plain'), plain gzip ('gzip') and BGZF ('bgzip')."""
+    plain_path = os.path.join(http_server_dir, synthetic_fasta_files['plain'])
+
+    unindexed_dir = os.path.join(http_server_dir, 'unindexed')
+    os.makedirs(unindexed_dir)
+    shutil.copy(plain_path, os.path.join(unindexed_dir, 'plain.fa'))
+    shutil.copy(plain_path + '.gz', os.path.join(unindexed_dir, 'bgzip.fa.gz'))
+    with open(plain_path, 'rb') as plain_file, gzip.open(os.path.join(unindexed_dir, 'gzip.fa.gz'), 'wb') as gzip_file:
+        shutil.copyfileobj(plain_file, gzip_file)
+
+    return {'plain': 'unindexed/plain.fa', 'gzip': 'unindexed/gzip.fa.gz', 'bgzip': 'unindexed/bgzip.fa.gz'}
+
+
+def test_compression_detection(http_server_dir: str, unindexed_fasta_files) -> None:
+    paths = {file_type: os.path.join(http_server_dir, filename) for file_type, filename in unindexed_fasta_files.items()}
+
+    assert [is_gzip(paths[file_type]) for file_type in ['plain', 'gzip', 'bgzip']] == [False, True, True]
+    assert [is_bgzf(paths[file_type]) for file_type in ['plain', 'gzip', 'bgzip']] == [False, False, True]
+
+
+def test_fetch_indexed_fasta_file_available_indices(http_server: RecordingHTTPServer, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    local_fasta_path = fetch_indexed_fasta_file(http_server.url(filename), dest_dir=str(tmp_path))
+
+    # Indexed remote files are used as is
+    assert os.path.basename(local_fasta_path) == filename
+    assert os.path.isfile(local_fasta_path + '.gzi')
+
+
+@pytest.mark.parametrize('file_type', ['plain', 'gzip', 'bgzip'])
+def test_fetch_indexed_fasta_file_derived(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files,
+                                          unindexed_fasta_files, tmp_path, file_type: str) -> None:
+    url = http_server.url(unindexed_fasta_files[file_type])
+    local_fasta = pysam.FastaFile(os.path.join(http_server_dir, synthetic_fasta_files['plain']))
+
+    indexed_fasta_path = fetch_indexed_fasta_file(url, dest_dir=str(tmp_path))
+
+    assert (file_type == 'plain') or is_bgzf(indexed_fasta_path)
+    indexed_fasta = pysam.FastaFile(indexed_fasta_path)
+    assert indexed_fasta.fetch(reference='II', start=45000, end=45100) == local_fasta.fetch(reference='II', start=45000, end=45100)
+
+    # Derived files are reused by later calls
+    derived_mtime = os.path.getmtime(indexed_fasta_path + '.fai')
+    data_file_mover._stored_files.clear()
+    assert fetch_indexed_fasta_file(url, dest_dir=str(tmp_path)) == indexed_fasta_path
+    assert os.path.getmtime(indexed_fasta_path + '.fai') == derived_mtime
+
+
+def test_fetch_indexed_fasta_file_local(http_server_dir: str, unindexed_fasta_files, tmp_path) -> None:
+    source_path = os.path.join(http_server_dir, unindexed_fasta_files['gzip'])
+
+    indexed_fasta_path = fetch_indexed_fasta_file(f'file://{source_path}', dest_dir=str(tmp_path))
+
+    # Derived files of local fasta files are stored in the local file cache, not alongside the source file
+    assert indexed_fasta_path.startswith(str(tmp_path))
+    assert not os.path.exists(source_path + '.fai')
+    assert pysam.FastaFile(indexed_fasta_path).get_reference_length('I') == 150000
@@ -0,0 +1,98 @@
+"""
+Unit testing for cross-process download de-duplication through file locks
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
+import sys
+import time
+
+from data_mover import cache_manifest, data_file_mover
+from data_mover.cache_store import cache_path, prune_cache
+from data_mover.data_file_mover import download_from_url, fetch_file
+from data_mover.file_lock import file_lock
+
+from .fixtures.http_server import RecordingHTTPServer
+
+FILENAME = 'genome.fa'
+
+FETCH_SCRIPT = '''
+import sys
+from data_mover.data_file_mover import fetch_file
+print(fetch_file(sys.argv[1], dest_dir=sys.argv[2]))
+'''
+
+
+def test_file_lock(tmp_path) -> None:
+    locked_file = str(tmp_path / 'locked.txt')
+
+    with file_lock(locked_file) as acquired:
+        assert acquired is True
+        with file_lock(locked_file, blocking=False) as concurrently_acquired:
+            assert concurrently_acquired is False
+
+    with file_lock(locked_file, blocking=False) as acquired:
+        assert acquired is True
+
+
+def test_concurrent_fetch_single_transfer(http_server: RecordingHTTPServer, http_server_dir: str, tmp_path) -> None:
+    with open(os.path.join(http_server_dir, FILENAME), 'w') as served_file:
+        served_file.write('>I\n' + 'ACGT' * 100000 + '\n')
+    http_server.response_delay = 0.5
+
+    url = http_server.url(FILENAME)
+    cache_dir = str(tmp_path / 'cache')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    processes = [subprocess.Popen([sys.executable, '-c', FETCH_SCRIPT, url, cache_dir], env=env,
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                 for _ in range(4)]
+    outputs = [process.communicate(timeout=60) for process in processes]
+
+    assert all(process.returncode == 0 for process in processes), [stderr for _, stderr in outputs]
+    assert len({stdout.strip() for stdout, _ in outputs}) == 1
+    assert os.path.getsize(cache_path(url, cache_dir)) == os.path.getsize(os.path.join(http_server_dir, FILENAME))
+
+    # Exactly one (unconditional) transfer of the file
+    transfers = [request for request in http_server.request_log
+                 if request['method'] == 'GET' and request['path'] == f'/{FILENAME}' and request['if_modified_since'] is None]
+    assert len(transfers) == 1
+
+
+def test_waiting_fetch_reuses_concurrent_download(http_server: RecordingHTTPServer, http_server_dir: str, tmp_path, monkeypatch) -> None:
+    with open(os.path.join(http_server_dir, FILENAME), 'w') as served_file:
+        served_file.write('>I\n' + 'ACGT' * 1000 + '\n')
+
+    url = http_server.url(FILENAME)
+    cache_dir = str(tmp_path / 'cache')
+    local_path = cache_path(url, cache_dir)
+
+    # Manifest entries timestamped by a clock behind the one of the waiting fetch
+    monkeypatch.setattr(cache_manifest, 'time', lambda: 0.0)
+
+    data_file_mover._stored_files.clear()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with file_lock(local_path):
+            waiting_fetch = executor.submit(fetch_file, url, dest_dir=cache_dir)
+            time.sleep(0.5)
+            # Concurrent download, completed while holding the lock
+            download_from_url(url, local_path)
+
+        assert waiting_fetch.result(timeout=10) == local_path
+
+    # The waiting fetch reuses the concurrent download without any further request
+    assert len([request for request in http_server.request_log if request['method'] == 'GET' and request['path'] == f'/{FILENAME}']) == 1
+
+
+def test_prune_skips_locked_files(tmp_path) -> None:
+    cache_dir = str(tmp_path)
+    local_path = cache_path('https://host.org/in-use.fa.gz', cache_dir)
+    os.makedirs(os.path.dirname(local_path))
+    with open(local_path, 'wb') as local_file:
+        local_file.write(b'A' * 100)
+
+    with file_lock(local_path):
+        assert prune_cache(cache_dir, size_budget=0) == []
+
+    assert len(prune_cache(cache_dir, size_budget=0)) == 1
+    assert not os.path.exists(local_path)
@@ -0,0 +1,96 @@
+"""
+Unit testing for the tiered (pre-staged, cache, network) lookup of remote files
+"""
+
+import json
+import os
+import shutil
+from typing import Generator
+
+import pytest
+
+from data_mover import data_file_mover
+from data_mover.data_file_mover import fetch_file, fetch_indexed_fasta_file, served_tiers, set_prestaged_dirs
+from data_mover.prestaged_store import find_prestaged_file
+
+from .fixtures.http_server import RecordingHTTPServer
+
+
+@pytest.fixture(autouse=True)
+def reset_data_file_mover() -> Generator[None, None, None]:
+    data_file_mover._stored_files.clear()
+    data_file_mover._served_tiers.clear()
+    yield
+    data_file_mover._stored_files.clear()
+    data_file_mover._served_tiers.clear()
+    set_prestaged_dirs([])
+
+
+def prestage(prestaged_dir: str, manifest: dict[str, str], source_files: dict[str, str]) -> str:
+    """Write a pre-staged directory with `source_files` (source path by relative path) and `manifest`."""
+    os.makedirs(prestaged_dir, exist_ok=True)
+    for relative_path, source_path in source_files.items():
+        os.makedirs(os.path.dirname(os.path.join(prestaged_dir, relative_path)), exist_ok=True)
+        shutil.copy(source_path, os.path.join(prestaged_dir, relative_path))
+    with open(os.path.join(prestaged_dir, 'pavi_manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+    return prestaged_dir
+
+
+def test_find_prestaged_file(tmp_path, http_server_dir: str, synthetic_fasta_files) -> None:
+    source_path = os.path.join(http_server_dir, synthetic_fasta_files['bgzip'])
+    url = 'https://host.org/genome.fa.gz'
+
+    first_dir = prestage(str(tmp_path / 'first'), {'https://host.org/other.fa.gz': 'missing.fa.gz'}, {})
+    second_dir = prestage(str(tmp_path / 'second'), {url: 'genomes/genome.fa.gz'},
+                          {'genomes/genome.fa.gz': source_path, 'genomes/genome.fa.gz.fai': source_path + '.fai'})
+    invalid_dir = str(tmp_path / 'invalid')
+    os.makedirs(invalid_dir)
+    with open(os.path.join(invalid_dir, 'pavi_manifest.json'), 'w') as manifest_file:
+        manifest_file.write('not json')
+
+    prestaged_dirs = [invalid_dir, first_dir, second_dir]
+    assert find_prestaged_file(url, prestaged_dirs) == os.path.join(second_dir, 'genomes', 'genome.fa.gz')
+    # Companion files are found alongside mapped files
+    assert find_prestaged_file(url + '.fai', prestaged_dirs) == os.path.join(second_dir, 'genomes', 'genome.fa.gz.fai')
+    assert find_prestaged_file(url + '.gzi', prestaged_dirs) is None
+    # Manifest entries for missing files are skipped
+    assert find_prestaged_file('https://host.org/other.fa.gz', prestaged_dirs) is None
+
+
+def test_tiered_fetch(tmp_path, http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    source_path = os.path.join(http_server_dir, filename)
+    prestaged_url = http_server.url(filename)
+    cached_url = http_server.url(synthetic_fasta_files['plain'])
+    cache_dir = str(tmp_path / 'cache')
+
+    prestaged_dir = prestage(str(tmp_path / 'prestaged'), {prestaged_url: filename},
+                             {filename: source_path, filename + '.fai': source_path + '.fai', filename + '.gzi': source_path + '.gzi'})
+    set_prestaged_dirs([prestaged_dir])
+
+    # Pre-staged files are served without any request
+    assert fetch_indexed_fasta_file(prestaged_url, dest_dir=cache_dir) == os.path.join(prestaged_dir, filename)
+    assert http_server.request_log == []
+
+    fetch_file(cached_url, dest_dir=cache_dir)
+    data_file_mover._stored_files.clear()
+    fetch_file(cached_url, dest_dir=cache_dir)
+
+    assert served_tiers() == {prestaged_url: 'prestaged', prestaged_url + '.fai': 'prestaged', prestaged_url + '.gzi': 'prestaged',
+                              cached_url: 'cache'}
+
+
+def test_prestaged_fasta_without_index(tmp_path, http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['plain']
+    url = http_server.url(filename)
+    prestaged_dir = prestage(str(tmp_path / 'prestaged'), {url: filename}, {filename: os.path.join(http_server_dir, filename)})
+    set_prestaged_dirs([prestaged_dir])
+
+    # Index file downloaded to the cache is not alongside the pre-staged fasta file, so the fasta file gets indexed in the cache
+    indexed_fasta_path = fetch_indexed_fasta_file(url, dest_dir=str(tmp_path / 'cache'))
+
+    assert served_tiers()[url + '.fai'] == 'network'
+    assert indexed_fasta_path.startswith(str(tmp_path / 'cache'))
+    assert os.path.isfile(indexed_fasta_path + '.fai')
+    assert not os.path.exists(os.path.join(prestaged_dir, filename + '.fai'))
@@ -0,0 +1,126 @@
+"""
+Unit testing for remote_fasta module
+"""
+
+from Bio import Seq
+import filecmp
+import os
+import pysam
+import pytest
+from time import perf_counter
+from typing import List
+
+from data_mover import data_file_mover
+from data_mover.remote_fasta import RemoteFastaFile
+from seq_region import SeqRegion
+from seq_region.seq_region import fetch_faidx_files, set_remote_fasta_access
+
+from .fixtures.http_server import RecordingHTTPServer
+
+REGIONS = [('I', 0, 10), ('I', 59, 61), ('I', 65530, 65560), ('I', 1000, 140000), ('I', 149990, 150000),
+           ('II', 0, 90001), ('II', 45000, 45001)]
+
+
+@pytest.mark.parametrize('file_type', ['plain', 'bgzip'])
+def test_remote_fasta_fetch(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, file_type: str) -> None:
+    filename = synthetic_fasta_files[file_type]
+    local_fasta = pysam.FastaFile(os.path.join(http_server_dir, filename))
+    remote_fasta = RemoteFastaFile(http_server.url(filename))
+
+    assert sorted(remote_fasta.references) == ['I', 'II']
+    assert remote_fasta.get_reference_length('II') == 90001
+
+    for reference, start, end in REGIONS:
+        assert remote_fasta.fetch(reference=reference, start=start, end=end) == local_fasta.fetch(reference=reference, start=start, end=end)
+
+    # Complete file should never have been requested
+    assert all(request['range'] is not None for request in http_server.request_log if request['path'] == f'/{filename}')
+
+    with pytest.raises(KeyError):
+        remote_fasta.fetch(reference='III', start=0, end=10)
+
+
+def test_remote_fasta_block_cache(http_server: RecordingHTTPServer, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    remote_fasta = RemoteFastaFile(http_server.url(filename), block_cache_size=2)
+
+    sequence = remote_fasta.fetch(reference='I', start=100, end=200)
+    assert len(http_server.range_requests(filename)) == 1
+
+    # Repeated and neighbouring (same block) requests should be served from the block cache
+    assert remote_fasta.fetch(reference='I', start=100, end=200) == sequence
+    assert remote_fasta.fetch(reference='I', start=150, end=250)[:50] == sequence[50:]
+    assert len(http_server.range_requests(filename)) == 1
+
+    # Requests exceeding the block cache size should still be served correctly
+    long_sequence = remote_fasta.fetch(reference='I', start=0, end=150000)
+    assert long_sequence[100:200] == sequence
+    assert len(long_sequence) == 150000
+
+
+def test_remote_fasta_without_range_support(http_server: RecordingHTTPServer, synthetic_fasta_files) -> None:
+    http_server.range_support = False
+    remote_fasta = RemoteFastaFile(http_server.url(synthetic_fasta_files['bgzip']))
+
+    with pytest.raises(IOError):
+        remote_fasta.fetch(reference='I', start=0, end=10)
+
+
+def test_seq_region_remote_access(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    fasta_file_url = http_server.url(filename)
+
+    assert fetch_faidx_files(fasta_file_url, remote_access=True) == fasta_file_url
+
+    local_fasta = pysam.FastaFile(os.path.join(http_server_dir, filename))
+
+    set_remote_fasta_access(True)
+    try:
+        seq_region = SeqRegion(seq_id='I', start=1001, end=1100, strand='-', fasta_file_url=fasta_file_url)
+    finally:
+        set_remote_fasta_access(False)
+
+    assert seq_region.fasta_file_path == fasta_file_url
+    assert seq_region.fetch_seq() == str(Seq.reverse_complement(local_fasta.fetch(reference='I', start=1000, end=1100)))
+
+
+def test_fetch_faidx_files_concurrent(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    http_server.response_delay = 0.5
+
+    start = perf_counter()
+    local_fasta_path = fetch_faidx_files(http_server.url(filename), remote_access=False)
+    runtime = perf_counter() - start
+
+    # Fasta and index files are fetched concurrently, with a single request each (and a concurrent checksum sidecar lookup)
+    # and stored alongside each other
+    assert runtime < 1.0
+    file_paths = [f'/{filename}', f'/{filename}.fai', f'/{filename}.gzi']
+    assert sorted(str(request['path']) for request in http_server.request_log) == sorted(file_paths + [path + '.md5' for path in file_paths])
+    for suffix in ['.fai', '.gzi']:
+        assert filecmp.cmp(os.path.join(http_server_dir, filename + suffix), local_fasta_path + suffix, shallow=False)
+
+
+def test_fetch_faidx_files_remote_index_missing(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files,
+                                                monkeypatch: pytest.MonkeyPatch) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    os.remove(os.path.join(http_server_dir, filename + '.fai'))
+    fasta_file_url = http_server.url(filename)
+
+    fetched_urls: List[str] = []
+    fetch_indexed_fasta_file = data_file_mover.fetch_indexed_fasta_file
+
+    def recording_fetch_indexed_fasta_file(url: str) -> str:
+        fetched_urls.append(url)
+        return fetch_indexed_fasta_file(url)
+
+    monkeypatch.setattr(data_file_mover, 'fetch_indexed_fasta_file', recording_fetch_indexed_fasta_file)
+
+    local_fasta_path = fetch_faidx_files(fasta_file_url, remote_access=True)
+
+    # Remote access is not possible without index, fasta file is fetched (and indexed locally) instead
+    assert fetched_urls == [fasta_file_url]
+    assert local_fasta_path != fasta_file_url
+    local_fasta = pysam.FastaFile(local_fasta_path)
+    assert local_fasta.fetch(reference='I', start=100, end=200) == \
+        pysam.FastaFile(os.path.join(http_server_dir, filename)).fetch(reference='I', start=100, end=200)
@@ -0,0 +1,190 @@
+"""
+Unit testing for s3:// URL support in data_mover module
+"""
+
+from botocore.auth import S3SigV4Auth  # type: ignore
+from botocore.awsrequest import AWSRequest  # type: ignore
+from botocore.credentials import Credentials  # type: ignore
+import filecmp
+from http.server import BaseHTTPRequestHandler
+import os
+import re
+import shutil
+from typing import Generator, Optional
+
+import pysam
+import pytest
+import requests
+
+from data_mover import data_file_mover, s3
+from data_mover.data_file_mover import download_from_url, fetch_file
+from data_mover.remote_fasta import RemoteFastaFile
+from data_mover.s3 import http_url
+
+from .fixtures.http_server import RecordingHTTPServer
+
+BUCKET = 'agr-test-bucket'
+PRIVATE_BUCKET = 'agr-test-private-bucket'
+REGION = 'eu-west-1'
+AWS_CREDENTIALS = Credentials('AKIDEXAMPLE', 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY')
+
+
+def signature_check(handler: BaseHTTPRequestHandler) -> Optional[int]:
+    """Deny (403) requests to `PRIVATE_BUCKET` not signed (AWS Signature Version 4) with `AWS_CREDENTIALS`."""
+    if not handler.path.startswith(f'/{PRIVATE_BUCKET}/'):
+        return None
+
+    authorization = re.fullmatch(r'AWS4-HMAC-SHA256 Credential=[^,]+, SignedHeaders=([^,]+), Signature=([0-9a-f]+)',
+                                 handler.headers.get('Authorization', ''))
+    if authorization is None or 'X-Amz-Date' not in handler.headers:
+        return 403
+
+    # Recompute the signature from the signed headers received
+    signed_headers = [header for header in authorization.group(1).split(';') if header != 'host']
+    aws_request = AWSRequest(method=handler.command, url=f'http://{handler.headers["Host"]}{handler.path}',
+                             headers={header: handler.headers[header] for header in signed_headers})
+    aws_request.context['timestamp'] = handler.headers['X-Amz-Date']
+    signer = S3SigV4Auth(AWS_CREDENTIALS, 's3', REGION)
+    signature = signer.signature(signer.string_to_sign(aws_request, signer.canonical_request(aws_request)), aws_request)
+
+    return None if authorization.group(2) == signature else 403
+
+
+@pytest.fixture
+def s3_endpoint(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, monkeypatch,  # noqa: U100
+                tmp_path) -> Generator[str, None, None]:
+    """
+    Local S3 stand-in (path-style addressing), serving the synthetic fasta files from public bucket `BUCKET`
+    and from bucket `PRIVATE_BUCKET` (to signed requests only). No AWS credentials are available (see `aws_credentials`).
+    """
+    for bucket in [BUCKET, PRIVATE_BUCKET]:
+        bucket_dir = os.path.join(http_server_dir, bucket, 'fasta')
+        os.makedirs(bucket_dir)
+        for filename in os.listdir(http_server_dir):
+            if filename.startswith('synthetic'):
+                shutil.copy(os.path.join(http_server_dir, filename), bucket_dir)
+    http_server.access_check = signature_check
+
+    endpoint = f'http://127.0.0.1:{http_server.server_address[1]}'
+    monkeypatch.setenv('AWS_ENDPOINT_URL_S3', endpoint)
+    monkeypatch.setenv('AWS_REGION', REGION)
+
+    # Isolate from any AWS credentials of the test environment
+    for env_var in ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN', 'AWS_PROFILE',
+                    'AWS_CONTAINER_CREDENTIALS_RELATIVE_URI', 'AWS_CONTAINER_CREDENTIALS_FULL_URI', 'AWS_WEB_IDENTITY_TOKEN_FILE']:
+        monkeypatch.delenv(env_var, raising=False)
+    monkeypatch.setenv('AWS_SHARED_CREDENTIALS_FILE', str(tmp_path / 'aws_credentials'))
+    monkeypatch.setenv('AWS_CONFIG_FILE', str(tmp_path / 'aws_config'))
+    monkeypatch.setenv('AWS_EC2_METADATA_DISABLED', 'true')
+    s3.default_auth.reset_credentials()
+
+    yield endpoint
+
+    s3.default_auth.reset_credentials()
+
+
+@pytest.fixture
+def aws_credentials(s3_endpoint: str, monkeypatch) -> None:  # noqa: U100
+    """AWS credentials `AWS_CREDENTIALS`, provided through the environment."""
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', AWS_CREDENTIALS.access_key)
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', AWS_CREDENTIALS.secret_key)
+    s3.default_auth.reset_credentials()
+
+
+def test_http_url(monkeypatch) -> None:
+    monkeypatch.delenv('AWS_ENDPOINT_URL_S3', raising=False)
+    monkeypatch.delenv('AWS_ENDPOINT_URL', raising=False)
+    monkeypatch.setenv('AWS_REGION', 'eu-west-1')
+
+    assert http_url('s3://bucket/path/to/genome file.fa.gz') == 'https://s3.eu-west-1.amazonaws.com/bucket/path/to/genome%20file.fa.gz'
+    assert http_url('https://host.org/genome.fa.gz') == 'https://host.org/genome.fa.gz'
+
+    monkeypatch.setenv('AWS_ENDPOINT_URL', 'http://localhost:5000/')
+    assert http_url('s3://bucket/genome.fa.gz') == 'http://localhost:5000/bucket/genome.fa.gz'
+
+
+@pytest.mark.usefixtures('s3_endpoint')
+def test_s3_fetch_file(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    url = f's3://{BUCKET}/fasta/{filename}'
+
+    data_file_mover._stored_files.clear()
+    local_path = fetch_file(url, dest_dir=str(tmp_path))
+    assert filecmp.cmp(os.path.join(http_server_dir, filename), local_path, shallow=False)
+    assert http_server.range_requests(f'{BUCKET}/fasta/{filename}') == ['bytes=0-']
+
+    # Cached files are validated against the endpoint
+    data_file_mover._stored_files.clear()
+    assert fetch_file(url, dest_dir=str(tmp_path)) == local_path
+    assert http_server.request_log[-1]['if_modified_since'] is not None
+
+
+@pytest.mark.usefixtures('s3_endpoint')
+def test_s3_segmented_download(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    dest_file_path = str(tmp_path / filename)
+
+    download_from_url(f's3://{BUCKET}/fasta/{filename}', dest_file_path, segment_size=16 * 1024, max_workers=4)
+
+    assert filecmp.cmp(os.path.join(http_server_dir, filename), dest_file_path, shallow=False)
+    assert len(http_server.range_requests(f'{BUCKET}/fasta/{filename}')) > 1
+
+
+@pytest.mark.usefixtures('s3_endpoint')
+def test_s3_remote_fasta(http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    local_fasta = pysam.FastaFile(os.path.join(http_server_dir, filename))
+    remote_fasta = RemoteFastaFile(f's3://{BUCKET}/fasta/{filename}')
+
+    assert remote_fasta.fetch(reference='I', start=1000, end=2000) == local_fasta.fetch(reference='I', start=1000, end=2000)
+
+
+@pytest.mark.usefixtures('aws_credentials')
+def test_s3_request_auth() -> None:
+    # Requests to the S3 endpoint are signed, requests to any other host are not
+    s3_request = s3.default_auth(requests.Request('GET', http_url(f's3://{BUCKET}/genome.fa.gz')).prepare())
+    assert s3_request.headers['Authorization'].startswith(f'AWS4-HMAC-SHA256 Credential={AWS_CREDENTIALS.access_key}/')
+    assert 'X-Amz-Date' in s3_request.headers
+
+    other_request = s3.default_auth(requests.Request('GET', 'https://host.org/genome.fa.gz').prepare())
+    assert 'Authorization' not in other_request.headers
+
+
+@pytest.mark.usefixtures('aws_credentials')
+def test_s3_private_fetch_file(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    url = f's3://{PRIVATE_BUCKET}/fasta/{filename}'
+
+    data_file_mover._stored_files.clear()
+    local_path = fetch_file(url, dest_dir=str(tmp_path))
+    assert filecmp.cmp(os.path.join(http_server_dir, filename), local_path, shallow=False)
+
+    # Cache validation requests are signed as well
+    data_file_mover._stored_files.clear()
+    assert fetch_file(url, dest_dir=str(tmp_path)) == local_path
+    assert http_server.request_log[-1]['if_modified_since'] is not None
+
+
+@pytest.mark.usefixtures('aws_credentials')
+def test_s3_private_remote_fasta(http_server_dir: str, synthetic_fasta_files) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    local_fasta = pysam.FastaFile(os.path.join(http_server_dir, filename))
+    remote_fasta = RemoteFastaFile(f's3://{PRIVATE_BUCKET}/fasta/{filename}')
+
+    assert remote_fasta.fetch(reference='II', start=500, end=70000) == local_fasta.fetch(reference='II', start=500, end=70000)
+
+
+@pytest.mark.usefixtures('s3_endpoint')
+def test_s3_private_no_credentials(synthetic_fasta_files, tmp_path, monkeypatch) -> None:
+    filename = synthetic_fasta_files['plain']
+    url = f's3://{PRIVATE_BUCKET}/fasta/{filename}'
+
+    with pytest.raises(ValueError, match='no AWS credentials found'):
+        download_from_url(url, str(tmp_path / filename))
+
+    # Invalid credentials are reported as any other access error
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', AWS_CREDENTIALS.access_key)
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'invalid-secret-key')
+    s3.default_auth.reset_credentials()
+    with pytest.raises(ValueError, match=r'not accessible \(status 403\)\.$'):
+        download_from_url(url, str(tmp_path / filename))
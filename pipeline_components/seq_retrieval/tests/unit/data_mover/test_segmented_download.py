@@ -0,0 +1,97 @@
+"""
+Unit testing for segmented and resumable downloads in data_mover module
+"""
+
+import filecmp
+import os
+
+from data_mover import download_from_url
+
+from .fixtures.http_server import RecordingHTTPServer
+
+SEGMENT_SIZE = 16 * 1024
+
+
+def test_segmented_download(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    source_file_path = os.path.join(http_server_dir, filename)
+    dest_file_path = str(tmp_path / 'downloads' / filename)
+
+    downloaded_file_path = download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path,
+                                             segment_size=SEGMENT_SIZE, max_workers=4)
+
+    assert downloaded_file_path == dest_file_path
+    assert filecmp.cmp(source_file_path, dest_file_path, shallow=False)
+    assert not os.path.exists(dest_file_path + '.part')
+    assert not os.path.exists(dest_file_path + '.part.progress')
+
+    # File should have been downloaded as segments (the first through the initial open-ended range request),
+    # without any additional requests (other than the checksum sidecar lookup)
+    source_size = os.path.getsize(source_file_path)
+    expected_segment_count = (source_size + SEGMENT_SIZE - 1) // SEGMENT_SIZE
+    assert len(http_server.range_requests(filename)) == expected_segment_count
+    assert 'bytes=0-' in http_server.range_requests(filename)
+    assert len([request for request in http_server.request_log if request['path'] == f'/{filename}']) == expected_segment_count
+
+
+def test_segmented_download_resume(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['plain']
+    source_file_path = os.path.join(http_server_dir, filename)
+    dest_file_path = str(tmp_path / filename)
+
+    # Partial download of the first 3.5 segments
+    with open(source_file_path, 'rb') as source_file, open(dest_file_path + '.part', 'wb') as part_file:
+        part_file.write(source_file.read(int(SEGMENT_SIZE * 3.5)))
+
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE, max_workers=4)
+
+    assert filecmp.cmp(source_file_path, dest_file_path, shallow=False)
+
+    # Only the missing content should have been downloaded
+    requested_starts = sorted(int(range_header.split('=')[1].split('-')[0]) for range_header in http_server.range_requests(filename))
+    assert requested_starts[0] == int(SEGMENT_SIZE * 3.5)
+    assert requested_starts[1] == 4 * SEGMENT_SIZE
+
+
+def test_streamed_download_resume(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    filename = synthetic_fasta_files['bgzip']
+    source_file_path = os.path.join(http_server_dir, filename)
+    dest_file_path = str(tmp_path / filename)
+    source_size = os.path.getsize(source_file_path)
+
+    with open(source_file_path, 'rb') as source_file, open(dest_file_path + '.part', 'wb') as part_file:
+        part_file.write(source_file.read(source_size // 2))
+
+    # Segment size larger than file results in a single streamed download
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=source_size + 1)
+
+    assert filecmp.cmp(source_file_path, dest_file_path, shallow=False)
+    assert http_server.range_requests(filename) == [f'bytes={source_size // 2}-']
+
+
+def test_download_without_range_support(http_server: RecordingHTTPServer, http_server_dir: str, synthetic_fasta_files, tmp_path) -> None:
+    http_server.range_support = False
+    filename = synthetic_fasta_files['plain']
+    source_file_path = os.path.join(http_server_dir, filename)
+    dest_file_path = str(tmp_path / filename)
+
+    # Stale partial download should be overwritten when the server does not support resuming
+    with open(dest_file_path + '.part', 'wb') as part_file:
+        part_file.write(b'stale content')
+
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE)
+
+    assert filecmp.cmp(source_file_path, dest_file_path, shallow=False)
+    assert len([request for request in http_server.request_log if request['path'] == f'/{filename}']) == 1
+
+
+def test_download_empty_file(http_server: RecordingHTTPServer, http_server_dir: str, tmp_path) -> None:
+    filename = 'empty.fa'
+    open(os.path.join(http_server_dir, filename), 'w').close()
+    dest_file_path = str(tmp_path / filename)
+
+    # Empty files cannot satisfy the initial range request (416), and are requested without Range header instead
+    download_from_url(url=http_server.url(filename), dest_filepath=dest_file_path, segment_size=SEGMENT_SIZE)
+
+    assert os.path.getsize(dest_file_path) == 0
+    assert [request['range'] for request in http_server.request_log if request['path'] == f'/{filename}'] == ['bytes=0-', None]
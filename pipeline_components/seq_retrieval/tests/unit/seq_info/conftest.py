@@ -1,2 +1,4 @@
 from ..variant.fixtures.variants import *  # noqa: F401, F403
 from ..variant.fixtures.seq_embedded_variants import *  # noqa: F401, F403
+from ..variant.fixtures.alignment_embedded_variants import *  # noqa: F401, F403
+from ..variant.fixtures.seq_records import *  # noqa: F401, F403
@@ -0,0 +1,57 @@
+"""
+Unit testing for AlignmentVariantIndex class
+"""
+import json
+import random
+
+from seq_info import AlignmentVariantIndex, SeqInfo
+from variant import AlignmentEmbeddedVariantsList, SeqEmbeddedVariantsList
+
+
+def test_alignment_variant_index_from_seq_info(wb_variant_yn32_in_C42D8_8a_1_protein_alignment, wb_variants_yn10_yn30_in_C42D8_8a_1_list) -> None:
+    aligned_variant = wb_variant_yn32_in_C42D8_8a_1_protein_alignment
+    index = AlignmentVariantIndex.from_seq_info({
+        'C42D8.8a.1_yn32': SeqInfo(embedded_variants=AlignmentEmbeddedVariantsList([aligned_variant])),
+        'C42D8.8a.1_unaligned': SeqInfo(embedded_variants=wb_variants_yn10_yn30_in_C42D8_8a_1_list),
+        'C42D8.8a.1_no_variants': SeqInfo(sequence='MTVGK', embedded_variants=AlignmentEmbeddedVariantsList()),
+        'empty': SeqInfo(embedded_variants=SeqEmbeddedVariantsList()),
+        'missing': None
+    })
+
+    # Only aligned embedded variants are indexed
+    assert len(index) == 1
+    assert index.overlapping(aligned_variant.alignment_start_pos, aligned_variant.alignment_end_pos) == \
+        [('C42D8.8a.1_yn32', aligned_variant.variant_id)]
+    assert index.overlapping(1, aligned_variant.alignment_start_pos - 1) == []
+    assert index.overlapping(aligned_variant.alignment_end_pos + 1, aligned_variant.alignment_end_pos + 100) == []
+
+    assert json.loads(index.to_json()) == {
+        'alignment_start_pos': [aligned_variant.alignment_start_pos],
+        'alignment_end_pos': [aligned_variant.alignment_end_pos],
+        'max_alignment_end_pos': [aligned_variant.alignment_end_pos],
+        'variant_id': [aligned_variant.variant_id],
+        'seq_name': ['C42D8.8a.1_yn32']
+    }
+
+
+def test_alignment_variant_index_overlapping() -> None:
+    rng = random.Random(0)
+    intervals = []
+    for i in range(500):
+        start = rng.randint(1, 1000)
+        intervals.append((start, start + rng.choice([0, 0, 1, 5, 50]), f'variant_{i}', f'seq_{i % 7}'))
+
+    index = AlignmentVariantIndex(intervals)
+
+    assert index.alignment_start_pos == sorted(index.alignment_start_pos)
+    assert index.max_alignment_end_pos == sorted(index.max_alignment_end_pos)
+
+    # Binary search results match a full scan
+    for start, end in [(1, 1), (1, 1100), (500, 500), (500, 510), (990, 2000), (1100, 1200)] + \
+                      [(pos, pos + rng.randint(0, 30)) for pos in rng.sample(range(1, 1050), 50)]:
+        expected = sorted((seq_name, variant_id) for interval_start, interval_end, variant_id, seq_name in intervals
+                          if interval_start <= end and interval_end >= start)
+        assert sorted(index.overlapping(start, end)) == expected
+
+    assert len(AlignmentVariantIndex([])) == 0
+    assert AlignmentVariantIndex([]).overlapping(1, 100) == []
@@ -5,7 +5,7 @@ import logging
 
 from log_mgmt import get_logger, set_log_level
 from seq_info import SeqInfo
-from variant import AlignmentEmbeddedVariant, SeqEmbeddedVariant
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, SeqEmbeddedVariantsList
 
 logger = get_logger(name=__name__)
 set_log_level(logging.DEBUG)
@@ -115,3 +115,35 @@ def test_seq_info_initiation_from_dict_alignment_embedded_variants():
     assert seq_info.embedded_variants is not None and len(seq_info.embedded_variants) == 1
     assert isinstance(seq_info.embedded_variants[0], AlignmentEmbeddedVariant)
     assert seq_info.embedded_variants[0].variant_id == 'NC_003284.9:g.5114224C>T'
+
+
+def test_seq_info_to_aligned(wb_C42D8_8a_1_yn32_seq_record, wb_variant_yn32_in_C42D8_8a_1_protein_seq,
+                             wb_variant_yn32_in_C42D8_8a_1_protein_alignment):
+    '''
+    Test that SeqInfo.to_aligned returns a new SeqInfo object with aligned embedded variants, leaving the original untouched
+    '''
+    seq_info = SeqInfo(sequence='MTVGK', embedded_variants=SeqEmbeddedVariantsList([wb_variant_yn32_in_C42D8_8a_1_protein_seq]))
+
+    aligned_seq_info = seq_info.to_aligned(wb_C42D8_8a_1_yn32_seq_record)
+
+    assert aligned_seq_info is not seq_info
+    assert aligned_seq_info.sequence == seq_info.sequence
+    assert not hasattr(aligned_seq_info, 'error')
+    assert isinstance(aligned_seq_info.embedded_variants, AlignmentEmbeddedVariantsList)
+    assert aligned_seq_info.embedded_variants == [wb_variant_yn32_in_C42D8_8a_1_protein_alignment]
+    assert seq_info.embedded_variants == [wb_variant_yn32_in_C42D8_8a_1_protein_seq]
+    assert not isinstance(seq_info.embedded_variants[0], AlignmentEmbeddedVariant)
+
+    # Already aligned embedded variants are reused as is
+    assert aligned_seq_info.to_aligned(wb_C42D8_8a_1_yn32_seq_record).embedded_variants is aligned_seq_info.embedded_variants
+
+
+def test_seq_info_to_aligned_no_embedded_variants(wb_C42D8_8a_1_yn32_seq_record):
+    '''
+    Test that SeqInfo.to_aligned preserves the absence of embedded variants, and errors
+    '''
+    aligned_seq_info = SeqInfo(error='Alternative coding sequence rejected.').to_aligned(wb_C42D8_8a_1_yn32_seq_record)
+
+    assert aligned_seq_info.error == 'Alternative coding sequence rejected.'
+    assert not hasattr(aligned_seq_info, 'embedded_variants')
+    assert not hasattr(aligned_seq_info, 'sequence')
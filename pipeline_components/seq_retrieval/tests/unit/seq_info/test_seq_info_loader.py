@@ -0,0 +1,59 @@
+"""
+Unit testing for the concurrent sequence info file loader
+"""
+import os
+
+import pytest
+
+from seq_info import encode_seq_info_dict, merge_seq_info_files, SeqInfo, SeqInfoFilesMerge
+from variant import SeqEmbeddedVariantsList
+
+
+def write_seq_info_file(dir_path: str, file_name: str, content: str) -> str:
+    file_path = os.path.join(dir_path, file_name)
+    with open(file_path, 'w') as f:
+        f.write(content)
+    return file_path
+
+
+def test_merge_seq_info_files_order(tmp_path, wb_variants_yn10_yn30_in_C42D8_8a_1_list) -> None:
+    file_paths = [write_seq_info_file(str(tmp_path), f'seq_info_{i}.json',
+                                      encode_seq_info_dict({f'seq_{i}': SeqInfo(sequence='M' * i), 'shared': SeqInfo(sequence=str(i))}))
+                  for i in range(1, 21)]
+    file_paths.append(write_seq_info_file(str(tmp_path), 'seq_info_variants.json', encode_seq_info_dict(
+        {'C42D8.8a.1_yn10_yn30': SeqInfo(embedded_variants=wb_variants_yn10_yn30_in_C42D8_8a_1_list)})))
+
+    merge = merge_seq_info_files(file_paths, max_workers=4)
+
+    assert isinstance(merge, SeqInfoFilesMerge)
+    assert merge.errors == {}
+    # Merged in input order, later files overriding earlier ones
+    assert list(merge.seq_info.keys()) == ['seq_1', 'shared'] + [f'seq_{i}' for i in range(2, 21)] + ['C42D8.8a.1_yn10_yn30']
+    assert merge.seq_info['shared'].sequence == '20'
+    assert isinstance(merge.seq_info['C42D8.8a.1_yn10_yn30'].embedded_variants, SeqEmbeddedVariantsList)
+
+    # Concurrent merging is identical to sequential merging
+    assert encode_seq_info_dict(merge.seq_info) == encode_seq_info_dict(merge_seq_info_files(file_paths, max_workers=1).seq_info)
+
+
+def test_merge_seq_info_files_errors(tmp_path) -> None:
+    valid_file = write_seq_info_file(str(tmp_path), 'valid.json', encode_seq_info_dict({'seq': SeqInfo(sequence='MK')}))
+    invalid_json_file = write_seq_info_file(str(tmp_path), 'invalid.json', '{"seq": ')
+    invalid_seq_info_file = write_seq_info_file(str(tmp_path), 'invalid_seq_info.json', '{"seq": {"sequence": 1}}')
+    missing_file = os.path.join(str(tmp_path), 'missing.json')
+
+    merge = merge_seq_info_files([invalid_json_file, missing_file, valid_file, invalid_seq_info_file])
+
+    # Failing files are reported without aborting the merge of the other files
+    assert list(merge.errors.keys()) == [invalid_json_file, missing_file, invalid_seq_info_file]
+    assert isinstance(merge.errors[invalid_json_file], ValueError)
+    assert isinstance(merge.errors[missing_file], OSError)
+    assert isinstance(merge.errors[invalid_seq_info_file], TypeError)
+    assert list(merge.seq_info.keys()) == ['seq']
+
+
+def test_merge_seq_info_files_arguments() -> None:
+    assert merge_seq_info_files([]) == SeqInfoFilesMerge(seq_info={}, errors={})
+
+    with pytest.raises(ValueError):
+        merge_seq_info_files([], max_workers=0)
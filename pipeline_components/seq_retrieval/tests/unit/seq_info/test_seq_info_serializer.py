@@ -0,0 +1,190 @@
+"""
+Unit testing for the schema-driven SeqInfo encoder and decoder
+"""
+from copy import copy
+from enum import Enum
+from io import StringIO
+import json
+from typing import Any, Optional
+
+import jsonpickle  # type: ignore
+import pytest
+
+from seq_info import (AltSeqInfo, decode_normalized_seq_info_dict, decode_seq_info, decode_seq_info_dict, encode_normalized_seq_info_dict,
+                      encode_seq_info_dict, encode_seq_info_dict_as, EnumValueHandler, SEQ_INFO_FORMAT_TYPE, SeqInfo,
+                      SeqInfoJsonWriter)
+from seq_info.seq_info_serializer import SCHEMAS
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, SeqEmbeddedVariant, SeqEmbeddedVariantsList, Variant
+from variant.variant import all_slots
+
+
+def jsonpickle_encode(indexed_seq_info: dict[str, Any]) -> str:
+    """Encode `indexed_seq_info` the way seq_retrieval and seq_info_align formerly did."""
+    jsonpickle.register(Enum, EnumValueHandler, base=True)
+    return str(jsonpickle.encode(indexed_seq_info, make_refs=False, unpicklable=False))
+
+
+@pytest.fixture
+def indexed_seq_info(wb_variants_yn10_yn30_in_C42D8_8a_1_list, wb_variant_yn32_in_C42D8_8a_1_protein_alignment,
+                     wb_variants_ok2799_in_k12g11_3_1_protein_seq) -> dict[str, Optional[SeqInfo]]:
+    unicode_variant = SeqEmbeddedVariant(variant=Variant(variant_id='var_é"\\', seq_id='X', start=10, end=11, genomic_ref_seq='', genomic_alt_seq='A'),
+                                         seq_start_pos=2, seq_end_pos=3, embedded_ref_seq_len=0, embedded_alt_seq_len=1)
+    error_with_variants = SeqInfo(embedded_variants=SeqEmbeddedVariantsList([wb_variants_ok2799_in_k12g11_3_1_protein_seq]))
+    error_with_variants.error = 'Partial sequence'
+
+    return {
+        'C42D8.8a.1_ref': SeqInfo(sequence='MTVGK'),
+        'C42D8.8a.1_yn10_yn30': AltSeqInfo(sequence='MTVGK*', embedded_variants=wb_variants_yn10_yn30_in_C42D8_8a_1_list),
+        'C42D8.8a.1_yn32': SeqInfo(embedded_variants=AlignmentEmbeddedVariantsList([wb_variant_yn32_in_C42D8_8a_1_protein_alignment])),
+        'K12G11.3.1_ok2799': error_with_variants,
+        'unicode_é': SeqInfo(sequence='MKé', embedded_variants=SeqEmbeddedVariantsList([unicode_variant])),
+        'empty_variants': SeqInfo(embedded_variants=SeqEmbeddedVariantsList()),
+        'rejected': SeqInfo(error='Reference start codon is different from alternative start codon.'),
+        'empty': SeqInfo(),
+        'missing': None
+    }
+
+
+def test_schemas_match_slots() -> None:
+    for variant_class, schema in SCHEMAS.items():
+        assert [attr for attr, _ in schema] == all_slots(variant_class)
+
+
+def test_encode_seq_info_dict_jsonpickle_identical(indexed_seq_info) -> None:
+    assert encode_seq_info_dict(indexed_seq_info) == jsonpickle_encode(indexed_seq_info)
+    assert encode_seq_info_dict({}) == jsonpickle_encode({})
+
+
+def test_encode_unset_attributes(wb_variant_yn32_in_C42D8_8a_1_protein_seq) -> None:
+    del wb_variant_yn32_in_C42D8_8a_1_protein_seq.embedded_alt_seq_len
+    indexed_seq_info = {'partial': SeqInfo(embedded_variants=SeqEmbeddedVariantsList([wb_variant_yn32_in_C42D8_8a_1_protein_seq]))}
+
+    assert encode_seq_info_dict(indexed_seq_info) == jsonpickle_encode(indexed_seq_info)
+
+
+def test_encode_unsupported_objects(wb_variant_yn32) -> None:
+    with pytest.raises(TypeError):
+        encode_seq_info_dict({'unsupported': SeqInfo(embedded_variants=[wb_variant_yn32, object()])})  # type: ignore[arg-type]
+
+    seq_info = SeqInfo(sequence='MK')
+    seq_info.note = 'Not part of the schema'  # type: ignore[attr-defined]
+    with pytest.raises(TypeError):
+        encode_seq_info_dict({'unsupported': seq_info})
+
+
+def test_decode_seq_info_dict(indexed_seq_info) -> None:
+    del indexed_seq_info['missing']
+    json_content = encode_seq_info_dict(indexed_seq_info)
+
+    decoded = decode_seq_info_dict(json_content)
+
+    # Decoding is equivalent to SeqInfo.from_dict, and round-trips to identical JSON
+    expected = {seq_name: SeqInfo.from_dict(seq_info_dict) for seq_name, seq_info_dict in json.loads(json_content).items()}
+    assert encode_seq_info_dict(decoded) == encode_seq_info_dict(expected) == json_content
+    for seq_name, seq_info in decoded.items():
+        assert type(getattr(seq_info, 'embedded_variants', None)) is type(getattr(expected[seq_name], 'embedded_variants', None))
+        assert [type(variant) for variant in getattr(seq_info, 'embedded_variants', [])] == \
+               [type(variant) for variant in getattr(expected[seq_name], 'embedded_variants', [])]
+
+
+def test_decode_seq_info_without_derived_attributes() -> None:
+    seq_info = decode_seq_info({'embedded_variants': [{
+        'variant_id': 'NC_003284.9:g.5114224C>T', 'genomic_seq_id': 'X', 'genomic_start_pos': 5114224, 'genomic_end_pos': 5114224,
+        'genomic_ref_seq': 'C', 'genomic_alt_seq': 'T', 'seq_start_pos': 377, 'seq_end_pos': 377,
+        'embedded_ref_seq_len': 1, 'embedded_alt_seq_len': 1, 'alignment_start_pos': 590, 'alignment_end_pos': 590
+    }]})
+
+    assert isinstance(seq_info.embedded_variants, AlignmentEmbeddedVariantsList)
+    assert isinstance(seq_info.embedded_variants[0], AlignmentEmbeddedVariant)
+    assert seq_info.embedded_variants[0].seq_length == 1
+
+
+def test_decode_seq_info_errors(wb_variant_yn32_in_C42D8_8a_1_protein_seq) -> None:
+    variant_dict = wb_variant_yn32_in_C42D8_8a_1_protein_seq.__getstate__()
+    variant_dict['seq_substitution_type'] = variant_dict['seq_substitution_type'].value
+
+    with pytest.raises(TypeError):
+        decode_seq_info({'sequence': 1})
+    with pytest.raises(TypeError):
+        decode_seq_info({'error': None})
+    with pytest.raises(TypeError):
+        decode_seq_info({'embedded_variants': {}})
+    with pytest.raises(TypeError):
+        decode_seq_info({'embedded_variants': ['variant']})
+    with pytest.raises(KeyError):
+        decode_seq_info({'embedded_variants': [{key: value for key, value in variant_dict.items() if key != 'seq_end_pos'}]})
+    with pytest.raises(TypeError):
+        decode_seq_info({'embedded_variants': [variant_dict | {'seq_start_pos': '377'}]})
+    with pytest.raises(ValueError):
+        decode_seq_info({'embedded_variants': [variant_dict | {'seq_substitution_type': 'inversion'}]})
+    with pytest.raises(TypeError):
+        decode_seq_info_dict('[]')
+
+
+def test_normalized_seq_info_dict(indexed_seq_info, wb_variants_yn10_yn30_in_C42D8_8a_1_list) -> None:
+    del indexed_seq_info['missing']
+    # Same variants embedded in multiple sequences are stored once in the variant table
+    indexed_seq_info['C42D8.8a.1_yn10_yn30_copy'] = SeqInfo(sequence='MTVGK*', embedded_variants=wb_variants_yn10_yn30_in_C42D8_8a_1_list)
+
+    normalized_json = encode_normalized_seq_info_dict(indexed_seq_info)
+    assert encode_seq_info_dict_as(indexed_seq_info, 'normalized') == normalized_json
+    assert encode_seq_info_dict_as(indexed_seq_info, 'full') == encode_seq_info_dict(indexed_seq_info)
+
+    normalized = json.loads(normalized_json)
+    assert list(normalized['variants'].keys()) == list(dict.fromkeys(variant.variant_id for seq_info in indexed_seq_info.values()
+                                                                     for variant in getattr(seq_info, 'embedded_variants', [])))
+    for embedding in normalized['seq_info']['C42D8.8a.1_yn10_yn30_copy']['embedded_variants']:
+        assert set(embedding.keys()) == {'variant_id', 'seq_start_pos', 'seq_end_pos', 'embedded_ref_seq_len', 'embedded_alt_seq_len'}
+    assert len(normalized_json) < len(encode_seq_info_dict(indexed_seq_info))
+
+    # Decoding restores the (full) sequence info
+    assert encode_seq_info_dict(decode_normalized_seq_info_dict(normalized_json)) == encode_seq_info_dict(indexed_seq_info)
+
+
+def test_normalized_seq_info_dict_errors(wb_variant_yn32_in_C42D8_8a_1_protein_seq) -> None:
+    conflicting_variant = copy(wb_variant_yn32_in_C42D8_8a_1_protein_seq)
+    conflicting_variant.genomic_alt_seq = 'G'
+    with pytest.raises(ValueError):
+        encode_normalized_seq_info_dict({'seq_1': SeqInfo(embedded_variants=SeqEmbeddedVariantsList([wb_variant_yn32_in_C42D8_8a_1_protein_seq])),
+                                         'seq_2': SeqInfo(embedded_variants=SeqEmbeddedVariantsList([conflicting_variant]))})
+
+    with pytest.raises(TypeError):
+        decode_normalized_seq_info_dict('{}')
+    with pytest.raises(TypeError):
+        decode_normalized_seq_info_dict('{"variants": {}, "seq_info": {"seq": {"embedded_variants": ["variant"]}}}')
+    with pytest.raises(KeyError):
+        decode_normalized_seq_info_dict('{"variants": {}, "seq_info": {"seq": {"embedded_variants": [{"variant_id": "unknown"}]}}}')
+
+
+def test_seq_info_json_writer(indexed_seq_info) -> None:
+    seq_info_formats: list[SEQ_INFO_FORMAT_TYPE] = ['full', 'normalized']
+    for seq_info_format in seq_info_formats:
+        output = StringIO()
+        with SeqInfoJsonWriter(output, seq_info_format) as writer:
+            for seq_name, seq_info in indexed_seq_info.items():
+                writer.write(seq_name, seq_info)
+
+        # Streamed output is identical to encoding the complete dict
+        assert output.getvalue() == encode_seq_info_dict_as(indexed_seq_info, seq_info_format)
+
+        with pytest.raises(ValueError):
+            writer.write('closed', None)
+
+    empty_output = StringIO()
+    SeqInfoJsonWriter(empty_output).close()
+    assert empty_output.getvalue() == encode_seq_info_dict({})
+
+
+def test_seq_info_json_writer_error() -> None:
+    seq_info = SeqInfo(sequence='MK')
+    seq_info.note = 'Not part of the schema'  # type: ignore[attr-defined]
+
+    output = StringIO()
+    with pytest.raises(TypeError):
+        with SeqInfoJsonWriter(output) as writer:
+            writer.write('valid', SeqInfo(sequence='MK'))
+            writer.write('unsupported', seq_info)
+
+    # The JSON document is left incomplete on errors
+    with pytest.raises(ValueError):
+        json.loads(output.getvalue())
@@ -7,7 +7,9 @@ import pytest
 from Bio.Data import CodonTable
 
 from seq_region import SeqRegion, TranslatedSeqRegion, InvalidatedOrfException, OrfNotFoundException, SequenceNotFoundException
+from seq_region.seq_region import AltSeqInfo
 from seq_region.translated_seq_region import find_orfs
+from seq_info import SeqInfo
 from variant import Variant
 
 from .fixtures.translated_seq_regions import TranscriptFixture
@@ -176,6 +178,31 @@ def test_protein_seq_retrieval_w_variants(wb_transcript_zc506_4a_1_with_cds, wb_
     assert alt_protein_seq_info.embedded_variants[0].seq_end_pos == 251
 
 
+def test_protein_seq_retrieval_w_variant_groups(wb_transcript_zc506_4a_1_with_cds, wb_variant_mgl_1_transcript, wb_variant_mgl_1_transcript_start_codon) -> None:
+    translatedSeqRegion = wb_transcript_zc506_4a_1_with_cds['translatedSeqRegion']
+    alt_seq_infos = translatedSeqRegion.get_alt_sequences(type='protein', variant_groups={'mgl_1': [wb_variant_mgl_1_transcript],
+                                                                                          'start_codon': [wb_variant_mgl_1_transcript_start_codon],
+                                                                                          'none': []})
+
+    assert list(alt_seq_infos.keys()) == ['mgl_1', 'start_codon', 'none']
+
+    # Each variant group should get its own alt sequence, identical to the one generated separately
+    assert isinstance(alt_seq_infos['mgl_1'], AltSeqInfo)
+    assert alt_seq_infos['mgl_1'].sequence == translatedSeqRegion.get_alt_sequence(type='protein', variants=[wb_variant_mgl_1_transcript]).sequence
+    assert len(alt_seq_infos['mgl_1'].embedded_variants) == 1
+    assert alt_seq_infos['mgl_1'].embedded_variants[0].seq_start_pos == 251
+
+    assert isinstance(alt_seq_infos['none'], AltSeqInfo)
+    assert alt_seq_infos['none'].sequence == wb_transcript_zc506_4a_1_with_cds['proteinSeq']
+
+    # Failing variant groups should report the error without affecting the other groups
+    assert isinstance(alt_seq_infos['start_codon'], SeqInfo)
+    assert alt_seq_infos['start_codon'].error is not None
+
+    # Reference sequences should remain unaltered
+    assert translatedSeqRegion.get_sequence(type='protein') == wb_transcript_zc506_4a_1_with_cds['proteinSeq']
+
+
 def test_protein_seq_retrieval_w_empty_variants_list(wb_transcript_zc506_4a_1_with_cds) -> None:
     translatedSeqRegion = wb_transcript_zc506_4a_1_with_cds['translatedSeqRegion']
     alt_protein_seq_info = translatedSeqRegion.get_alt_sequence(type='protein', variants=[])
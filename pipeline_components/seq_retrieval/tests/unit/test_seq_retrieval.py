@@ -0,0 +1,53 @@
+"""
+Unit testing for seq_retrieval input processing
+"""
+
+import click
+import json
+import logging
+from typing import Any, Dict
+
+from seq_retrieval import fetch_variants, process_variants_file_param
+from variant import Variant
+
+VALID_VARIANT_ID = 'NC_003284.9:g.5116096C>T'
+VALID_RECORD: Dict[str, Any] = {
+    'variant_id': VALID_VARIANT_ID,
+    'genomic_seq_id': 'X',
+    'genomic_start_pos': 5116096,
+    'genomic_end_pos': 5116096,
+    'genomic_ref_seq': 'C',
+    'genomic_alt_seq': 'T'
+}
+
+
+def test_process_variants_file_param_invalid_record(tmp_path, monkeypatch, caplog) -> None:
+    variants_file_path = tmp_path / 'variants.json'
+    with open(variants_file_path, 'w') as variants_file:
+        json.dump({
+            VALID_VARIANT_ID: VALID_RECORD,
+            'NC_003284.9:g.5113285_5115215del': {'variant_id': 'NC_003284.9:g.5113285_5115215del', 'genomic_seq_id': 'X',
+                                                 'genomic_start_pos': 'not-a-position'},
+            'unstructured-record': 'not-a-dict'
+        }, variants_file)
+
+    # Invalid records are skipped (with a warning) rather than failing the task
+    with caplog.at_level(logging.WARNING):
+        variants = process_variants_file_param(click.Context(click.Command('seq_retrieval')), click.Option(['--variants_file']),
+                                               str(variants_file_path))
+    assert list(variants.keys()) == [VALID_VARIANT_ID]
+    assert variants[VALID_VARIANT_ID].genomic_alt_seq == 'T'
+    assert 'NC_003284.9:g.5113285_5115215del' in caplog.text
+    assert 'unstructured-record' in caplog.text
+
+    # Variants with skipped records are fetched through the public web API instead
+    fetched_ids = []
+
+    def from_variant_id(variant_id: str) -> Variant:
+        fetched_ids.append(variant_id)
+        return Variant.from_dict(dict(VALID_RECORD, variant_id=variant_id))
+
+    monkeypatch.setattr(Variant, 'from_variant_id', from_variant_id)
+    variant_info = fetch_variants([VALID_VARIANT_ID, 'NC_003284.9:g.5113285_5115215del'], pre_resolved_variants=variants)
+    assert sorted(variant_info.keys()) == sorted([VALID_VARIANT_ID, 'NC_003284.9:g.5113285_5115215del'])
+    assert fetched_ids == ['NC_003284.9:g.5113285_5115215del']
@@ -0,0 +1,105 @@
+"""
+Unit testing for TranscriptIndex class and related functions
+"""
+
+import gzip
+import pytest
+import shutil
+
+from transcript_index import TranscriptIndex
+from variant import Variant
+
+from log_mgmt import get_logger
+
+logger = get_logger(name=__name__)
+
+GFF3_FILE = 'tests/resources/transcript_index_test_annotation.gff3'
+
+
+@pytest.fixture
+def transcript_index() -> TranscriptIndex:
+    return TranscriptIndex.from_gff3(GFF3_FILE)
+
+
+def test_transcript_index_from_gff3(transcript_index: TranscriptIndex) -> None:
+    assert len(transcript_index) == 4
+
+    transcript = transcript_index.get_transcript('transcript:g1.1')
+    assert transcript.name == 'G1.1'
+    assert transcript.gene_name == 'gen-1'
+    assert transcript.seq_id == 'I'
+    assert transcript.strand == '+'
+    assert transcript.exon_regions == [(1000, 1200), (2000, 2300), (4800, 5000)]
+    assert transcript.cds_regions == [(1100, 1200, 0), (2000, 2300, 2), (4800, 4850, 1)]
+
+    # Negative strand transcript parts should be sorted in transcription order
+    neg_transcript = transcript_index.get_transcript('transcript:g2.1')
+    assert neg_transcript.strand == '-'
+    assert neg_transcript.exon_regions == [(8800, 9000), (8000, 8200)]
+
+    # Transcripts without name (or named parent) should fall back to their ID
+    unnamed_transcript = transcript_index.get_transcript('transcript:g3.1')
+    assert unnamed_transcript.name == 'transcript:g3.1'
+    assert unnamed_transcript.gene_name is None
+
+
+def test_transcript_index_from_gzipped_gff3(tmp_path) -> None:
+    gzipped_gff3_file = str(tmp_path / 'annotation.gff3.gz')
+    with open(GFF3_FILE, 'rb') as f_in, gzip.open(gzipped_gff3_file, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+
+    assert len(TranscriptIndex.from_gff3(gzipped_gff3_file)) == 4
+
+
+def test_transcript_index_from_invalid_gff3(tmp_path) -> None:
+    with pytest.raises(FileNotFoundError):
+        TranscriptIndex.from_gff3(str(tmp_path / 'missing.gff3'))
+
+    invalid_gff3_file = tmp_path / 'invalid.gff3'
+    invalid_gff3_file.write_text('I\ttest\texon\t100\n')
+    with pytest.raises(ValueError):
+        TranscriptIndex.from_gff3(str(invalid_gff3_file))
+
+
+def test_map_variants(transcript_index: TranscriptIndex) -> None:
+    shared_exon_variant = Variant(variant_id='I:g.1150A>G', seq_id='I', start=1150, end=1150, genomic_ref_seq='A', genomic_alt_seq='G')
+    utr_variant = Variant(variant_id='I:g.4900A>G', seq_id='I', start=4900, end=4900, genomic_ref_seq='A', genomic_alt_seq='G')
+    intron_variant = Variant(variant_id='I:g.1500A>G', seq_id='I', start=1500, end=1500, genomic_ref_seq='A', genomic_alt_seq='G')
+    exon_spanning_deletion = Variant(variant_id='I:g.8150_8850del', seq_id='I', start=8150, end=8850, genomic_ref_seq='A' * 701)
+    exon_boundary_insertion = Variant(variant_id='I:g.2300_2301insT', seq_id='I', start=2300, end=2301, genomic_alt_seq='T')
+    unknown_seq_variant = Variant(variant_id='X:g.100A>G', seq_id='X', start=100, end=100, genomic_ref_seq='A', genomic_alt_seq='G')
+
+    mapped_variants = transcript_index.map_variants([shared_exon_variant, utr_variant, intron_variant, exon_spanning_deletion,
+                                                     exon_boundary_insertion, unknown_seq_variant])
+
+    assert mapped_variants[shared_exon_variant.variant_id] == [
+        dict(transcript_id='transcript:g1.1', exon_numbers=[1], in_cds=True),
+        dict(transcript_id='transcript:g1.2', exon_numbers=[1], in_cds=False)]
+    assert mapped_variants[utr_variant.variant_id] == [dict(transcript_id='transcript:g1.1', exon_numbers=[3], in_cds=False)]
+    assert mapped_variants[intron_variant.variant_id] == []
+    # Exons should be numbered in transcription order
+    assert mapped_variants[exon_spanning_deletion.variant_id] == [dict(transcript_id='transcript:g2.1', exon_numbers=[1, 2], in_cds=False)]
+    assert mapped_variants[exon_boundary_insertion.variant_id] == [dict(transcript_id='transcript:g1.1', exon_numbers=[2], in_cds=True)]
+    assert mapped_variants[unknown_seq_variant.variant_id] == []
+
+
+def test_pipeline_seq_regions(transcript_index: TranscriptIndex) -> None:
+    variants = [Variant(variant_id='I:g.1150A>G', seq_id='I', start=1150, end=1150, genomic_ref_seq='A', genomic_alt_seq='G'),
+                Variant(variant_id='I:g.2100A>G', seq_id='I', start=2100, end=2100, genomic_ref_seq='A', genomic_alt_seq='G'),
+                Variant(variant_id='II:g.200A>G', seq_id='II', start=200, end=200, genomic_ref_seq='A', genomic_alt_seq='G')]
+
+    seq_regions = transcript_index.pipeline_seq_regions(variants, fasta_file_url='file://genome.fa.gz', alt_seq_name_suffix='_vars')
+
+    assert [seq_region['unique_entry_id'] for seq_region in seq_regions] == ['gen-1_G1.1_vars', 'gen-1_G1.2_vars', 'transcript:g3.1_vars']
+
+    assert seq_regions[0] == dict(base_seq_name='gen-1_G1.1', unique_entry_id='gen-1_G1.1_vars',
+                                  seq_id='I', seq_strand='+',
+                                  exon_seq_regions=[dict(start=1000, end=1200), dict(start=2000, end=2300), dict(start=4800, end=5000)],
+                                  cds_seq_regions=[dict(start=1100, end=1200, frame=0), dict(start=2000, end=2300, frame=2),
+                                                   dict(start=4800, end=4850, frame=1)],
+                                  fasta_file_url='file://genome.fa.gz',
+                                  variant_ids=['I:g.1150A>G', 'I:g.2100A>G'],
+                                  alt_seq_name_suffix='_vars')
+    assert seq_regions[1]['variant_ids'] == ['I:g.1150A>G']
+    assert seq_regions[1]['cds_seq_regions'] == []
+    assert seq_regions[2]['seq_strand'] == '-'
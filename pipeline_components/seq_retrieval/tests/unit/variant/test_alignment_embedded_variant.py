@@ -2,13 +2,18 @@
 Unit testing for AlignmentEmbeddedVariant class and related functions
 """
 
+from Bio import AlignIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
 import logging
 import pytest
 
-from variant import AlignmentEmbeddedVariant
+from variant import AlignmentEmbeddedVariant, AlignmentEmbeddedVariantsList, AlignmentPositionIndex
 from variant.alignment_embedded_variant import seq_to_alignment_position
 from log_mgmt import get_logger, set_log_level
 
+from .fixtures.seq_records import ALIGNMENT_RESULT_FILE
+
 logger = get_logger(name=__name__)
 set_log_level(logging.DEBUG)
 
@@ -166,3 +171,65 @@ def test_alignment_embedded_deletion_w_flanking_bases(wb_variants_ok2799_in_k12g
     """
     assert wb_variants_ok2799_in_k12g11_3_1_protein_alignment.alignment_start_pos == 82
     assert wb_variants_ok2799_in_k12g11_3_1_protein_alignment.alignment_end_pos == 328
+
+
+def test_alignment_position_index_equivalence() -> None:
+    """
+    Test AlignmentPositionIndex conversions to be identical to seq_to_alignment_position for all positions
+    of all records of an alignment, and of synthetic edge cases (leading/trailing gaps, no gaps, no residues).
+    """
+    alignment = next(AlignIO.parse(ALIGNMENT_RESULT_FILE, "clustal"))
+    records = [record for record in alignment]
+    records += [SeqRecord(id=f'synthetic_{i}', seq=Seq(data=data))
+                for i, data in enumerate(['--MK-L--', 'MKL', 'MKL---', '---MKL', '-', 'M', '---', ''])]
+
+    for record in records:
+        alignment_index = AlignmentPositionIndex(record)
+        row_alignment_index = AlignmentPositionIndex((record.id, str(record.seq)))
+        no_gap_seq_len = len(record.seq) - record.seq.count('-')
+
+        assert alignment_index.no_gap_seq_len == no_gap_seq_len
+        for pos in range(1, no_gap_seq_len + 2):
+            assert alignment_index.alignment_position(pos) == seq_to_alignment_position(record, pos), f'{record.id} position {pos}'
+            assert row_alignment_index.alignment_position(pos) == alignment_index.alignment_position(pos)
+
+        for out_of_bound_pos in [0, no_gap_seq_len + 2]:
+            with pytest.raises(ValueError):
+                alignment_index.alignment_position(out_of_bound_pos)
+            with pytest.raises(ValueError):
+                alignment_index.alignment_positions([1, out_of_bound_pos])
+
+        # Batch conversion (in any order) is identical to individual conversion, including the end boundary (trailing-gap +1 rule)
+        positions = list(range(no_gap_seq_len + 1, 0, -1)) + [1, no_gap_seq_len + 1]
+        assert alignment_index.alignment_positions(positions) == [alignment_index.alignment_position(pos) for pos in positions]
+        assert alignment_index.alignment_positions([]) == []
+
+
+def test_alignment_embedded_variant_initiation_with_index(wb_C42D8_8a_1_yn32_seq_record, wb_variant_yn32_in_C42D8_8a_1_protein_seq,
+                                                          wb_variant_yn32_in_C42D8_8a_1_protein_alignment) -> None:
+    """
+    Test AlignmentEmbeddedVariant class initiation using an AlignmentPositionIndex.
+    """
+    alignment_embedded_w_index = AlignmentEmbeddedVariant(embedded_variant=wb_variant_yn32_in_C42D8_8a_1_protein_seq,
+                                                          alignment_index=AlignmentPositionIndex(wb_C42D8_8a_1_yn32_seq_record))
+
+    assert alignment_embedded_w_index == wb_variant_yn32_in_C42D8_8a_1_protein_alignment
+
+
+def test_alignment_embedded_variants_list_from_embedded_variants(wb_C42D8_8a_1_yn32_seq_record, wb_variant_yn32_in_C42D8_8a_1_protein_seq,
+                                                                 wb_variants_ok2799_in_k12g11_3_1_protein_seq) -> None:
+    """
+    Test batch embedding of all variants of a sequence to be identical to embedding every variant individually.
+    """
+    alignment_index = AlignmentPositionIndex(wb_C42D8_8a_1_yn32_seq_record)
+    embedded_variants = [wb_variant_yn32_in_C42D8_8a_1_protein_seq, wb_variants_ok2799_in_k12g11_3_1_protein_seq]
+
+    aligned_variants = AlignmentEmbeddedVariantsList.from_embedded_variants(embedded_variants, alignment_index)
+
+    assert isinstance(aligned_variants, AlignmentEmbeddedVariantsList)
+    assert len(aligned_variants) == 2
+    for aligned_variant, embedded_variant in zip(aligned_variants, embedded_variants):
+        expected = AlignmentEmbeddedVariant(embedded_variant, alignment_index=alignment_index)
+        assert aligned_variant.__getstate__() == expected.__getstate__()
+
+    assert AlignmentEmbeddedVariantsList.from_embedded_variants([], alignment_index) == AlignmentEmbeddedVariantsList()
@@ -672,3 +672,29 @@ def test_translation_of_indel_insertion_crossing_codons() -> None:
 
     assert translated_indel_deletion.seq_start_pos == 2
     assert translated_indel_deletion.seq_end_pos == 3
+
+
+def test_seq_embedded_variant_slots(wb_variant_yn32_in_C42D8_8a_1_coding_seq) -> None:
+    '''
+    Test SeqEmbeddedVariant objects are slotted (no per-instance __dict__)
+    and copies share (immutable) attribute values rather than copying them.
+    '''
+    assert not hasattr(wb_variant_yn32_in_C42D8_8a_1_coding_seq, '__dict__')
+
+    translated = wb_variant_yn32_in_C42D8_8a_1_coding_seq.to_translated()
+    assert translated is not wb_variant_yn32_in_C42D8_8a_1_coding_seq
+    assert translated.genomic_ref_seq is wb_variant_yn32_in_C42D8_8a_1_coding_seq.genomic_ref_seq
+    assert translated.seq_start_pos == 377
+    # Original must be unaltered
+    assert wb_variant_yn32_in_C42D8_8a_1_coding_seq.seq_start_pos == 1129
+
+
+def test_seq_embedded_variant_state(wb_variant_yn32_in_C42D8_8a_1_coding_seq) -> None:
+    '''
+    Test the SeqEmbeddedVariant state (used for copying and serialization) lists all attributes, base class attributes first.
+    '''
+    state = wb_variant_yn32_in_C42D8_8a_1_coding_seq.__getstate__()
+
+    assert list(state.keys()) == ['variant_id', 'genomic_seq_id', 'genomic_start_pos', 'genomic_end_pos', 'seq_length',
+                                  'genomic_ref_seq', 'genomic_alt_seq', 'seq_substitution_type',
+                                  'seq_start_pos', 'seq_end_pos', 'embedded_ref_seq_len', 'embedded_alt_seq_len']